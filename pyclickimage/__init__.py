@@ -18,14 +18,18 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from .__version__ import __version__
 from .click_manager import ClickManager
+from .thread_safe import ThreadSafeClickManager
 from .image_viewer import ImageViewer
 from .click_image_app import ClickImageApp
 from .run import run
+from .remote import run_detached
 
 __all__ = [
     "__version__",
     "ClickManager",
+    "ThreadSafeClickManager",
     "ImageViewer",
     "ClickImageApp",
     "run",
+    "run_detached",
 ]
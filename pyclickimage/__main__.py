@@ -16,25 +16,312 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import os
+import sys
+import csv
 import argparse
-import cv2
+from functools import partial
 from .run import run
+from .tracing import start_tracing
+from .formats import FORMATS, save_clicks
+from .agreement import compare_annotations, compare_directories, matcher
+from .transforms import load_transforms
+from .memory import parse_size
+from .batch import (
+    ProgressReporter,
+    convert_files,
+    file_stats,
+    iter_click_files,
+    merge_files,
+    run_parallel,
+    validate_file,
+)
 
 
-def __main__() -> None:
+def _report(progress, message: str) -> None:
+    r"""
+    Print a message on the standard error, below the progress line if any.
+    """
+    print(("\n" if progress is not None else "") + message, file=sys.stderr)
+
+
+def _cli_convert(args, files, progress) -> int:
+    jobs = []
+    for path in files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if args.output_dir is None:
+            directory = os.path.dirname(path)
+        elif args.keep_tree and args.root is not None:
+            directory = os.path.join(args.output_dir, os.path.relpath(os.path.dirname(path), args.root))
+        else:
+            directory = args.output_dir
+        output = os.path.join(directory, f"{stem}{args.suffix}.{args.to}")
+        if os.path.abspath(output) == os.path.abspath(path):
+            print(f"{path}: output would overwrite the input (use --suffix)", file=sys.stderr)
+            return 2
+        jobs.append((path, output))
+
+    transforms = load_transforms(args.transform) if args.transform else None
+
+    failed = 0
+    for result in convert_files(
+        jobs,
+        fmt=args.to,
+        precision_mode=args.precision,
+        half_shift=args.half_shift,
+        transforms=transforms,
+        workers=args.jobs,
+        progress=progress,
+    ):
+        if "error" in result:
+            failed += 1
+            _report(progress, f"{result['path']}: {result['error']}")
+    return 1 if failed else 0
+
+
+def _cli_merge(args, files, progress) -> int:
+    errors = []
+    merged = merge_files(files, prefix=args.prefix, workers=args.jobs, progress=progress, errors=errors)
+    for error in errors:
+        _report(progress, f"{error['path']}: {error['error']}")
+    merged.precision_mode = args.precision
+    save_clicks(merged, args.output)
+    return 1 if errors else 0
+
+
+def _cli_stats(args, files, progress) -> int:
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    writer = csv.writer(out)
+    writer.writerow(
+        ["File", "Group", "Count", "Placeholders", "CentroidX", "CentroidY", "MinX", "MinY", "MaxX", "MaxY"]
+    )
+
+    failed = total = 0
+    try:
+        for result in run_parallel(file_stats, files, args.jobs, progress=progress):
+            if "error" in result:
+                failed += 1
+                _report(progress, f"{result['path']}: {result['error']}")
+                continue
+            for group, stats in result["groups"].items():
+                total += stats["count"]
+                centroid = stats["centroid"] or ("", "")
+                bbox = stats["bbox"] or ("", "", "", "")
+                writer.writerow(
+                    [result["path"], group, stats["count"], stats["placeholders"], *centroid, *bbox]
+                )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    _report(progress, f"{len(files) - failed} files, {total} clicks")
+    return 1 if failed else 0
+
+
+def _cli_validate(args, files, progress) -> int:
+    if args.image is None and args.images_dir is None:
+        print("validate requires --image or --images-dir", file=sys.stderr)
+        return 2
+
+    func = partial(
+        validate_file,
+        image=args.image,
+        images_dir=args.images_dir,
+        half_shift=not args.pixel_corner,
+    )
+    invalid = 0
+    for result in run_parallel(func, files, args.jobs, progress=progress):
+        if "error" in result:
+            invalid += 1
+            _report(progress, f"{result['path']}: {result['error']}")
+        elif result["outside"]:
+            invalid += 1
+            width, height = result["size"]
+            _report(
+                progress,
+                f"{result['path']}: {len(result['outside'])} clicks outside {width}x{height} ({result['image']})",
+            )
+            for group, index, x, y in result["outside"][: args.max_report]:
+                print(f"    {group}[{index}] = ({x}, {y})", file=sys.stderr)
+
+    _report(progress, f"{len(files) - invalid}/{len(files)} files valid")
+    return 1 if invalid else 0
+
+
+_COMPARE_COLUMNS = [
+    "file", "a", "b", "group", "n_a", "n_b", "matched",
+    "recall_a", "recall_b", "f1", "mean", "median", "p95", "max", "rms",
+]
+
+
+def _cli_compare(args, progress) -> int:
+    out = open(args.report, "w", newline="", encoding="utf-8") if args.report else sys.stdout
+    writer = csv.DictWriter(out, _COMPARE_COLUMNS)
+    writer.writeheader()
+
+    def write(path, pairwise):
+        for row in pairwise:
+            if row["group"] is None or args.per_group:
+                writer.writerow({"file": path, **{k: "" if v is None else v for k, v in row.items()}})
+
+    if progress is not None:
+        # The consensus depends on the matching (SciPy is optional)
+        print(f"Matching: {matcher()}", file=sys.stderr)
+
+    failed = 0
+    try:
+        if all(os.path.isdir(path) for path in args.inputs):
+            for result in compare_directories(
+                args.inputs,
+                output_dir=args.output,
+                max_distance=args.max_distance,
+                min_support=args.min_support,
+                workers=args.jobs,
+                progress=progress,
+            ):
+                if "error" in result:
+                    failed += 1
+                    _report(progress, f"{result['path']}: {result['error']}")
+                else:
+                    write(result["path"], result["pairwise"])
+        else:
+            result = compare_annotations(
+                args.inputs,
+                max_distance=args.max_distance,
+                names=args.inputs,
+                min_support=args.min_support,
+            )
+            write("", result["pairwise"])
+            if args.output is not None:
+                save_clicks(result["consensus"], args.output)
+            if progress is not None:
+                progress.update()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
+
+def __main__(argv=None) -> None:
     r"""
     Main entry point of the package.
 
     This method contains the script to run if the user enter the name of the package on the command line.
+    It processes many click files (files or directories, searched recursively) in parallel:
 
     .. code-block:: console
-        pyclickimage
 
+        pyclickimage convert clicks/ --to json --precision int -o converted/
+        pyclickimage convert clicks/ --half-shift on --transform calibration.json --suffix _mm
+        pyclickimage merge clicks/ -o merged.csv --prefix stem
+        pyclickimage stats clicks/ -o stats.csv
+        pyclickimage validate clicks/ --images-dir images/
+        pyclickimage compare annotator_a/ annotator_b/ annotator_c/ -o consensus/ --report agreement.csv
+
+    Use ``pyclickimage-gui`` to run the GUI application.
     """
-    raise NotImplementedError(
-        "This is a placeholder for the main entry point of the package. Use 'pyclickimage-gui' to run the GUI application."
+    parser = argparse.ArgumentParser(
+        prog="pyclickimage",
+        description="Batch processing of click files. Use 'pyclickimage-gui' to run the GUI application.",
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("inputs", nargs="+", help="Click files or directories (searched recursively).")
+    common.add_argument("-j", "--jobs", type=int, default=None, help="Number of processes (default: number of CPUs).")
+    common.add_argument("-q", "--quiet", action="store_true", help="Do not report the progress.")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", parents=[common], help="Convert click files.")
+    convert.add_argument("--to", choices=FORMATS, default="csv", help="Output format.")
+    convert.add_argument("-o", "--output-dir", type=str, default=None, help="Output directory (default: next to the inputs).")
+    convert.add_argument("--keep-tree", action="store_true", help="Reproduce the input directory tree in the output directory.")
+    convert.add_argument("--suffix", type=str, default="", help="Suffix added to the output file names.")
+    convert.add_argument("--precision", choices=("float", "int"), default="float", help="Precision of the written coordinates.")
+    convert.add_argument(
+        "--half-shift",
+        choices=("on", "off"),
+        default=None,
+        help="'on' shifts corner coordinates to pixel-center coordinates (-0.5), 'off' the reverse (+0.5).",
+    )
+    convert.add_argument(
+        "--transform",
+        type=str,
+        default=None,
+        help="JSON file of named coordinate transforms; their calibrated columns are written next to the pixel coordinates.",
     )
 
+    merge = subparsers.add_parser("merge", parents=[common], help="Merge click files into one file.")
+    merge.add_argument("-o", "--output", type=str, required=True, help="Merged click file (.csv, .json or .npz).")
+    merge.add_argument(
+        "--prefix",
+        choices=("none", "stem"),
+        default="none",
+        help="'stem' prefixes the groups with the file name, 'none' merges groups with the same name.",
+    )
+    merge.add_argument("--precision", choices=("float", "int"), default="float", help="Precision of the written coordinates.")
+
+    stats = subparsers.add_parser("stats", parents=[common], help="Per-group statistics as CSV.")
+    stats.add_argument("-o", "--output", type=str, default=None, help="Output CSV file (default: standard output).")
+
+    validate = subparsers.add_parser("validate", parents=[common], help="Check that the clicks are inside the image bounds.")
+    validate.add_argument("--image", type=str, default=None, help="Image of all the click files.")
+    validate.add_argument("--images-dir", type=str, default=None, help="Directory of the images, matched by file stem.")
+    validate.add_argument(
+        "--pixel-corner",
+        action="store_true",
+        help="The clicks use the pixel-corner convention (half-shift off) instead of pixel centers.",
+    )
+    validate.add_argument("--max-report", type=int, default=10, help="Maximum number of reported clicks per file.")
+
+    compare = subparsers.add_parser(
+        "compare",
+        parents=[common],
+        help="Compare annotators (one directory or one click file per annotator) and build a consensus.",
+    )
+    compare.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="Consensus output: a directory when comparing directories, a click file otherwise.",
+    )
+    compare.add_argument("--report", type=str, default=None, help="Agreement report CSV (default: standard output).")
+    compare.add_argument("--max-distance", type=float, default=3.0, help="Maximal distance between corresponding clicks.")
+    compare.add_argument("--min-support", type=int, default=None, help="Minimal number of annotators of a consensus click (default: majority).")
+    compare.add_argument("--per-group", action="store_true", help="Also report the agreement of each group.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        progress = None if args.quiet else ProgressReporter()
+        try:
+            code = _cli_compare(args, progress)
+        finally:
+            if progress is not None:
+                progress.close()
+        sys.exit(code)
+
+    files = list(iter_click_files(args.inputs))
+    if not files:
+        print("No click file found.", file=sys.stderr)
+        sys.exit(2)
+    args.root = args.inputs[0] if len(args.inputs) == 1 and os.path.isdir(args.inputs[0]) else None
+
+    progress = None if args.quiet else ProgressReporter(len(files))
+    command = {
+        "convert": _cli_convert,
+        "merge": _cli_merge,
+        "stats": _cli_stats,
+        "validate": _cli_validate,
+    }[args.command]
+
+    try:
+        code = command(args, files, progress)
+    finally:
+        if progress is not None:
+            progress.close()
+    sys.exit(code)
+
 
 def __main_gui__() -> None:
     r"""
@@ -48,6 +335,16 @@ def __main_gui__() -> None:
     This will launch the GUI application for image clicking and saving coordinates.
 
     You can also specify an image file to be displayed ``--image`` or ``-i`` and a CSV file path to save the click coordinates ``--output`` or ``-o``.
+    The decoded images are kept in a disk cache (``PYCLICKIMAGE_CACHE_DIR``, size cap ``PYCLICKIMAGE_CACHE_SIZE`` in bytes),
+    so reopening a large file is fast.
+
+    The update pipeline can be traced with ``--trace trace.json`` (or the ``PYCLICKIMAGE_TRACE`` environment variable).
+    The interaction session can be recorded with ``--record`` and replayed later with ``python -m pyclickimage.harness --replay``.
+    The log panel can be mirrored to a rotating file with ``--log-file``.
+    The memory of the image buffers and caches can be limited with ``--memory-budget 2G``
+    (or the ``PYCLICKIMAGE_MEMORY_BUDGET`` environment variable).
+    The click events can be published to other processes with ``--serve unix:/tmp/clicks.sock``
+    (or ``--serve 127.0.0.1:8765``).
 
     """
     # Parser for command line arguments
@@ -61,12 +358,46 @@ def __main_gui__() -> None:
         type=str,
         help="Path to save the CSV file with click coordinates.",
     )
+    parser.add_argument(
+        "--record",
+        type=str,
+        help="Path to record the interaction session (JSON) for latency replay.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        help="Path to write a Chrome/Perfetto trace-event JSON file of the update pipeline.",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        help="Path to mirror the log panel to a rotating log file.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=parse_size,
+        help="Memory budget of the image buffers and caches (e.g. 2G, 512M).",
+    )
+    parser.add_argument(
+        "--serve",
+        type=str,
+        help="Publish the click events on a local socket (unix:PATH or HOST:PORT).",
+    )
     args = parser.parse_args()
 
-    if args.image is not None:
-        image = cv2.imread(args.image, cv2.IMREAD_UNCHANGED)
-    else:
-        image = None
+    if args.trace is not None:
+        start_tracing(args.trace)
+
+    # Launch the GUI application (the image file is decoded through the image cache)
+    run(
+        image=args.image,
+        output=args.output,
+        record=args.record,
+        log_file=args.log_file,
+        memory_budget=args.memory_budget,
+        serve=args.serve,
+    )
+
 
-    # Launch the GUI application
-    run(image=image, output=args.output)
+if __name__ == "__main__":
+    __main__()
@@ -0,0 +1,534 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import functools
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .click_manager import ClickManager
+from .formats import load_clicks, save_clicks
+from .batch import ProgressReporter, iter_click_files, run_parallel
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # pragma: no cover - optional dependency
+    linear_sum_assignment = None
+
+# Components of the candidate graph larger than this are matched greedily
+MAX_ASSIGNMENT_SIZE = 2000
+
+
+# =========================================================
+# MATCHING
+# =========================================================
+
+
+def candidate_pairs(
+    a: np.ndarray, b: np.ndarray, max_distance: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    r"""
+    Find all the pairs of points closer than ``max_distance`` with a uniform grid.
+
+    The points of ``b`` are sorted by grid cell (cell size ``max_distance``) and the
+    3x3 neighbouring cells of each point of ``a`` are looked up with ``searchsorted``,
+    so the cost is O((Na + Nb) log Nb + number of candidates).
+
+    Parameters
+    ----------
+    a : numpy.ndarray
+        Points with shape (Na, 2).
+    b : numpy.ndarray
+        Points with shape (Nb, 2).
+    max_distance : float
+        Maximal distance between two paired points.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        Indices in ``a``, indices in ``b`` and distances of the candidate pairs.
+    """
+    empty = (np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0))
+    if a.shape[0] == 0 or b.shape[0] == 0 or max_distance <= 0:
+        return empty
+
+    cell_a = np.floor(a / max_distance).astype(np.int64)
+    cell_b = np.floor(b / max_distance).astype(np.int64)
+    low = np.minimum(cell_a.min(axis=0), cell_b.min(axis=0)) - 1
+    cell_a -= low
+    cell_b -= low
+    height = int(max(cell_a[:, 1].max(), cell_b[:, 1].max())) + 2
+
+    keys_b = cell_b[:, 0] * height + cell_b[:, 1]
+    order = np.argsort(keys_b, kind="stable")
+    keys_b = keys_b[order]
+
+    # Sorted queries keep searchsorted cache friendly
+    keys_a = cell_a[:, 0] * height + cell_a[:, 1]
+    order_a = np.argsort(keys_a, kind="stable")
+    keys_a = keys_a[order_a]
+
+    ia_all, ib_all = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            keys = keys_a + (dx * height + dy)
+            lo = np.searchsorted(keys_b, keys, side="left")
+            hi = np.searchsorted(keys_b, keys, side="right")
+            counts = hi - lo
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            ia = np.repeat(order_a, counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            ia_all.append(ia)
+            ib_all.append(order[np.repeat(lo, counts) + offsets])
+
+    if not ia_all:
+        return empty
+
+    ia = np.concatenate(ia_all)
+    ib = np.concatenate(ib_all)
+    distances = np.hypot(a[ia, 0] - b[ib, 0], a[ia, 1] - b[ib, 1])
+    keep = distances <= max_distance
+    return ia[keep], ib[keep], distances[keep]
+
+
+def _greedy(ia: np.ndarray, ib: np.ndarray, d: np.ndarray) -> List[int]:
+    r"""
+    Greedy matching of candidate edges by increasing distance (indices of the kept edges).
+    """
+    used_a, used_b, kept = set(), set(), []
+    for e in np.argsort(d, kind="stable").tolist():
+        i, j = int(ia[e]), int(ib[e])
+        if i in used_a or j in used_b:
+            continue
+        used_a.add(i)
+        used_b.add(j)
+        kept.append(e)
+    return kept
+
+
+def _components(ia: np.ndarray, ib: np.ndarray) -> Dict[int, List[int]]:
+    r"""
+    Connected components of a bipartite edge list (union-find), as lists of edge indices.
+    """
+    parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def find(node):
+        root = node
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(node, node) != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for i, j in zip(ia.tolist(), ib.tolist()):
+        ra, rb = find((0, i)), find((1, j))
+        if ra != rb:
+            parent[ra] = rb
+
+    components: Dict[Tuple[int, int], List[int]] = {}
+    for e, i in enumerate(ia.tolist()):
+        components.setdefault(find((0, i)), []).append(e)
+    return dict(enumerate(components.values()))
+
+
+def matcher(optimal: bool = True) -> str:
+    r"""
+    Name of the matching done by :func:`match_points`.
+
+    Parameters
+    ----------
+    optimal : bool
+        The ``optimal`` argument of :func:`match_points`.
+        Default is True.
+
+    Returns
+    -------
+    str
+        "optimal" (SciPy assignment, greedy for the components larger than
+        :data:`MAX_ASSIGNMENT_SIZE`) or "greedy" (SciPy is not installed, or ``optimal`` is False).
+    """
+    return "optimal" if optimal and linear_sum_assignment is not None else "greedy"
+
+
+def match_points(
+    a: np.ndarray, b: np.ndarray, max_distance: float, optimal: bool = True
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    r"""
+    One-to-one matching of two point sets within ``max_distance``.
+
+    The candidate pairs are found with :func:`candidate_pairs`. Unambiguous pairs (both points
+    have a single candidate) are matched directly; the remaining connected components of the
+    candidate graph are solved with ``scipy.optimize.linear_sum_assignment`` (maximum number of
+    matches, then minimum total distance). Without SciPy, or for very large components,
+    the candidates are matched greedily by increasing distance.
+
+    Parameters
+    ----------
+    a : numpy.ndarray
+        Points with shape (Na, 2).
+    b : numpy.ndarray
+        Points with shape (Nb, 2).
+    max_distance : float
+        Maximal distance between two matched points.
+    optimal : bool
+        Use the optimal assignment when SciPy is available.
+        Default is True.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        Indices in ``a``, indices in ``b`` and distances of the matched pairs.
+    """
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 2)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 2)
+    ia, ib, d = candidate_pairs(a, b, max_distance)
+    if ia.size == 0:
+        return ia, ib, d
+
+    degree_a = np.bincount(ia, minlength=a.shape[0])
+    degree_b = np.bincount(ib, minlength=b.shape[0])
+    trivial = (degree_a[ia] == 1) & (degree_b[ib] == 1)
+    kept = [np.flatnonzero(trivial)]
+
+    rest = np.flatnonzero(~trivial)
+    if rest.size:
+        ra, rb, rd = ia[rest], ib[rest], d[rest]
+        for edges in _components(ra, rb).values():
+            edges = np.array(edges)
+            ea, eb, ed = ra[edges], rb[edges], rd[edges]
+            if (ea == ea[0]).all() or (eb == eb[0]).all():
+                # One point with several candidates: the closest one
+                kept.append(rest[edges[[int(ed.argmin())]]])
+                continue
+            ua, la = np.unique(ea, return_inverse=True)
+            ub, lb = np.unique(eb, return_inverse=True)
+
+            if not optimal or linear_sum_assignment is None or max(ua.size, ub.size) > MAX_ASSIGNMENT_SIZE:
+                kept.append(rest[edges[_greedy(ea, eb, ed)]])
+                continue
+
+            # Non-candidate pairs cost more than any set of candidate pairs
+            big = 2.0 * max_distance * (min(ua.size, ub.size) + 1) + 1.0
+            cost = np.full((ua.size, ub.size), big)
+            edge_of = np.full((ua.size, ub.size), -1, np.int64)
+            cost[la, lb] = ed
+            edge_of[la, lb] = np.arange(edges.size)
+            rows, cols = linear_sum_assignment(cost)
+            chosen = edge_of[rows, cols]
+            kept.append(rest[edges[chosen[chosen >= 0]]])
+
+    kept = np.sort(np.concatenate(kept))
+    return ia[kept], ib[kept], d[kept]
+
+
+# =========================================================
+# AGREEMENT
+# =========================================================
+
+
+def _group_points(click_manager: ClickManager, group: str) -> np.ndarray:
+    r"""
+    Coordinates of the clicks of a group with shape (N, 2), placeholders excluded.
+    """
+    points = click_manager.groups.get(group, [])
+    valid = [p for p in points if p[0] is not None and p[1] is not None]
+    return np.array(valid, dtype=np.float64).reshape(-1, 2)
+
+
+def _distance_stats(distances: np.ndarray) -> dict:
+    if distances.size == 0:
+        return {"mean": None, "median": None, "p95": None, "max": None, "rms": None}
+    return {
+        "mean": float(distances.mean()),
+        "median": float(np.median(distances)),
+        "p95": float(np.percentile(distances, 95)),
+        "max": float(distances.max()),
+        "rms": float(np.sqrt(np.mean(distances**2))),
+    }
+
+
+def compare_annotations(
+    annotations: Sequence[Union[ClickManager, str]],
+    max_distance: float = 3.0,
+    names: Optional[Sequence[str]] = None,
+    groups: Optional[Sequence[str]] = None,
+    min_support: Optional[int] = None,
+    optimal: bool = True,
+) -> dict:
+    r"""
+    Compare the clicks of several annotators and build a consensus.
+
+    For each group:
+
+    - every pair of annotators is matched with :func:`match_points` to compute the
+      agreement metrics (matched counts, recall of each annotator, F1 score, distance statistics);
+    - the annotators are merged one after the other into clusters: the clicks of an annotator
+      are matched to the current cluster centroids, unmatched clicks start new clusters;
+    - the clusters supported by at least ``min_support`` annotators form the consensus
+      (centroid of the members).
+
+    Placeholders (clicks without coordinates) are ignored.
+    All the annotations must use the same half-shift convention.
+
+    Parameters
+    ----------
+    annotations : Sequence[Union[ClickManager, str]]
+        Click managers or click file paths, one per annotator.
+    max_distance : float
+        Maximal distance between two corresponding clicks.
+        Default is 3.0.
+    names : Sequence[str], optional
+        Annotator names. If None, uses the file names or "annotator_<i>".
+    groups : Sequence[str], optional
+        Groups to compare. If None, all the groups of all the annotators.
+    min_support : int, optional
+        Minimal number of annotators of a consensus click. If None, a strict majority.
+    optimal : bool
+        Use the optimal assignment when SciPy is available (see :func:`match_points`).
+        Default is True.
+
+    Returns
+    -------
+    dict
+        Dictionary with the keys:
+
+        - ``names``: the annotator names.
+        - ``pairwise``: list of dictionaries, one per (annotator, annotator, group) and one per
+          annotator pair over all the groups (``group`` is None), with the keys ``a``, ``b``,
+          ``group``, ``n_a``, ``n_b``, ``matched``, ``recall_a``, ``recall_b``, ``f1``, ``mean``,
+          ``median``, ``p95``, ``max`` and ``rms`` (distances in pixels).
+        - ``clusters``: ``{group: array}`` with shape (n_clusters, n_annotators): index of the
+          click of each annotator in the cluster (among its non-placeholder clicks), or -1.
+        - ``consensus``: a :class:`ClickManager` with the consensus clicks and the
+          ``support`` (number of annotators) and ``spread`` (RMS distance to the centroid)
+          point data columns.
+        - ``matcher``: the matching used, see :func:`matcher` (the consensus depends on it).
+    """
+    managers = []
+    default_names = []
+    for i, item in enumerate(annotations):
+        if isinstance(item, str):
+            managers.append(load_clicks(item))
+            default_names.append(os.path.splitext(os.path.basename(item))[0])
+        else:
+            managers.append(item)
+            default_names.append(f"annotator_{i}")
+    names = list(names) if names is not None else default_names
+    if len(names) != len(managers):
+        raise ValueError("names must have one entry per annotation.")
+
+    n = len(managers)
+    if n < 2:
+        raise ValueError("At least two annotations are required.")
+    min_support = (n // 2 + 1) if min_support is None else int(min_support)
+
+    if groups is None:
+        groups = []
+        for manager in managers:
+            groups.extend(g for g in manager.groups if g not in groups)
+
+    pairwise = []
+    totals: Dict[Tuple[int, int], dict] = {}
+    clusters: Dict[str, np.ndarray] = {}
+    consensus = ClickManager()
+
+    for group in groups:
+        points = [_group_points(manager, group) for manager in managers]
+        if all(p.shape[0] == 0 for p in points):
+            continue
+
+        # ----- pairwise agreement
+        for i in range(n):
+            for j in range(i + 1, n):
+                _, _, d = match_points(points[i], points[j], max_distance, optimal)
+                n_a, n_b = points[i].shape[0], points[j].shape[0]
+                row = {
+                    "a": names[i],
+                    "b": names[j],
+                    "group": group,
+                    "n_a": n_a,
+                    "n_b": n_b,
+                    "matched": int(d.size),
+                }
+                pairwise.append(row)
+                total = totals.setdefault((i, j), {"n_a": 0, "n_b": 0, "distances": []})
+                total["n_a"] += n_a
+                total["n_b"] += n_b
+                total["distances"].append(d)
+                row.update(_agreement(n_a, n_b, d))
+
+        # ----- consensus clusters
+        members = np.full((0, n), -1, np.int64)
+        sums = np.zeros((0, 2))
+        counts = np.zeros(0)
+        for k in range(n):
+            pk = points[k]
+            if pk.shape[0] == 0:
+                continue
+            centroids = sums / np.maximum(counts, 1)[:, None]
+            ic, ik, _ = match_points(centroids, pk, max_distance, optimal)
+            members[ic, k] = ik
+            sums[ic] += pk[ik]
+            counts[ic] += 1
+
+            new = np.setdiff1d(np.arange(pk.shape[0]), ik)
+            block = np.full((new.size, n), -1, np.int64)
+            block[:, k] = new
+            members = np.concatenate([members, block])
+            sums = np.concatenate([sums, pk[new]])
+            counts = np.concatenate([counts, np.ones(new.size)])
+
+        clusters[group] = members
+
+        support = (members >= 0).sum(axis=1)
+        keep = np.flatnonzero(support >= min_support)
+        centroids = sums[keep] / counts[keep, None]
+        spread = np.zeros(keep.size)
+        for k in range(n):
+            idx = members[keep, k]
+            has = idx >= 0
+            spread[has] += np.sum((points[k][idx[has]] - centroids[has]) ** 2, axis=1)
+        spread = np.sqrt(spread / np.maximum(support[keep], 1))
+
+        consensus.add_group(group)
+        consensus.add_clicks(centroids, group)
+        consensus.set_point_data("support", support[keep].astype(float).tolist(), group)
+        consensus.set_point_data("spread", spread.tolist(), group)
+
+    for (i, j), total in totals.items():
+        d = np.concatenate(total["distances"]) if total["distances"] else np.zeros(0)
+        row = {
+            "a": names[i],
+            "b": names[j],
+            "group": None,
+            "n_a": total["n_a"],
+            "n_b": total["n_b"],
+            "matched": int(d.size),
+        }
+        row.update(_agreement(total["n_a"], total["n_b"], d))
+        pairwise.append(row)
+
+    return {
+        "names": names,
+        "pairwise": pairwise,
+        "clusters": clusters,
+        "consensus": consensus,
+        "matcher": matcher(optimal),
+    }
+
+
+def _agreement(n_a: int, n_b: int, distances: np.ndarray) -> dict:
+    r"""
+    Recall of each annotator, F1 score and distance statistics of a matching.
+    """
+    matched = distances.size
+    out = {
+        "recall_a": matched / n_a if n_a else None,
+        "recall_b": matched / n_b if n_b else None,
+        "f1": 2.0 * matched / (n_a + n_b) if (n_a + n_b) else None,
+    }
+    out.update(_distance_stats(distances))
+    return out
+
+
+# =========================================================
+# DIRECTORIES
+# =========================================================
+
+
+def _compare_job(
+    job: Tuple[str, List[str], List[str]],
+    output_dir: Optional[str],
+    max_distance: float,
+    min_support: Optional[int],
+) -> dict:
+    relative, paths, names = job
+    try:
+        result = compare_annotations(
+            paths, max_distance=max_distance, names=names, min_support=min_support
+        )
+        if output_dir is not None:
+            output = os.path.join(output_dir, relative)
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            save_clicks(result["consensus"], output)
+        return {
+            "path": relative,
+            "pairwise": result["pairwise"],
+            "n_consensus": result["consensus"].n_clicks,
+        }
+    except Exception as e:
+        return {"path": relative, "error": f"{type(e).__name__}: {e}"}
+
+
+def compare_directories(
+    directories: Sequence[str],
+    output_dir: Optional[str] = None,
+    max_distance: float = 3.0,
+    min_support: Optional[int] = None,
+    workers: Optional[int] = None,
+    progress: Optional[ProgressReporter] = None,
+) -> Iterator[dict]:
+    r"""
+    Compare the annotations of several annotator directories, file by file, in a process pool.
+
+    The click files are paired by their path relative to each directory. Files annotated by
+    fewer than two annotators are skipped. The consensus of each file is written with the same
+    relative path in ``output_dir``.
+
+    Parameters
+    ----------
+    directories : Sequence[str]
+        One directory per annotator (the directory names are the annotator names).
+    output_dir : str, optional
+        Output directory of the consensus files. If None, nothing is written.
+    max_distance, min_support
+        See :func:`compare_annotations`.
+    workers : int, optional
+        Number of processes. If None, uses the number of CPUs.
+    progress : ProgressReporter, optional
+        Progress report (its total is set to the number of compared files).
+
+    Yields
+    ------
+    dict
+        ``{"path", "pairwise", "n_consensus"}`` (or ``{"path", "error"}``) for each file,
+        as they are processed.
+    """
+    files: Dict[str, Dict[int, str]] = {}
+    for k, directory in enumerate(directories):
+        for path in iter_click_files([directory]):
+            files.setdefault(os.path.relpath(path, directory), {})[k] = path
+
+    names = [os.path.basename(os.path.normpath(d)) for d in directories]
+    jobs = [
+        (relative, [by_annotator[k] for k in sorted(by_annotator)], [names[k] for k in sorted(by_annotator)])
+        for relative, by_annotator in sorted(files.items())
+        if len(by_annotator) >= 2
+    ]
+    if progress is not None:
+        progress.total = len(jobs)
+    if not jobs:
+        return
+
+    func = functools.partial(
+        _compare_job, output_dir=output_dir, max_distance=max_distance, min_support=min_support
+    )
+    yield from run_parallel(func, jobs, workers, progress=progress)
@@ -0,0 +1,234 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import asyncio
+from typing import AsyncIterator, List, Optional, Union
+
+import numpy as np
+from PyQt5 import QtCore
+
+from .click_image_app import ClickImageApp
+from .click_manager import ClickManager
+from .run import get_application
+
+_END = object()
+
+
+class _QtPump:
+    r"""
+    Asyncio task processing the Qt events while at least one session is open.
+
+    The Qt event loop is never entered (no ``exec_``): the pending Qt events are processed
+    every ``interval`` seconds, so the asyncio loop (e.g. of a Jupyter kernel) keeps running.
+    A modal dialog enters its own Qt event loop inside ``processEvents``: the asyncio loop
+    is paused until the dialog is dismissed.
+    """
+
+    interval = 0.01
+
+    def __init__(self) -> None:
+        self.sessions: List["AnnotationSession"] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, session: "AnnotationSession") -> None:
+        self.sessions.append(session)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def remove(self, session: "AnnotationSession") -> None:
+        if session in self.sessions:
+            self.sessions.remove(session)
+
+    async def _run(self) -> None:
+        app = get_application()
+        while self.sessions:
+            app.processEvents()
+            await asyncio.sleep(self.interval)
+        # Delete the closed windows (deleteLater is only honoured by an event loop)
+        app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+        app.processEvents()
+
+
+_PUMP = _QtPump()
+
+
+class AnnotationSession:
+    r"""
+    A ClickImageApp window driven by the running asyncio loop (see :func:`open_session`).
+
+    Parameters
+    ----------
+    window : ClickImageApp
+        The window (already shown).
+    """
+
+    def __init__(self, window: ClickImageApp) -> None:
+        self.window = window
+        self.result: Optional[ClickManager] = None
+        self._closed = asyncio.get_running_loop().create_future()
+        self._subscribers: List[asyncio.Queue] = []
+        self._followed: Optional[ClickManager] = None
+
+        window.click_manager_changed_signal.connect(self._follow)
+        window.closed_signal.connect(self._on_closed)
+        self._follow(window.click_manager, notify=False)
+        _PUMP.add(self)
+
+    @property
+    def click_manager(self) -> ClickManager:
+        r"""
+        The displayed clicks (live).
+        """
+        return self.window.click_manager
+
+    @property
+    def closed(self) -> bool:
+        r"""
+        True once the window is closed.
+        """
+        return self._closed.done()
+
+    def _publish(self, event) -> None:
+        for subscriber in self._subscribers:
+            subscriber.put_nowait(event)
+
+    def _follow(self, click_manager: ClickManager, notify: bool = True) -> None:
+        if self._followed is not None:
+            self._followed.remove_listener(self._publish)
+        self._followed = click_manager
+        click_manager.add_listener(self._publish)
+        if notify:
+            self._publish({"type": "snapshot", "snapshot": click_manager.to_snapshot()})
+
+    def _on_closed(self, click_manager: ClickManager) -> None:
+        if self._followed is not None:
+            self._followed.remove_listener(self._publish)
+            self._followed = None
+        self.result = click_manager
+        self._publish(_END)
+        _PUMP.remove(self)
+        self.window.deleteLater()
+        if not self._closed.done():
+            self._closed.set_result(click_manager)
+
+    async def events(self) -> AsyncIterator[dict]:
+        r"""
+        Yield the click events (see :meth:`ClickManager.add_listener`) until the window is closed.
+
+        A new displayed click manager (clicks loaded, frame changed) is reported as
+        ``{"type": "snapshot", "snapshot": ...}`` (see :meth:`ClickManager.to_snapshot`).
+
+        .. code-block:: python
+
+            async for event in session.events():
+                print(event["type"])
+        """
+        subscriber: asyncio.Queue = asyncio.Queue()
+        if self.closed:
+            return
+        self._subscribers.append(subscriber)
+        try:
+            while True:
+                event = await subscriber.get()
+                if event is _END:
+                    return
+                yield event
+        finally:
+            self._subscribers.remove(subscriber)
+
+    async def wait(self) -> ClickManager:
+        r"""
+        Wait for the window to be closed and return the final clicks
+        (all the frames of a sequence, with a ``frame`` column).
+        """
+        return await asyncio.shield(self._closed)
+
+    def close(self) -> None:
+        r"""
+        Close the window without confirmation.
+        """
+        if not self.closed:
+            self.window.close()
+
+
+def open_session(
+    image: Optional[Union[np.ndarray, str]] = None,
+    output: Optional[str] = None,
+    log_file: Optional[str] = None,
+    memory_budget: Optional[int] = None,
+) -> AnnotationSession:
+    r"""
+    Show a ClickImageApp window driven by the running asyncio loop, and return at once.
+
+    The QApplication is created on the first call and reused by the following ones.
+    Must be called from a coroutine (or a Jupyter cell) of the running loop.
+
+    .. note::
+
+        The Qt events are polled by a task of the loop, the two event loops are not integrated:
+        while a modal dialog of the window is open (file and colour dialogs, "keep the existing
+        clicks?", error messages), the asyncio loop is paused until the dialog is dismissed.
+
+    Parameters
+    ----------
+    image, output, log_file, memory_budget
+        See :func:`pyclickimage.run`.
+
+    Returns
+    -------
+    AnnotationSession
+        The session.
+    """
+    get_application()
+    window = ClickImageApp(image, output, log_file=log_file, memory_budget=memory_budget)
+    # The clicks are returned to the caller: no "unsaved changes" question on close
+    window.confirm_exit = False
+    window.show()
+    return AnnotationSession(window)
+
+
+async def annotate(
+    image: Optional[Union[np.ndarray, str]] = None,
+    output: Optional[str] = None,
+    log_file: Optional[str] = None,
+    memory_budget: Optional[int] = None,
+) -> ClickManager:
+    r"""
+    Annotate an image without blocking the asyncio loop, and return the clicks.
+
+    The asyncio loop is paused only while a modal dialog of the window is open
+    (see :func:`open_session`).
+
+    .. code-block:: python
+
+        from pyclickimage.aio import annotate
+
+        clicks = await annotate(image)  # e.g. in a Jupyter cell
+
+    Parameters
+    ----------
+    image, output, log_file, memory_budget
+        See :func:`pyclickimage.run`.
+
+    Returns
+    -------
+    ClickManager
+        The clicks, when the window is closed.
+    """
+    session = open_session(image, output, log_file=log_file, memory_budget=memory_budget)
+    return await session.wait()
@@ -0,0 +1,117 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+import traceback
+from concurrent.futures import CancelledError
+from typing import Callable
+
+from PyQt5 import QtCore
+
+
+class BackgroundTask(QtCore.QThread):
+    r"""
+    Run a function in a worker thread and report its result with Qt signals.
+
+    The function is called with two extra keyword arguments:
+
+    - ``cancel_event`` (``threading.Event``): set when :meth:`cancel` is called.
+      The function should check it regularly and raise ``concurrent.futures.CancelledError``.
+    - ``progress`` (callable): report the progress as a float in [0, 1].
+
+    The signals are emitted from the worker thread and delivered in the thread
+    of the connected receivers (queued connections), so GUI slots can be connected directly.
+
+    Parameters
+    ----------
+    func : Callable
+        Function to run.
+    *args, **kwargs
+        Arguments of the function.
+    """
+
+    progress_signal = QtCore.pyqtSignal(float)
+    result_signal = QtCore.pyqtSignal(object)
+    error_signal = QtCore.pyqtSignal(str)
+    cancelled_signal = QtCore.pyqtSignal()
+
+    def __init__(self, func: Callable, *args, parent=None, **kwargs):
+        super().__init__(parent)
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self.cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        r"""
+        Request the cancellation of the task.
+        """
+        self.cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        r"""
+        True if the cancellation has been requested.
+        """
+        return self.cancel_event.is_set()
+
+    def run(self) -> None:
+        r"""
+        Thread entry point (do not call directly, use ``start()``).
+        """
+        try:
+            result = self._func(
+                *self._args,
+                cancel_event=self.cancel_event,
+                progress=self.progress_signal.emit,
+                **self._kwargs,
+            )
+        except CancelledError:
+            self.cancelled_signal.emit()
+            return
+        except Exception as e:
+            traceback.print_exc()
+            self.error_signal.emit(str(e))
+            return
+
+        if self.cancel_event.is_set():
+            self.cancelled_signal.emit()
+        else:
+            self.result_signal.emit(result)
+
+
+class PreviewTask(BackgroundTask):
+    r"""
+    Background task reporting intermediate results (e.g. a preview of an image being loaded).
+
+    The function receives an extra keyword argument ``preview`` (callable) that emits
+    :attr:`preview_signal` with its arguments as a tuple.
+
+    Parameters
+    ----------
+    func : Callable
+        Function to run.
+    *args, **kwargs
+        Arguments of the function.
+    """
+
+    preview_signal = QtCore.pyqtSignal(object)
+
+    def __init__(self, func: Callable, *args, parent=None, **kwargs):
+        super().__init__(func, *args, parent=parent, **kwargs)
+        self._kwargs["preview"] = lambda *values: self.preview_signal.emit(values)
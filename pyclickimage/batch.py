@@ -0,0 +1,587 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import time
+import struct
+import functools
+import multiprocessing
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, TextIO, Tuple
+
+import cv2
+
+from .click_manager import ClickManager
+from .formats import FORMATS, ClickFormat, load_clicks, save_clicks
+from .transforms import CoordinateTransform
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+# =========================================================
+# FILES
+# =========================================================
+
+
+def iter_click_files(paths: Iterable[str]) -> Iterator[str]:
+    r"""
+    Expand files and directories (searched recursively) into click file paths.
+
+    Parameters
+    ----------
+    paths : Iterable[str]
+        Click files or directories.
+
+    Yields
+    ------
+    str
+        Paths of the click files (``.csv``, ``.json``, ``.npz``), in sorted order per directory.
+    """
+    extensions = tuple("." + fmt for fmt in FORMATS)
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield os.path.join(root, name)
+
+
+def find_image(click_path: str, images_dir: str) -> Optional[str]:
+    r"""
+    Find the image with the same stem as a click file in a directory.
+    """
+    stem = os.path.splitext(os.path.basename(click_path))[0]
+    for ext in IMAGE_EXTENSIONS:
+        for candidate in (stem + ext, stem + ext.upper()):
+            path = os.path.join(images_dir, candidate)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def _png_size(f) -> Optional[Tuple[int, int]]:
+    f.seek(16)
+    width, height = struct.unpack(">II", f.read(8))
+    return width, height
+
+
+def _jpeg_size(f) -> Optional[Tuple[int, int]]:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        (length,) = struct.unpack(">H", f.read(2))
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            _, height, width = struct.unpack(">BHH", f.read(5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _bmp_size(f) -> Optional[Tuple[int, int]]:
+    f.seek(18)
+    width, height = struct.unpack("<ii", f.read(8))
+    return width, abs(height)
+
+
+def _tiff_size(f, order: str) -> Optional[Tuple[int, int]]:
+    f.seek(2)
+    (magic,) = struct.unpack(order + "H", f.read(2))
+    if magic != 42:  # BigTIFF is not parsed
+        return None
+    (offset,) = struct.unpack(order + "I", f.read(4))
+    f.seek(offset)
+    (n_entries,) = struct.unpack(order + "H", f.read(2))
+    size = {}
+    for _ in range(n_entries):
+        tag, kind, _, value = struct.unpack(order + "HHI4s", f.read(12))
+        if tag in (256, 257):
+            fmt = order + ("H" if kind == 3 else "I")
+            size[tag] = struct.unpack(fmt, value[: struct.calcsize(fmt)])[0]
+        if len(size) == 2:
+            return size[256], size[257]
+    return None
+
+
+def read_header_size(path: str) -> Optional[Tuple[int, int]]:
+    r"""
+    Read the size of an image from its header only (PNG, JPEG, BMP, TIFF).
+
+    Parameters
+    ----------
+    path : str
+        Image path.
+
+    Returns
+    -------
+    Optional[Tuple[int, int]]
+        Width and height in pixels, or None for other files (or unusual headers).
+    """
+    with open(path, "rb") as f:
+        head = f.read(4)
+        try:
+            if head == b"\x89PNG":
+                return _png_size(f)
+            if head[:2] == b"\xff\xd8":
+                return _jpeg_size(f)
+            if head[:2] == b"BM":
+                return _bmp_size(f)
+            if head[:2] in (b"II", b"MM"):
+                return _tiff_size(f, "<" if head[:2] == b"II" else ">")
+        except struct.error:
+            return None
+    return None
+
+
+def read_image_size(path: str) -> Tuple[int, int]:
+    r"""
+    Read the size of an image from its header only (PNG, JPEG, BMP, TIFF).
+
+    Other files (or unusual headers) fall back to a full decode with OpenCV.
+
+    Parameters
+    ----------
+    path : str
+        Image path.
+
+    Returns
+    -------
+    Tuple[int, int]
+        Width and height in pixels.
+
+    Raises
+    ------
+    ValueError
+        If the image cannot be read.
+    """
+    size = read_header_size(path)
+
+    if size is None:
+        image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError(f"Cannot read image '{path}'.")
+        size = (image.shape[1], image.shape[0])
+    return size
+
+
+# =========================================================
+# PARALLEL EXECUTION
+# =========================================================
+
+
+class ProgressReporter:
+    r"""
+    Single-line progress report (count, percentage, rate, errors) on a text stream.
+
+    Parameters
+    ----------
+    total : int, optional
+        Number of items, if known.
+    stream : TextIO
+        Output stream.
+        Default is ``sys.stderr``.
+    interval : float
+        Minimal time between two refreshes in seconds.
+        Default is 0.2.
+    """
+
+    def __init__(self, total: Optional[int] = None, stream: TextIO = sys.stderr, interval: float = 0.2):
+        self.total = total
+        self.stream = stream
+        self.interval = interval
+        self.done = 0
+        self.errors = 0
+        self._t0 = time.perf_counter()
+        self._last = 0.0
+
+    def update(self, n: int = 1, error: bool = False) -> None:
+        r"""
+        Count processed items.
+        """
+        self.done += n
+        self.errors += int(error)
+        now = time.perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            self._write(now)
+
+    def _write(self, now: float) -> None:
+        rate = self.done / max(now - self._t0, 1e-9)
+        if self.total:
+            text = f"[{self.done}/{self.total}] {100.0 * self.done / self.total:5.1f}%"
+        else:
+            text = f"[{self.done}]"
+        text += f"  {rate:.1f} files/s"
+        if self.errors:
+            text += f"  {self.errors} errors"
+        self.stream.write("\r" + text)
+        self.stream.flush()
+
+    def close(self) -> None:
+        r"""
+        Write the final report and end the line.
+        """
+        self._write(time.perf_counter())
+        self.stream.write("\n")
+        self.stream.flush()
+
+
+def run_parallel(
+    func: Callable,
+    items: Sequence,
+    workers: Optional[int] = None,
+    ordered: bool = False,
+    chunksize: Optional[int] = None,
+    progress: Optional[ProgressReporter] = None,
+) -> Iterator:
+    r"""
+    Apply a function to items in a process pool and yield the results as they arrive.
+
+    The results are streamed (the caller can write them while the other items are processed).
+    With ``workers=1`` the items are processed in the current process.
+
+    Parameters
+    ----------
+    func : Callable
+        Picklable function of one item returning a dictionary (``"error"`` key on failure).
+    items : Sequence
+        Items to process.
+    workers : int, optional
+        Number of processes. If None, uses the number of CPUs.
+    ordered : bool
+        Yield the results in the order of the items.
+        Default is False.
+    chunksize : int, optional
+        Number of items sent at once to a process. If None, chosen from the number of items.
+    progress : ProgressReporter, optional
+        Updated after each result.
+
+    Yields
+    ------
+    Any
+        The results of ``func``.
+    """
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(items)))
+
+    if workers == 1:
+        results = map(func, items)
+        pool = None
+    else:
+        chunksize = chunksize or max(1, min(64, len(items) // (4 * workers)))
+        pool = multiprocessing.Pool(workers)
+        imap = pool.imap if ordered else pool.imap_unordered
+        results = imap(func, items, chunksize)
+
+    try:
+        for result in results:
+            if progress is not None:
+                progress.update(error=isinstance(result, dict) and "error" in result)
+            yield result
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def _guard(func: Callable) -> Callable:
+    r"""
+    Turn the exceptions of a per-file task into an ``{"path", "error"}`` result.
+    """
+
+    @functools.wraps(func)
+    def wrapper(path, *args, **kwargs):
+        try:
+            return func(path, *args, **kwargs)
+        except Exception as e:
+            return {"path": path, "error": f"{type(e).__name__}: {e}"}
+
+    return wrapper
+
+
+# =========================================================
+# TASKS
+# =========================================================
+
+
+@_guard
+def convert_file(
+    path: str,
+    output: str,
+    fmt: Optional[ClickFormat] = None,
+    precision_mode: Literal["float", "int"] = "float",
+    half_shift: Optional[Literal["on", "off"]] = None,
+    transforms: Optional[Dict[str, CoordinateTransform]] = None,
+) -> dict:
+    r"""
+    Convert a click file (format, precision, half-shift convention, calibrated coordinates).
+
+    Parameters
+    ----------
+    path : str
+        Input click file.
+    output : str
+        Output click file.
+    fmt : str, optional
+        Output format. If None, it is detected from the output extension.
+    precision_mode : str
+        Precision of the written coordinates ("float" or "int").
+        Default is "float".
+    half_shift : str, optional
+        "on" applies :meth:`ClickManager.to_half_shift_on` (corner to pixel-center convention),
+        "off" applies :meth:`ClickManager.to_half_shift_off`. If None, the coordinates are not shifted.
+    transforms : Dict[str, CoordinateTransform], optional
+        Named transforms (see :mod:`pyclickimage.transforms`) applied to the shifted coordinates;
+        their calibrated coordinates are written next to the pixel coordinates.
+
+    Returns
+    -------
+    dict
+        ``{"path", "output", "n_clicks"}``.
+    """
+    click_manager = load_clicks(path)
+    if half_shift == "on":
+        click_manager.to_half_shift_on()
+    elif half_shift == "off":
+        click_manager.to_half_shift_off()
+    click_manager.precision_mode = precision_mode
+    for name, transform in (transforms or {}).items():
+        click_manager.add_transform(name, transform)
+
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    save_clicks(click_manager, output, fmt)
+    return {"path": path, "output": output, "n_clicks": click_manager.n_clicks}
+
+
+def _convert_job(job: Tuple[str, str], **kwargs) -> dict:
+    return convert_file(job[0], job[1], **kwargs)
+
+
+def convert_files(
+    jobs: Sequence[Tuple[str, str]],
+    fmt: Optional[ClickFormat] = None,
+    precision_mode: Literal["float", "int"] = "float",
+    half_shift: Optional[Literal["on", "off"]] = None,
+    transforms: Optional[Dict[str, CoordinateTransform]] = None,
+    workers: Optional[int] = None,
+    progress: Optional[ProgressReporter] = None,
+) -> Iterator[dict]:
+    r"""
+    Convert many click files in a process pool (see :func:`convert_file`).
+
+    Parameters
+    ----------
+    jobs : Sequence[Tuple[str, str]]
+        (input, output) paths.
+    fmt, precision_mode, half_shift, transforms
+        See :func:`convert_file`.
+    workers : int, optional
+        Number of processes. If None, uses the number of CPUs.
+    progress : ProgressReporter, optional
+        Progress report.
+
+    Yields
+    ------
+    dict
+        The result of each conversion, as they arrive.
+    """
+    func = functools.partial(
+        _convert_job,
+        fmt=fmt,
+        precision_mode=precision_mode,
+        half_shift=half_shift,
+        transforms=transforms,
+    )
+    yield from run_parallel(func, jobs, workers, progress=progress)
+
+
+@_guard
+def load_file(path: str) -> dict:
+    r"""
+    Load a click file.
+
+    Returns
+    -------
+    dict
+        ``{"path", "click_manager"}``.
+    """
+    return {"path": path, "click_manager": load_clicks(path)}
+
+
+@_guard
+def file_stats(path: str) -> dict:
+    r"""
+    Compute the per-group statistics of a click file (see :meth:`ClickManager.group_stats`).
+
+    Returns
+    -------
+    dict
+        ``{"path", "groups": {group: stats}}``.
+    """
+    return {"path": path, "groups": load_clicks(path).stats()}
+
+
+@_guard
+def validate_file(
+    path: str,
+    image: Optional[str] = None,
+    images_dir: Optional[str] = None,
+    half_shift: bool = True,
+) -> dict:
+    r"""
+    Check that the clicks of a file are inside the bounds of their image.
+
+    Only the image header is read to get its size (see :func:`read_image_size`).
+
+    Parameters
+    ----------
+    path : str
+        Click file.
+    image : str, optional
+        Image of the clicks.
+    images_dir : str, optional
+        Directory of the images, matched with the click file by stem (used if ``image`` is None).
+    half_shift : bool
+        Coordinates convention of the clicks (True: (0,0) on the center of the first pixel,
+        valid range [-0.5, W - 0.5]; False: valid range [0, W]).
+        Default is True.
+
+    Returns
+    -------
+    dict
+        ``{"path", "image", "size", "n_clicks", "outside": [(group, index, x, y), ...]}``.
+    """
+    if image is None:
+        if images_dir is None:
+            raise ValueError("An image or an images directory is required.")
+        image = find_image(path, images_dir)
+        if image is None:
+            raise ValueError(f"No image matching '{path}' in '{images_dir}'.")
+
+    width, height = read_image_size(image)
+    lower = -0.5 if half_shift else 0.0
+
+    click_manager = load_clicks(path)
+    outside = []
+    for group, points in click_manager.groups.items():
+        for index, (x, y) in enumerate(points):
+            if x is None or y is None:
+                continue
+            if not (lower <= x <= lower + width and lower <= y <= lower + height):
+                outside.append((group, index, x, y))
+
+    return {
+        "path": path,
+        "image": image,
+        "size": (width, height),
+        "n_clicks": click_manager.n_clicks,
+        "outside": outside,
+    }
+
+
+def file_prefixes(paths: Sequence[str]) -> Dict[str, str]:
+    r"""
+    Unique name of each file, to prefix its groups when merging.
+
+    The name is the file stem, or the path relative to the common directory of the files
+    (with its extension) when several files have the same stem (e.g. ``a.csv``, ``out/a.json``).
+
+    Parameters
+    ----------
+    paths : Sequence[str]
+        Click files.
+
+    Returns
+    -------
+    Dict[str, str]
+        Name of each path.
+
+    Raises
+    ------
+    ValueError
+        If a file is given twice.
+    """
+    paths = [os.path.abspath(path) for path in paths]
+    if len(set(paths)) != len(paths):
+        raise ValueError("A file is given twice.")
+
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in paths]) if paths else ""
+    names = {}
+    for path, stem in zip(paths, stems):
+        if stems.count(stem) > 1:
+            stem = os.path.relpath(path, root).replace(os.sep, "/")
+        names[path] = stem
+    return names
+
+
+def merge_files(
+    paths: Sequence[str],
+    prefix: Literal["none", "stem"] = "none",
+    workers: Optional[int] = None,
+    progress: Optional[ProgressReporter] = None,
+    errors: Optional[List[dict]] = None,
+) -> ClickManager:
+    r"""
+    Merge click files into one :class:`ClickManager`.
+
+    The files are parsed in a process pool and merged in order as they arrive.
+
+    Parameters
+    ----------
+    paths : Sequence[str]
+        Click files.
+    prefix : str
+        "stem" prefixes the group names with the file name (``stem/group``, see :func:`file_prefixes`
+        for the files with the same stem), "none" appends the clicks of groups with the same name.
+        Default is "none".
+    workers : int, optional
+        Number of processes. If None, uses the number of CPUs.
+    progress : ProgressReporter, optional
+        Progress report.
+    errors : List[dict], optional
+        If given, the failed files are appended to it instead of raising.
+
+    Returns
+    -------
+    ClickManager
+        The merged clicks.
+    """
+    names = file_prefixes(paths) if prefix == "stem" else {}
+    merged = ClickManager()
+    for result in run_parallel(load_file, paths, workers, ordered=True, progress=progress):
+        if "error" in result:
+            if errors is None:
+                raise ValueError(f"{result['path']}: {result['error']}")
+            errors.append(result)
+            continue
+        name = names.get(os.path.abspath(result["path"]))
+        merged.merge(result["click_manager"], prefix=f"{name}/" if name is not None else "")
+    return merged
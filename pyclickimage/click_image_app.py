@@ -18,14 +18,40 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import sys
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 import numpy as np
 import cv2
 from PyQt5 import QtWidgets, QtGui, QtCore
 
 from .click_manager import ClickManager
+from .thread_safe import ThreadSafeClickManager
 from .image_viewer import ImageViewer
+from .refinement import refine_click_manager, REFINEMENT_METHODS
+from .feature_index import detect_features, FeatureIndex, FEATURE_KINDS
+from .background import BackgroundTask, PreviewTask
+from .template_matching import find_template_matches
+from .log_panel import LogPanel
+from .group_list import GroupSelector
+from .frames import (
+    FrameCache,
+    open_frame_source,
+    merge_frames,
+    split_frames,
+    FRAME_COLUMN,
+    VIDEO_EXTENSIONS,
+    STACK_EXTENSIONS,
+)
+from .image_cache import (
+    ImageCache,
+    load_image_levels,
+    build_pyramid,
+    level_for_zoom,
+)
+from .memory import MemoryGovernor, MemoryBudgetError, array_nbytes, render_nbytes, format_bytes
+from .propagation import propagate_points, store_propagation, REVIEW_COLUMN, CONFIDENCE_COLUMN
+from .strokes import STROKE_COLUMN, stroke_paths
+from .tracing import traced, span
 from .__version__ import __version__
 
 
@@ -40,10 +66,35 @@ class ClickImageApp(QtWidgets.QMainWindow):
     - Multiple click groups
     - CSV export/import
     - Real-time overlay rendering
+
+    The memory held by the image buffers, display caches and markers is accounted by a
+    :class:`MemoryGovernor`. Under its budget (``memory_budget`` or the
+    ``PYCLICKIMAGE_MEMORY_BUDGET`` environment variable), the frame cache is evicted first,
+    then coarser display levels are used, and images that do not fit are refused.
+    The usage is displayed in the status bar.
+
+    The displayed clicks are a :class:`ThreadSafeClickManager`: worker threads (e.g. detectors)
+    add points with :meth:`ThreadSafeClickManager.post_clicks`, and the posted mutations are
+    applied in the GUI thread, with one refresh per batch.
+
+    Signals
+    -------
+    click_manager_changed_signal(ClickManager)
+        The displayed click manager was replaced (clicks loaded, frame changed, ...).
+    closed_signal(ClickManager)
+        The window was closed; sends the final clicks (see :meth:`collect_clicks`).
     """
 
+    click_manager_changed_signal = QtCore.pyqtSignal(object)
+    closed_signal = QtCore.pyqtSignal(object)
+    _clicks_posted_signal = QtCore.pyqtSignal(object)
+
     def __init__(
-        self, image: Optional[np.ndarray] = None, output: Optional[str] = None
+        self,
+        image: Optional[Union[np.ndarray, str]] = None,
+        output: Optional[str] = None,
+        log_file: Optional[str] = None,
+        memory_budget: Optional[int] = None,
     ):
         super().__init__()
 
@@ -54,6 +105,7 @@ class ClickImageApp(QtWidgets.QMainWindow):
         # -------------------------
         self.initialization_done = False
         self._is_saved = False
+        self.confirm_exit = True
         self._image_has_changed = True
         self._colormap_has_changed = True
         self._is_empty_image = True
@@ -67,23 +119,79 @@ class ClickImageApp(QtWidgets.QMainWindow):
         self.display_max_pc = 100
         self.show_clicks = True
         self.marker_color = QtGui.QColor(255, 0, 0)
+        self.review_color = QtGui.QColor(255, 165, 0)
         self.marker_size = 8
+        self.refine_on_click = False
+        self.snap_to_features = False
+
+        # -------------------------
+        # Feature index (snap mode)
+        # -------------------------
+        self._feature_index: Optional[FeatureIndex] = None
+        self._feature_task: Optional[BackgroundTask] = None
+
+        # -------------------------
+        # Long task (status bar progress)
+        # -------------------------
+        self._long_task: Optional[BackgroundTask] = None
+
+        # -------------------------
+        # Frame sequence (video / multi-page TIFF)
+        # -------------------------
+        self.frame_cache: Optional[FrameCache] = None
+        self.frame_index = 0
+        self.frame_clicks: Dict[int, ClickManager] = {}
 
         # -------------------------
         # Core components
         # -------------------------
-        self.click_manager = ClickManager(precision_mode="float")
+        self.click_manager = ThreadSafeClickManager(precision_mode="float")
+        # Mutations posted by worker threads are committed in the GUI thread
+        self._clicks_posted_signal.connect(self._on_clicks_posted, QtCore.Qt.QueuedConnection)
+        self._watch_posts(self.click_manager)
         self.viewer = ImageViewer(half_shift=True)
 
         self.viewer.auto_marker = False  # Don't draw directly
         self.viewer.left_click_signal.connect(self._process_left_click)
         self.viewer.right_click_signal.connect(self._process_right_click)
+        self.viewer.stroke_signal.connect(self._process_stroke)
+        self.viewer.zoom_changed_signal.connect(self.on_zoom_changed)
+
+        # Decoded pyramids of the opened image files (reopening a file skips the decoding)
+        self.image_cache = ImageCache()
+        self.image_levels: List[np.ndarray] = []
+        self._display_level = 0
+
+        # Reduced decode displayed while the full resolution image is loading:
+        # (preview, (full width, full height)); the clicks are in full resolution coordinates
+        self._preview: Optional[tuple] = None
+        self._pending_refine: List[tuple] = []
+        self._keep_view = False
+        # Clicks replaced while the preview is displayed (restored if the loading fails)
+        self._replaced_clicks: Optional[ClickManager] = None
+
+        # -------------------------
+        # Memory budget
+        # -------------------------
+        self.memory = MemoryGovernor.from_env()
+        if memory_budget is not None:
+            self.memory.budget = memory_budget
+        self.image: Optional[np.ndarray] = None
+        self.memory.register("image", lambda: array_nbytes(self.image))
+        self.memory.register(
+            "pyramid", lambda: sum(array_nbytes(level) for level in self.image_levels[1:])
+        )
+        self.memory.register(
+            "preview", lambda: 0 if self._preview is None else array_nbytes(self._preview[0])
+        )
+        self.memory.register("pixmap", lambda: self.viewer.pixmap_nbytes)
+        self.memory.register("markers", lambda: self.viewer.markers_nbytes)
 
         # -------------------------
         # Logging
         # -------------------------
-        self.log_text_edit = QtWidgets.QTextEdit()
-        self.log_text_edit.setReadOnly(True)
+        self.log_panel = LogPanel(max_lines=10_000)
+        self.log_panel.set_log_file(log_file)
 
         # -------------------------
         # Output file
@@ -93,7 +201,14 @@ class ClickImageApp(QtWidgets.QMainWindow):
         # -------------------------
         # Image
         # -------------------------
-        self.set_image(image)
+        if isinstance(image, str):
+            # Decoded unchanged, as an array given by the caller (16-bit and float images are kept)
+            levels = load_image_levels(
+                image, self.image_cache, max_bytes=self.memory.allowance(), flags=cv2.IMREAD_UNCHANGED
+            )
+            self.set_image(levels[0], levels=levels)
+        else:
+            self.set_image(image)
 
         # -------------------------
         # UI
@@ -109,14 +224,21 @@ class ClickImageApp(QtWidgets.QMainWindow):
         quit_action.triggered.connect(self.close)
 
         self.addAction(quit_action)
-        self.layout.addWidget(self.viewer)
+
+        viewer_widget = QtWidgets.QWidget()
+        self.viewer_layout = QtWidgets.QVBoxLayout(viewer_widget)
+        self.viewer_layout.setContentsMargins(0, 0, 0, 0)
+        self.viewer_layout.addWidget(self.viewer)
+        self.layout.addWidget(viewer_widget)
         self.side = QtWidgets.QVBoxLayout()
         self.side_widget = QtWidgets.QWidget()
         self.side_widget.setFixedWidth(340)
         self.side_widget.setLayout(self.side)
 
         self._init_left_panel()
+        self._init_frame_bar()
         self._init_toolbar()
+        self._init_status_bar()
 
         # -------------------------
         # Signals
@@ -151,6 +273,12 @@ class ClickImageApp(QtWidgets.QMainWindow):
         self.load_image_btn.setShortcut("Ctrl+O")
         self.side.addWidget(self.load_image_btn)
 
+        self.load_sequence_btn = QtWidgets.QPushButton("Load Sequence (Ctrl+Shift+O)")
+        self.load_sequence_btn.setToolTip("Open a video or a multi-page TIFF")
+        self.load_sequence_btn.clicked.connect(self.on_load_sequence)
+        self.load_sequence_btn.setShortcut("Ctrl+Shift+O")
+        self.side.addWidget(self.load_sequence_btn)
+
         self.load_click_btn = QtWidgets.QPushButton("Load Clicks")
         self.load_click_btn.clicked.connect(self.on_load_clicks)
         self.side.addWidget(self.load_click_btn)
@@ -180,17 +308,20 @@ class ClickImageApp(QtWidgets.QMainWindow):
         # ============================================================
         # Group selector
         # ============================================================
-        row = QtWidgets.QHBoxLayout()
+        self.side.addWidget(QtWidgets.QLabel("Group"))
 
-        row.addWidget(QtWidgets.QLabel("Group"))
-
-        self.group_selector = QtWidgets.QComboBox()
-        self.group_selector.addItem("default")
+        self.group_selector = GroupSelector()
+        self.group_selector.attach(self.click_manager)
         self.group_selector.currentTextChanged.connect(self.on_group_changed)
 
-        row.addWidget(self.group_selector)
+        self.side.addWidget(self.group_selector)
 
-        self.side.addLayout(row)
+        # Keyboard navigation between the (visible) groups
+        next_group = QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+PgDown"), self)
+        next_group.activated.connect(self.group_selector.select_next)
+        previous_group = QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+PgUp"), self)
+        previous_group.activated.connect(self.group_selector.select_previous)
+        self.group_selector.setToolTip("Next / previous group: Ctrl+PgDown / Ctrl+PgUp")
 
         # -------------------------
         # Group management buttons
@@ -244,6 +375,11 @@ class ClickImageApp(QtWidgets.QMainWindow):
         self.table.setMinimumHeight(180)
         self.side.addWidget(self.table)
 
+        # Summary of the current group (incremental statistics of the click manager)
+        self.stats_label = QtWidgets.QLabel()
+        self.stats_label.setWordWrap(True)
+        self.side.addWidget(self.stats_label)
+
         # ============================================================
         # Save button
         # ============================================================
@@ -264,7 +400,47 @@ class ClickImageApp(QtWidgets.QMainWindow):
         # ============================================================
         # Log
         # ============================================================
-        self.side.addWidget(self.log_text_edit)
+        self.side.addWidget(self.log_panel)
+
+    def _init_frame_bar(self):
+        r"""Build the frame bar under the viewer (hidden until a sequence is loaded)"""
+        self.frame_bar = QtWidgets.QWidget()
+        row = QtWidgets.QHBoxLayout(self.frame_bar)
+        row.setContentsMargins(0, 0, 0, 0)
+
+        self.previous_frame_btn = QtWidgets.QToolButton()
+        self.previous_frame_btn.setText("◀")
+        self.previous_frame_btn.setToolTip("Previous frame (Alt+Left)")
+        self.previous_frame_btn.clicked.connect(self.on_previous_frame)
+
+        self.next_frame_btn = QtWidgets.QToolButton()
+        self.next_frame_btn.setText("▶")
+        self.next_frame_btn.setToolTip("Next frame (Alt+Right)")
+        self.next_frame_btn.clicked.connect(self.on_next_frame)
+
+        self.frame_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        self.frame_slider.setRange(0, 0)
+        self.frame_slider.valueChanged.connect(self.on_frame_changed)
+
+        self.frame_spinbox = QtWidgets.QSpinBox()
+        self.frame_spinbox.setRange(0, 0)
+        self.frame_spinbox.valueChanged.connect(self.on_frame_changed)
+
+        self.frame_count_label = QtWidgets.QLabel("/ 0")
+
+        row.addWidget(self.previous_frame_btn)
+        row.addWidget(self.frame_slider)
+        row.addWidget(self.next_frame_btn)
+        row.addWidget(self.frame_spinbox)
+        row.addWidget(self.frame_count_label)
+
+        self.viewer_layout.addWidget(self.frame_bar)
+        self.frame_bar.hide()
+
+        next_frame = QtWidgets.QShortcut(QtGui.QKeySequence("Alt+Right"), self)
+        next_frame.activated.connect(self.on_next_frame)
+        previous_frame = QtWidgets.QShortcut(QtGui.QKeySequence("Alt+Left"), self)
+        previous_frame.activated.connect(self.on_previous_frame)
 
     def _init_toolbar(self):
         r"""Build toolbar"""
@@ -283,6 +459,19 @@ class ClickImageApp(QtWidgets.QMainWindow):
 
         toolbar.addSeparator()
 
+        # ============================================================
+        # PERFORMANCE HUD
+        # ============================================================
+
+        self.hud_action = toolbar.addAction("HUD")
+        self.hud_action.setCheckable(True)
+        self.hud_action.setChecked(self.viewer.is_perf_hud_enabled())
+        self.hud_action.setToolTip("Show performance HUD (Ctrl+Shift+H)")
+        self.hud_action.setShortcut("Ctrl+Shift+H")
+        self.hud_action.toggled.connect(self.on_perf_hud_toggled)
+
+        toolbar.addSeparator()
+
         # ============================================================
         # IMAGE
         # ============================================================
@@ -507,6 +696,230 @@ class ClickImageApp(QtWidgets.QMainWindow):
 
         toolbar.addWidget(clicks_btn)
 
+        # ============================================================
+        # REFINE
+        # ============================================================
+
+        toolbar.addSeparator()
+
+        refine_btn = QtWidgets.QToolButton()
+        refine_btn.setText("⚙ Refine")
+        refine_btn.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+
+        refine_menu = QtWidgets.QMenu(self)
+
+        refine_panel = QtWidgets.QWidget()
+        refine_layout = QtWidgets.QFormLayout(refine_panel)
+
+        self.refine_method_selector = QtWidgets.QComboBox()
+        self.refine_method_selector.addItems(list(REFINEMENT_METHODS))
+        refine_layout.addRow("Method", self.refine_method_selector)
+
+        self.refine_polarity_selector = QtWidgets.QComboBox()
+        self.refine_polarity_selector.addItems(["bright", "dark"])
+        refine_layout.addRow("Target", self.refine_polarity_selector)
+
+        self.refine_window_spin = QtWidgets.QSpinBox()
+        self.refine_window_spin.setRange(1, 50)
+        self.refine_window_spin.setValue(5)
+        self.refine_window_spin.setSuffix(" px")
+        refine_layout.addRow("Half window", self.refine_window_spin)
+
+        self.refine_on_click_checkbox = QtWidgets.QCheckBox("Refine new clicks")
+        self.refine_on_click_checkbox.setChecked(self.refine_on_click)
+        self.refine_on_click_checkbox.stateChanged.connect(self.on_refine_on_click_changed)
+        refine_layout.addRow(self.refine_on_click_checkbox)
+
+        self.refine_group_btn = QtWidgets.QPushButton("Refine group")
+        self.refine_group_btn.clicked.connect(self.on_refine_group)
+        refine_layout.addRow(self.refine_group_btn)
+
+        self.refine_all_btn = QtWidgets.QPushButton("Refine all groups")
+        self.refine_all_btn.clicked.connect(self.on_refine_all)
+        refine_layout.addRow(self.refine_all_btn)
+
+        self.reset_refine_btn = QtWidgets.QPushButton("Restore raw clicks")
+        self.reset_refine_btn.clicked.connect(self.on_reset_refinement)
+        refine_layout.addRow(self.reset_refine_btn)
+
+        refine_action = QtWidgets.QWidgetAction(refine_menu)
+        refine_action.setDefaultWidget(refine_panel)
+
+        refine_menu.addAction(refine_action)
+
+        refine_btn.setMenu(refine_menu)
+
+        toolbar.addWidget(refine_btn)
+
+        # ============================================================
+        # SNAP
+        # ============================================================
+
+        toolbar.addSeparator()
+
+        snap_btn = QtWidgets.QToolButton()
+        snap_btn.setText("⚙ Snap")
+        snap_btn.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+
+        snap_menu = QtWidgets.QMenu(self)
+
+        snap_panel = QtWidgets.QWidget()
+        snap_layout = QtWidgets.QFormLayout(snap_panel)
+
+        self.snap_checkbox = QtWidgets.QCheckBox("Snap to features (Ctrl+F)")
+        self.snap_checkbox.setChecked(self.snap_to_features)
+        self.snap_checkbox.setShortcut("Ctrl+F")
+        self.snap_checkbox.stateChanged.connect(self.on_snap_changed)
+        snap_layout.addRow(self.snap_checkbox)
+
+        self.snap_kind_selector = QtWidgets.QComboBox()
+        self.snap_kind_selector.addItems(list(FEATURE_KINDS))
+        self.snap_kind_selector.currentTextChanged.connect(self.on_snap_kind_changed)
+        snap_layout.addRow("Features", self.snap_kind_selector)
+
+        self.snap_radius_spin = QtWidgets.QDoubleSpinBox()
+        self.snap_radius_spin.setRange(0.5, 100.0)
+        self.snap_radius_spin.setValue(5.0)
+        self.snap_radius_spin.setSuffix(" px")
+        snap_layout.addRow("Radius", self.snap_radius_spin)
+
+        self.snap_status_label = QtWidgets.QLabel("Index: not built")
+        snap_layout.addRow(self.snap_status_label)
+
+        snap_action = QtWidgets.QWidgetAction(snap_menu)
+        snap_action.setDefaultWidget(snap_panel)
+
+        snap_menu.addAction(snap_action)
+
+        snap_btn.setMenu(snap_menu)
+
+        toolbar.addWidget(snap_btn)
+
+        # ============================================================
+        # FREEHAND STROKE
+        # ============================================================
+
+        toolbar.addSeparator()
+
+        stroke_btn = QtWidgets.QToolButton()
+        stroke_btn.setText("⚙ Stroke")
+        stroke_btn.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+
+        stroke_menu = QtWidgets.QMenu(self)
+
+        stroke_panel = QtWidgets.QWidget()
+        stroke_layout = QtWidgets.QFormLayout(stroke_panel)
+
+        self.stroke_checkbox = QtWidgets.QCheckBox("Freehand strokes (Shift + drag)")
+        self.stroke_checkbox.setChecked(self.viewer.stroke_modifier is not None)
+        self.stroke_checkbox.stateChanged.connect(self.on_stroke_changed)
+        stroke_layout.addRow(self.stroke_checkbox)
+
+        self.stroke_tolerance_spin = QtWidgets.QDoubleSpinBox()
+        self.stroke_tolerance_spin.setRange(0.1, 50.0)
+        self.stroke_tolerance_spin.setSingleStep(0.5)
+        self.stroke_tolerance_spin.setValue(self.viewer.stroke_tolerance)
+        self.stroke_tolerance_spin.setSuffix(" px")
+        self.stroke_tolerance_spin.setToolTip("Maximal distance between the stroke and the drawn path")
+        self.stroke_tolerance_spin.valueChanged.connect(self.on_stroke_tolerance_changed)
+        stroke_layout.addRow("Tolerance", self.stroke_tolerance_spin)
+
+        stroke_action = QtWidgets.QWidgetAction(stroke_menu)
+        stroke_action.setDefaultWidget(stroke_panel)
+
+        stroke_menu.addAction(stroke_action)
+
+        stroke_btn.setMenu(stroke_menu)
+
+        toolbar.addWidget(stroke_btn)
+
+        # ============================================================
+        # TEMPLATE MATCHING
+        # ============================================================
+
+        toolbar.addSeparator()
+
+        match_btn = QtWidgets.QToolButton()
+        match_btn.setText("⚙ Match")
+        match_btn.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+
+        match_menu = QtWidgets.QMenu(self)
+
+        match_panel = QtWidgets.QWidget()
+        match_layout = QtWidgets.QFormLayout(match_panel)
+
+        self.match_size_spin = QtWidgets.QSpinBox()
+        self.match_size_spin.setRange(2, 200)
+        self.match_size_spin.setValue(15)
+        self.match_size_spin.setSuffix(" px")
+        match_layout.addRow("Half size", self.match_size_spin)
+
+        self.match_threshold_spin = QtWidgets.QDoubleSpinBox()
+        self.match_threshold_spin.setRange(-1.0, 1.0)
+        self.match_threshold_spin.setSingleStep(0.05)
+        self.match_threshold_spin.setValue(0.8)
+        match_layout.addRow("Threshold", self.match_threshold_spin)
+
+        self.match_btn = QtWidgets.QPushButton("Find similar to last click (Ctrl+M)")
+        self.match_btn.setShortcut("Ctrl+M")
+        self.match_btn.clicked.connect(self.on_match_template)
+        match_layout.addRow(self.match_btn)
+
+        match_action = QtWidgets.QWidgetAction(match_menu)
+        match_action.setDefaultWidget(match_panel)
+
+        match_menu.addAction(match_action)
+
+        match_btn.setMenu(match_menu)
+
+        toolbar.addWidget(match_btn)
+
+        # ============================================================
+        # PROPAGATION (frame sequences)
+        # ============================================================
+
+        propagate_btn = QtWidgets.QToolButton()
+        propagate_btn.setText("⚙ Propagate")
+        propagate_btn.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+
+        propagate_menu = QtWidgets.QMenu(self)
+
+        propagate_panel = QtWidgets.QWidget()
+        propagate_layout = QtWidgets.QFormLayout(propagate_panel)
+
+        self.propagate_frames_spin = QtWidgets.QSpinBox()
+        self.propagate_frames_spin.setRange(1, 10_000)
+        self.propagate_frames_spin.setValue(10)
+        propagate_layout.addRow("Frames", self.propagate_frames_spin)
+
+        self.propagate_window_spin = QtWidgets.QSpinBox()
+        self.propagate_window_spin.setRange(5, 101)
+        self.propagate_window_spin.setSingleStep(2)
+        self.propagate_window_spin.setValue(21)
+        self.propagate_window_spin.setSuffix(" px")
+        propagate_layout.addRow("Window", self.propagate_window_spin)
+
+        self.propagate_confidence_spin = QtWidgets.QDoubleSpinBox()
+        self.propagate_confidence_spin.setRange(0.0, 1.0)
+        self.propagate_confidence_spin.setSingleStep(0.05)
+        self.propagate_confidence_spin.setValue(0.5)
+        self.propagate_confidence_spin.setToolTip("Points with a lower confidence are flagged for review")
+        propagate_layout.addRow("Min confidence", self.propagate_confidence_spin)
+
+        self.propagate_btn = QtWidgets.QPushButton("Track into next frames (Ctrl+Shift+P)")
+        self.propagate_btn.setShortcut("Ctrl+Shift+P")
+        self.propagate_btn.clicked.connect(self.on_propagate)
+        propagate_layout.addRow(self.propagate_btn)
+
+        propagate_action = QtWidgets.QWidgetAction(propagate_menu)
+        propagate_action.setDefaultWidget(propagate_panel)
+
+        propagate_menu.addAction(propagate_action)
+
+        propagate_btn.setMenu(propagate_menu)
+
+        toolbar.addWidget(propagate_btn)
+
         # ============================================================
         # CROSSHAIR
         # ============================================================
@@ -561,6 +974,47 @@ class ClickImageApp(QtWidgets.QMainWindow):
 
         toolbar.addWidget(crosshair_btn)
 
+        # ============================================================
+        # LOUPE
+        # ============================================================
+
+        toolbar.addSeparator()
+
+        loupe_btn = QtWidgets.QToolButton()
+        loupe_btn.setText("⚙ Loupe")
+        loupe_btn.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+
+        loupe_menu = QtWidgets.QMenu(self)
+
+        loupe_panel = QtWidgets.QWidget()
+        loupe_layout = QtWidgets.QFormLayout(loupe_panel)
+
+        self.loupe_checkbox = QtWidgets.QCheckBox("Show loupe (Ctrl+L)")
+        self.loupe_checkbox.setShortcut("Ctrl+L")
+        self.loupe_checkbox.stateChanged.connect(self.on_loupe_changed)
+        loupe_layout.addRow(self.loupe_checkbox)
+
+        self.loupe_zoom_selector = QtWidgets.QComboBox()
+        self.loupe_zoom_selector.addItems(["4", "8", "16", "32"])
+        self.loupe_zoom_selector.setCurrentText(str(self.viewer.loupe.zoom))
+        self.loupe_zoom_selector.currentTextChanged.connect(self.on_loupe_zoom_changed)
+        loupe_layout.addRow("Zoom", self.loupe_zoom_selector)
+
+        self.loupe_size_selector = QtWidgets.QComboBox()
+        self.loupe_size_selector.addItems(["120", "160", "240", "320"])
+        self.loupe_size_selector.setCurrentText(str(self.viewer.loupe.loupe_size))
+        self.loupe_size_selector.currentTextChanged.connect(self.on_loupe_size_changed)
+        loupe_layout.addRow("Size (px)", self.loupe_size_selector)
+
+        loupe_action = QtWidgets.QWidgetAction(loupe_menu)
+        loupe_action.setDefaultWidget(loupe_panel)
+
+        loupe_menu.addAction(loupe_action)
+
+        loupe_btn.setMenu(loupe_menu)
+
+        toolbar.addWidget(loupe_btn)
+
         # ============================================================
         # LOGS
         # ============================================================
@@ -572,10 +1026,61 @@ class ClickImageApp(QtWidgets.QMainWindow):
 
         toolbar.addWidget(clear_log_btn)
 
+    def _init_status_bar(self):
+        r"""Build the status bar (progress of long tasks)"""
+        status = self.statusBar()
+
+        self.progress_label = QtWidgets.QLabel()
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setFixedWidth(200)
+
+        self.cancel_task_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_task_btn.clicked.connect(self.on_cancel_task)
+
+        status.addPermanentWidget(self.progress_label)
+        status.addPermanentWidget(self.progress_bar)
+        status.addPermanentWidget(self.cancel_task_btn)
+
+        self.progress_label.hide()
+        self.progress_bar.hide()
+        self.cancel_task_btn.hide()
+
+        # Memory usage (the frame cache grows in the background: checked every second)
+        self.memory_label = QtWidgets.QLabel()
+        status.addPermanentWidget(self.memory_label)
+        self._memory_timer = QtCore.QTimer(self)
+        self._memory_timer.setInterval(1000)
+        self._memory_timer.timeout.connect(self.update_memory)
+        self._memory_timer.start()
+        self.update_memory()
+
+    def update_memory(self):
+        r"""
+        Evict the caches over the memory budget and display the usage in the status bar.
+        """
+        freed = self.memory.enforce()
+        if freed:
+            self._append_log(f"Memory budget: {format_bytes(freed)} of cached frames evicted.")
+
+        usage = self.memory.usage()
+        total = sum(usage.values())
+        budget = self.memory.budget
+        text = f"Memory {format_bytes(total)}"
+        if budget is not None:
+            text += f" / {format_bytes(budget)}"
+        self.memory_label.setText(text)
+        self.memory_label.setToolTip(
+            "\n".join(f"{name}: {format_bytes(n)}" for name, n in usage.items() if n)
+        )
+        over = budget is not None and total > 0.9 * budget
+        self.memory_label.setStyleSheet("color: #d33;" if over else "")
+
     # ============================================================
     # Update pipeline
     # ============================================================
 
+    @traced()
     def update(self):
         r"""
         Refresh UI.
@@ -585,6 +1090,7 @@ class ClickImageApp(QtWidgets.QMainWindow):
 
         self.update_groups()
         self.update_table()
+        self.update_stats()
         self.update_viewer()
 
     def _format_value(self, v):
@@ -596,111 +1102,374 @@ class ClickImageApp(QtWidgets.QMainWindow):
 
         return f"{v:.3f}"
 
-    def update_viewer(self):
+    def _apply_contrast(self, img: np.ndarray) -> np.ndarray:
         r"""
-        Render image + clicks.
+        Apply the contrast settings (min, max, alpha, beta) to an image or a region of it.
         """
-        img = self.image.astype(np.float32)
-        imax = np.iinfo(self.image.dtype).max
+        imax = np.iinfo(img.dtype).max
         dm = self.display_min_pc * imax / 100
         dM = self.display_max_pc * imax / 100
         b = self.beta_pc * imax / 100
 
-        img = np.clip(img, dm, dM)
+        out = np.clip(img.astype(np.float32), dm, dM)
+
+        out = (out - dm) / max(1, dM - dm) * imax
+        out = out * self.alpha + b
+
+        return np.clip(np.round(out), 0, imax).astype(img.dtype)
+
+    def _to_display_rgb(self, img: np.ndarray) -> np.ndarray:
+        r"""
+        Apply the selected colormap and convert a BGR image to RGB for Qt.
+        """
+        colormap = self.get_selected_colormap()
+
+        if colormap is not None:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            img = cv2.applyColorMap(gray, colormap)
+
+        return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+    def render_display(self, img: np.ndarray) -> np.ndarray:
+        r"""
+        Render a BGR image (or a region of the source image) as displayed: contrast then colormap.
 
-        img = (img - dm) / max(1, dM - dm) * imax
-        img = img * self.alpha + b
+        Parameters
+        ----------
+        img : numpy.ndarray
+            BGR image with the dtype of the source image.
 
-        img = np.clip(np.round(img), 0, imax).astype(self.image.dtype)
+        Returns
+        -------
+        numpy.ndarray
+            RGB image.
+        """
+        return self._to_display_rgb(self._apply_contrast(img))
 
-        if self._image_has_changed or self._colormap_has_changed:
-            colormap = self.get_selected_colormap()
+    def _affordable_level(self, level: int) -> int:
+        r"""
+        Finest pyramid level, from ``level``, whose rendering fits in the memory budget
+        (the coarsest level is always rendered).
+        """
+        current = self.viewer.pixmap_nbytes
+        while level < len(self.image_levels) - 1:
+            img = self.image_levels[level]
+            if self.memory.fits(render_nbytes(img.shape, img.dtype.itemsize) - current):
+                break
+            level += 1
+        return level
+
+    def _render_level(self, level: int):
+        r"""
+        Render a pyramid level of the image as a pixmap, with its scale in image pixels.
+
+        A coarser level is used if the requested one does not fit in the memory budget.
+        """
+        affordable = self._affordable_level(level)
+        if affordable != level and affordable != self._display_level:
+            self._append_log(
+                f"Memory budget: display resolution reduced to level {affordable} "
+                f"(requested level {level})."
+            )
+        level = affordable
+        img = self.image_levels[level]
+        pix = self._render_pixmap(img)
+        self._display_level = level
+        full_h, full_w = self.image.shape[:2]
+        return pix, (full_w / img.shape[1], full_h / img.shape[0])
+
+    def _render_pixmap(self, img: np.ndarray) -> QtGui.QPixmap:
+        r"""
+        Render a BGR image as displayed (contrast then colormap) in a pixmap.
+        """
+        perf = self.viewer.perf
 
-            if colormap is not None:
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-                img = cv2.applyColorMap(gray, colormap)
+        with perf.stage("contrast"):
+            img = self._apply_contrast(img)
 
+        with perf.stage("qimage"):
             # conversion unique pour Qt
-            rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            rgb = self._to_display_rgb(img)
 
             h, w, ch = rgb.shape
             bytes_per_line = ch * w
 
-            qimg = QtGui.QImage(
-                rgb.data, w, h, bytes_per_line, QtGui.QImage.Format_RGB888
-            )
-            pix = QtGui.QPixmap.fromImage(qimg)
+            qimg = QtGui.QImage(rgb.data, w, h, bytes_per_line, QtGui.QImage.Format_RGB888)
+            return QtGui.QPixmap.fromImage(qimg)
+
+    def on_zoom_changed(self, zoom: float):
+        r"""
+        Display the pyramid level matching the zoom (coarser levels for zoomed-out views).
+        """
+        if not self.initialization_done or self._image_has_changed or self._preview is not None:
+            return
+        level = self._affordable_level(level_for_zoom(zoom, len(self.image_levels)))
+        if level != self._display_level:
+            pix, scale = self._render_level(level)
+            self.viewer.replace_pixmap(pix, scale)
 
-            self.viewer.set_image(pix)
+    @traced()
+    def update_viewer(self):
+        r"""
+        Render image + clicks.
+        """
+        perf = self.viewer.perf
+
+        if self._preview is not None:
+            if self._image_has_changed or self._colormap_has_changed:
+                preview, (full_w, full_h) = self._preview
+                pix = self._render_pixmap(preview)
+                scale = (full_w / preview.shape[1], full_h / preview.shape[0])
+                if self._image_has_changed:
+                    self.viewer.set_image(pix, scale)
+                else:
+                    self.viewer.replace_pixmap(pix, scale)
+                self._image_has_changed = False
+                self._colormap_has_changed = False
+
+        elif self._image_has_changed and self._keep_view:
+            # Same image at a better resolution (end of a progressive loading)
+            level = level_for_zoom(self.viewer.zoom, len(self.image_levels))
+            pix, scale = self._render_level(level)
+            self.viewer.replace_pixmap(pix, scale)
+            self.viewer.loupe.set_source(self.image, self.render_display)
+            perf.set_memory("image", self.image.nbytes)
+            self._image_has_changed = False
+            self._colormap_has_changed = False
+            self._keep_view = False
+
+        elif self._image_has_changed:
+            # Pyramid level for the zoom of the fitted view
+            viewport = self.viewer.viewport().size()
+            h, w = self.image.shape[:2]
+            fit_zoom = min(viewport.width() / w, viewport.height() / h)
+            level = level_for_zoom(fit_zoom, len(self.image_levels))
+
+            pix, scale = self._render_level(level)
+            self.viewer.set_image(pix, scale)
+            self.viewer.loupe.set_source(self.image, self.render_display)
+            perf.set_memory("image", self.image.nbytes)
             self._image_has_changed = False
             self._colormap_has_changed = False
 
+        elif self._colormap_has_changed:
+            level = level_for_zoom(self.viewer.zoom, len(self.image_levels))
+            pix, scale = self._render_level(level)
+            self.viewer.replace_pixmap(pix, scale)
+            self.viewer.loupe.invalidate()
+            self._colormap_has_changed = False
+
         # redraw clicks
-        self.viewer.clear_markers()
+        with perf.stage("markers"):
+            self.viewer.clear_markers()
 
-        pts = self.click_manager.extract_group()
+            pts = self.click_manager.extract_group()
+            review = self._review_flags()
 
-        if self.show_clicks:
-            for x, y in pts:
-                if x is None or y is None:
-                    continue
-                self.viewer.add_marker((x, y), self.marker_color, self.marker_size)
+            strokes = self._stroke_ids()
 
+            if self.show_clicks:
+                for i, (x, y) in enumerate(pts):
+                    if x is None or y is None:
+                        continue
+                    if strokes and strokes[i] is not None:
+                        # Drawn below as one path per stroke
+                        continue
+                    color = self.review_color if review and review[i] else self.marker_color
+                    self.viewer.add_marker((x, y), color, self.marker_size)
+
+                if strokes:
+                    for path in stroke_paths(pts, strokes).values():
+                        self.viewer.add_path(path, self.marker_color)
+
+    def _stroke_ids(self) -> Optional[list]:
+        r"""
+        Stroke of each click of the current group (None for the single clicks), or None.
+        """
+        if STROKE_COLUMN not in self.click_manager.point_data_columns():
+            return None
+        return self.click_manager.get_point_data(STROKE_COLUMN)
+
+    def _flagged_click_near(self, x: float, y: float, review: Optional[list]) -> Optional[int]:
+        r"""
+        Index of the flagged click nearest (x, y) within the marker size, or None.
+        """
+        if not review or not any(review):
+            return None
+        pts = self.click_manager.extract_group()
+        best, best_distance = None, self.marker_size
+        for i, ((px, py), flag) in enumerate(zip(pts, review)):
+            if not flag or px is None or py is None:
+                continue
+            distance = float(np.hypot(px - x, py - y))
+            if distance <= best_distance:
+                best, best_distance = i, distance
+        return best
+
+    def _review_flags(self) -> Optional[list]:
+        r"""
+        Review flags of the current group (propagated points with a low confidence), or None.
+        """
+        if REVIEW_COLUMN not in self.click_manager.point_data_columns():
+            return None
+        return self.click_manager.get_point_data(REVIEW_COLUMN)
+
+    @traced()
     def update_table(self):
         r"""
         Update table with current group points.
         """
-        pts = self.click_manager.extract_group()
+        with self.viewer.perf.stage("table"):
+            pts = self.click_manager.extract_group()
 
-        if self.click_manager.use_float_precision:
-            self.table.setHorizontalHeaderLabels(["Index", "X (float)", "Y (float)"])
-        else:
-            self.table.setHorizontalHeaderLabels(["Index", "X (int)", "Y (int)"])
+            if self.click_manager.use_float_precision:
+                self.table.setHorizontalHeaderLabels(["Index", "X (float)", "Y (float)"])
+            else:
+                self.table.setHorizontalHeaderLabels(["Index", "X (int)", "Y (int)"])
 
-        self.table.setRowCount(len(pts))
+            self.table.setRowCount(len(pts))
 
-        for i, (x, y) in enumerate(pts):
-            self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(str(i)))
-            self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(self._format_value(x)))
-            self.table.setItem(i, 2, QtWidgets.QTableWidgetItem(self._format_value(y)))
+            for i, (x, y) in enumerate(pts):
+                self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(str(i)))
+                self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(self._format_value(x)))
+                self.table.setItem(i, 2, QtWidgets.QTableWidgetItem(self._format_value(y)))
 
+    def update_stats(self):
+        r"""
+        Refresh the summary of the current group (constant time).
+        """
+        cm = self.click_manager
+        stats = cm.group_stats()
+
+        lines = [
+            f"{stats['count']} clicks ({stats['placeholders']} placeholders)"
+            f" — total {cm.n_clicks} in {len(cm.groups)} groups"
+        ]
+        if stats["centroid"] is not None:
+            cx, cy = stats["centroid"]
+            x0, y0, x1, y1 = stats["bbox"]
+            lines.append(f"Centroid ({cx:.2f}, {cy:.2f})")
+            lines.append(f"BBox [{x0:.2f}, {x1:.2f}] × [{y0:.2f}, {y1:.2f}]")
+
+        self.stats_label.setText("\n".join(lines))
+
+    @traced()
     def update_groups(self):
         r"""
-        Sync group selector.
+        Sync the selected group (the group list itself follows the click manager events).
         """
-        self.group_selector.blockSignals(True)
-        self.group_selector.clear()
-
-        for g in self.click_manager.groups:
-            self.group_selector.addItem(g)
+        if self.group_selector.currentText() == self.click_manager.current_group:
+            return
 
+        self.group_selector.blockSignals(True)
         self.group_selector.setCurrentText(self.click_manager.current_group)
         self.group_selector.blockSignals(False)
 
+    def _set_click_manager(self, click_manager: ClickManager):
+        r"""
+        Replace the click manager (the views are attached to the new one).
+        """
+        if isinstance(self.click_manager, ThreadSafeClickManager):
+            self.click_manager.set_wakeup(None)
+        self.click_manager = click_manager
+        self._watch_posts(click_manager)
+        self.group_selector.attach(click_manager)
+        self.click_manager_changed_signal.emit(click_manager)
+
+    def _watch_posts(self, click_manager: ClickManager):
+        r"""
+        Commit the mutations posted by worker threads to the displayed click manager.
+        """
+        if not isinstance(click_manager, ThreadSafeClickManager):
+            return
+        click_manager.set_wakeup(lambda: self._clicks_posted_signal.emit(click_manager))
+        if click_manager.pending:
+            self._clicks_posted_signal.emit(click_manager)
+
+    def _on_clicks_posted(self, click_manager: ThreadSafeClickManager):
+        r"""
+        Apply the posted mutations and refresh the UI once for the whole batch.
+        """
+        if click_manager is not self.click_manager or not click_manager.pending:
+            # Not displayed: committed when displayed again
+            return
+        try:
+            click_manager.commit()
+        except Exception as e:
+            self._append_log(f"Posted click rejected: {e}")
+        self._is_saved = False
+        self.update()
+
+    def collect_clicks(self) -> ClickManager:
+        r"""
+        Return the clicks of the image, or of all the frames of a sequence in one manager
+        (with a ``frame`` point data column, see :func:`merge_frames`).
+        """
+        for click_manager in self.frame_clicks.values() or [self.click_manager]:
+            if isinstance(click_manager, ThreadSafeClickManager):
+                click_manager.commit()
+        if self.frame_cache is not None:
+            return merge_frames(self.frame_clicks)
+        return self.click_manager
+
     # ============================================================
     # Image
     # ============================================================
-    def set_image(self, image: Optional[np.ndarray]):
+    @traced()
+    def set_image(
+        self, image: Optional[np.ndarray], levels: Optional[List[np.ndarray]] = None
+    ):
         r"""
         Set image to display.
+
+        Parameters
+        ----------
+        image : numpy.ndarray, optional
+            BGR or gray image. If None, a black image is displayed.
+        levels : List[numpy.ndarray], optional
+            Display pyramid of the image (see :func:`build_pyramid`), e.g. from the image cache.
+            The image and the levels are then handed over and not copied.
+            If None, the image is copied and its pyramid is built.
+
+        Raises
+        ------
+        MemoryBudgetError
+            If the copy of the image and its pyramid do not fit in the memory budget
+            (the displayed image is kept).
         """
+        copy = image is not None and levels is None and not isinstance(image, np.memmap)
+        if copy:
+            # The copy and its pyramid replace the current image and pyramid
+            nbytes = image.size * image.itemsize * (3 if image.ndim == 2 else 1) * 4 // 3
+            held = array_nbytes(self.image) + sum(array_nbytes(l) for l in self.image_levels[1:])
+            self.memory.require(nbytes - held, "image")
+
         if image is None:
             image = np.zeros((512, 512, 3), dtype=np.uint8)
             self._is_empty_image = True
         else:
             self._is_empty_image = False
 
-        image = np.array(image)
+        if copy:
+            # Cached images are memory mapped (read-only), loaded pyramids are handed over
+            image = np.array(image)
 
         if image.ndim == 2:
             image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            levels = None
 
         if image.shape[2] != 3:
             raise ValueError("Image must be BGR 3 channels")
 
         self.image = image
+        self.image_levels = [image] + list(levels[1:]) if levels else build_pyramid(image)
         self._image_has_changed = True
 
+        self._feature_index = None
+        if self.snap_to_features:
+            self._start_feature_detection()
+
+    @traced(category="ui")
     def on_load_image(self):
         r"""
         Load an image from file dialog.
@@ -715,55 +1484,320 @@ class ClickImageApp(QtWidgets.QMainWindow):
         if not file_path:
             return
 
+        if self._long_task is not None:
+            QtWidgets.QMessageBox.information(
+                self, "Busy", "Another task is running. Cancel it first."
+            )
+            return
+
         # -------------------------
-        # Load image with OpenCV
+        # Check existing clicks
         # -------------------------
-        image = cv2.imread(file_path)
-
-        if image is None:
-            QtWidgets.QMessageBox.critical(self, "Error", "Failed to load image.")
+        keep = self._confirm_keep_clicks()
+        if keep is None:
             return
 
         # -------------------------
-        # Check existing clicks
+        # Load image in the background (cached pyramid, or reduced preview then full resolution)
         # -------------------------
-        has_clicks = any(len(v) > 0 for v in self.click_manager.groups.values())
+        self.load_image_file(file_path, keep_clicks=keep)
 
-        if has_clicks:
-            msg = QtWidgets.QMessageBox(self)
-            msg.setWindowTitle("Existing clicks detected")
-            msg.setText("Do you want to keep existing clicks?")
-            msg.setInformativeText(
-                "Yes = keep clicks\nNo = delete all clicks\nCancel = abort"
-            )
+    def load_image_file(self, path: str, keep_clicks: bool = True):
+        r"""
+        Load an image file without blocking the interface.
+
+        The image is decoded in a background task (with a progress bar and a cancel button).
+        Large JPEG files are first displayed from a reduced decode: the clicks placed on the
+        preview are in full resolution coordinates, and their refinement is done once the full
+        resolution image is loaded.
+
+        The open sequence is closed (and the clicks are cleared) only once the image is loaded:
+        if the loading fails or is cancelled, the current image and its clicks are kept.
+
+        Parameters
+        ----------
+        path : str
+            Image file path.
+        keep_clicks : bool
+            Keep the existing clicks. If False, they are cleared when the image is displayed.
+            Default is True.
+        """
+        task = PreviewTask(
+            load_image_levels,
+            path,
+            cache=self.image_cache,
+            max_bytes=self.memory.allowance(),
+            parent=self,
+        )
+        task.preview_signal.connect(lambda values: self._on_image_preview(keep_clicks, *values))
+        task.finished.connect(self._end_preview)
+        self._run_long_task(
+            task, "Loading image", lambda levels: self._on_image_loaded(path, levels, keep_clicks)
+        )
 
-            msg.setStandardButtons(
-                QtWidgets.QMessageBox.Yes
-                | QtWidgets.QMessageBox.No
-                | QtWidgets.QMessageBox.Cancel
-            )
+    def _clear_clicks(self):
+        r"""
+        Replace the click manager by an empty one (same precision mode).
+        """
+        self._set_click_manager(ThreadSafeClickManager(precision_mode=self.click_manager.precision_mode))
+        self._append_log("Clicks cleared due to image reload.")
 
-            choice = msg.exec_()
+    def _on_image_preview(self, keep_clicks: bool, preview: np.ndarray, size):
+        r"""
+        Display the reduced decode of the image being loaded.
+        """
+        self._preview = (preview, size)
+        self._pending_refine = []
 
-            if choice == QtWidgets.QMessageBox.Cancel:
-                return
+        # The clicks placed on the preview belong to the new image
+        if not keep_clicks and self._replaced_clicks is None:
+            self._replaced_clicks = self.click_manager
+            self._clear_clicks()
 
-            if choice == QtWidgets.QMessageBox.No:
-                self.click_manager = ClickManager()
-                self._append_log("Clicks cleared due to image reload.")
+        # The features and the loupe of the previous image do not apply to the preview
+        if self._feature_task is not None:
+            self._feature_task.cancel()
+            self._feature_task = None
+        self._feature_index = None
+        self.viewer.loupe.set_source(None, None)
 
-        # -------------------------
-        # Apply image
-        # -------------------------
-        self.set_image(image)
+        self._image_has_changed = True
+        self._append_log(f"Preview displayed ({preview.shape[1]}x{preview.shape[0]}).")
+        self.update()
+
+    def _on_image_loaded(self, path: str, levels: List[np.ndarray], keep_clicks: bool = True):
+        r"""
+        Display the full resolution image (keeping the view of the preview).
+        """
+        self._keep_view = self._preview is not None
+        self._preview = None
+
+        # The previous image is gone: close its sequence and clear its clicks
+        replaced, self._replaced_clicks = self._replaced_clicks, None
+        self._close_sequence()
+        if not keep_clicks and replaced is None:
+            self._clear_clicks()
+        self.set_image(levels[0], levels=levels)
+        self.update_memory()
+
+        self._is_saved = False
+        self._append_log(f"Image loaded: {path}")
+
+        pending, self._pending_refine = self._pending_refine, []
+        for group, index in pending:
+            if group in self.click_manager.groups and index < len(self.click_manager.groups[group]):
+                self._refine(groups=[group], indices=[index])
+
+        self.update()
 
+    def _end_preview(self):
+        r"""
+        Go back to the current image if the loading failed or was cancelled after its preview.
+        """
+        if self._preview is None:
+            return
+        self._preview = None
+        self._pending_refine = []
+        if self._replaced_clicks is not None:
+            self._set_click_manager(self._replaced_clicks)
+            self._replaced_clicks = None
         self._image_has_changed = True
+        self.viewer.loupe.set_source(self.image, self.render_display)
+        if self.snap_to_features:
+            self._start_feature_detection()
+        self.update()
+
+    def _confirm_keep_clicks(self) -> Optional[bool]:
+        r"""
+        Ask whether to keep the existing clicks before loading a new image.
+
+        Returns
+        -------
+        Optional[bool]
+            True to keep the clicks, False to clear them, None to abort the loading.
+        """
+        managers = [self.click_manager] + self._other_frame_click_managers()
+        if all(cm.n_clicks == 0 for cm in managers):
+            return True
+
+        msg = QtWidgets.QMessageBox(self)
+        msg.setWindowTitle("Existing clicks detected")
+        msg.setText("Do you want to keep existing clicks?")
+        msg.setInformativeText("Yes = keep clicks\nNo = delete all clicks\nCancel = abort")
+
+        msg.setStandardButtons(
+            QtWidgets.QMessageBox.Yes
+            | QtWidgets.QMessageBox.No
+            | QtWidgets.QMessageBox.Cancel
+        )
+
+        choice = msg.exec_()
+
+        if choice == QtWidgets.QMessageBox.Cancel:
+            return None
+        return choice != QtWidgets.QMessageBox.No
+
+    # ============================================================
+    # Frame sequence
+    # ============================================================
+    @traced(category="ui")
+    def on_load_sequence(self):
+        r"""
+        Open a video or a multi-page TIFF and annotate it frame by frame.
+
+        The clicks of each frame are kept in their own click manager; the existing clicks
+        are kept on the first frame.
+        """
+        patterns = " ".join(f"*{ext}" for ext in VIDEO_EXTENSIONS + STACK_EXTENSIONS)
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open Sequence", "", f"Sequences ({patterns})"
+        )
+
+        if not file_path:
+            return
+
+        try:
+            self.load_sequence(file_path)
+        except (ValueError, IOError, MemoryError, cv2.error) as e:
+            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load sequence: {e}")
+
+    def load_sequence(self, path: str, keep_clicks: Optional[bool] = None):
+        r"""
+        Open a video or a multi-page TIFF and display its first frame.
+
+        Parameters
+        ----------
+        path : str
+            Path of the sequence.
+        keep_clicks : Optional[bool]
+            Keep the existing clicks on the first frame. If None, the user is asked.
+            Default is None.
+        """
+        with span("open_frame_source", "io", {"path": path}):
+            source = open_frame_source(path)
+        if len(source) == 0:
+            source.close()
+            raise ValueError("The sequence has no frame.")
+
+        if keep_clicks is None:
+            keep_clicks = self._confirm_keep_clicks()
+            if keep_clicks is None:
+                source.close()
+                return
+
+        self._close_sequence()
+        if not keep_clicks:
+            self._set_click_manager(ThreadSafeClickManager(precision_mode=self.click_manager.precision_mode))
+
+        self.frame_cache = cache = FrameCache(source)
+        self.frame_index = 0
+        self.frame_clicks = {0: self.click_manager}
+
+        for widget in (self.frame_slider, self.frame_spinbox):
+            widget.blockSignals(True)
+            widget.setRange(0, len(source) - 1)
+            widget.setValue(0)
+            widget.blockSignals(False)
+        self.frame_count_label.setText(f"/ {len(source) - 1}")
+        self.frame_bar.show()
+
+        self.memory.register(
+            "frames", lambda: cache.nbytes, evict=cache.shrink, priority=0
+        )
+        try:
+            self.set_image(cache.get(0))
+        except MemoryBudgetError:
+            self._close_sequence()
+            raise
         self._is_saved = False
+        self._append_log(f"Sequence loaded: {path} ({len(source)} frames)")
+        self.update()
 
-        self._append_log(f"Image loaded: {file_path}")
+    def _close_sequence(self):
+        r"""
+        Stop the frame decoding and go back to the single image mode (current frame clicks are kept).
+        """
+        if self.frame_cache is None:
+            return
+        if self._long_task is not None:
+            self._long_task.cancel()
+            self._long_task.wait()
+        self.memory.unregister("frames")
+        self.frame_cache.close()
+        self.frame_cache = None
+        self.frame_clicks = {}
+        self.frame_index = 0
+        self.frame_bar.hide()
+
+    def _frame_click_manager(self, index: int) -> ClickManager:
+        r"""
+        Click manager of a frame, with the groups and the settings of the current one.
+        """
+        current = self.click_manager
+        click_manager = self.frame_clicks.get(index)
+        if click_manager is None:
+            click_manager = ThreadSafeClickManager(precision_mode=current.precision_mode)
+            self.frame_clicks[index] = click_manager
+        click_manager.precision_mode = current.precision_mode
+        for group in current.groups:
+            click_manager.add_group(group)
+        click_manager.set_group(current.current_group)
+        return click_manager
+
+    def _other_frame_click_managers(self):
+        r"""
+        Click managers of the frames other than the displayed one (empty for a single image).
+        """
+        return [cm for cm in self.frame_clicks.values() if cm is not self.click_manager]
+
+    @traced(category="ui")
+    def set_frame(self, index: int):
+        r"""
+        Display a frame of the sequence with its clicks.
+
+        Parameters
+        ----------
+        index : int
+            Frame index.
+        """
+        if self.frame_cache is None or index == self.frame_index:
+            return
+        index = max(0, min(index, len(self.frame_cache) - 1))
+
+        try:
+            self.set_image(self.frame_cache.get(index))
+        except MemoryBudgetError as e:
+            self._append_log(str(e))
+            index = self.frame_index
+        else:
+            self._set_click_manager(self._frame_click_manager(index))
+            self.frame_index = index
+
+        for widget in (self.frame_slider, self.frame_spinbox):
+            widget.blockSignals(True)
+            widget.setValue(index)
+            widget.blockSignals(False)
 
         self.update()
 
+    def on_frame_changed(self, index: int):
+        r"""
+        Called when the frame slider or spin box changes.
+        """
+        self.set_frame(index)
+
+    def on_next_frame(self):
+        r"""
+        Display the next frame.
+        """
+        self.set_frame(self.frame_index + 1)
+
+    def on_previous_frame(self):
+        r"""
+        Display the previous frame.
+        """
+        self.set_frame(self.frame_index - 1)
+
     def on_colormap_changed(self, index):
         """
         Called when the user selects a different colormap.
@@ -804,7 +1838,8 @@ class ClickImageApp(QtWidgets.QMainWindow):
         self.min_value_label.setText(f"{self.display_min_pc}%")
         self.max_value_label.setText(f"{self.display_max_pc}%")
 
-        self._image_has_changed = True
+        # Display change only: the displayed level is re-rendered, the view is kept
+        self._colormap_has_changed = True
         self.update()
 
     def on_reset_contrast(self):
@@ -830,7 +1865,36 @@ class ClickImageApp(QtWidgets.QMainWindow):
         if not self.initialization_done:
             return
 
-        self.click_manager.add_click(x, y)
+        if self.snap_to_features and self._feature_index is not None:
+            shift = 0.0 if self.viewer.half_shift else 0.5
+            snapped = self._feature_index.nearest(
+                x - shift, y - shift, self.snap_radius_spin.value()
+            )
+            if snapped is not None:
+                x, y = snapped[0] + shift, snapped[1] + shift
+
+        review = self._review_flags()
+        index = self._flagged_click_near(x, y, review)
+        if index is not None:
+            # Propagated point to review: the click on its marker corrects it
+            self.click_manager.set_click(index, x, y)
+            review[index] = 0.0
+            self.click_manager.set_point_data(REVIEW_COLUMN, review)
+            confidence = self.click_manager.get_point_data(CONFIDENCE_COLUMN)
+            confidence[index] = 1.0
+            self.click_manager.set_point_data(CONFIDENCE_COLUMN, confidence)
+            self._append_log(f"Point {index} corrected: {(x, y)}")
+        else:
+            self.click_manager.add_click(x, y)
+            index = len(self.click_manager.groups[self.click_manager.current_group]) - 1
+
+        if self.refine_on_click and self._preview is not None:
+            # Refined once the full resolution image is loaded
+            self._pending_refine.append((self.click_manager.current_group, index))
+        elif self.refine_on_click:
+            self._refine(groups=[self.click_manager.current_group], indices=[index])
+            x, y = self.click_manager.groups[self.click_manager.current_group][index]
+
         self._append_log(f"Click processed: {(x, y)}")
         self._is_saved = False
         self.update()
@@ -847,6 +1911,29 @@ class ClickImageApp(QtWidgets.QMainWindow):
         self._is_saved = False
         self.update()
 
+    def _process_stroke(self, points: np.ndarray):
+        r"""
+        Store the simplified points of a freehand stroke in the current group (one batch),
+        with their stroke number in the ``stroke`` point data column.
+        """
+        if not self.initialization_done:
+            return
+
+        if len(points) == 1:
+            # Modifier click without drag: a single click
+            self._process_left_click(*points[0].tolist())
+            return
+
+        strokes = self._stroke_ids() or [None] * len(self.click_manager.extract_group())
+        stroke = max((int(s) for s in strokes if s is not None), default=-1) + 1
+
+        self.click_manager.add_clicks(points)
+        self.click_manager.set_point_data(STROKE_COLUMN, strokes + [float(stroke)] * len(points))
+
+        self._append_log(f"Stroke {stroke} processed: {len(points)} points")
+        self._is_saved = False
+        self.update()
+
     def on_undo_last_click(self):
         r"""
         Remove last click from current group.
@@ -859,10 +1946,16 @@ class ClickImageApp(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.information(self, "Undo", "No clicks to remove.")
             return
 
-        # Remove last point
-        self.click_manager.remove_click(len(pts) - 1)
-
-        self._append_log(f"Removed last click from group '{group}'")
+        strokes = self._stroke_ids()
+        if strokes and strokes[-1] is not None:
+            # Remove the whole last stroke
+            indices = [i for i, s in enumerate(strokes) if s == strokes[-1]]
+            self.click_manager.remove_clicks(indices)
+            self._append_log(f"Removed last stroke from group '{group}'")
+        else:
+            # Remove last point
+            self.click_manager.remove_click(len(pts) - 1)
+            self._append_log(f"Removed last click from group '{group}'")
 
         self._is_saved = False
         self.update()
@@ -887,12 +1980,329 @@ class ClickImageApp(QtWidgets.QMainWindow):
         self._is_saved = False
         self.update()
 
+    # ============================================================
+    # Refinement
+    # ============================================================
+    def _refine(self, groups=None, indices=None) -> int:
+        r"""
+        Refine clicks with the parameters of the refine panel.
+        """
+        if self._preview is not None:
+            # Only a reduced decode is available
+            return 0
+        return refine_click_manager(
+            self.click_manager,
+            self.image,
+            groups=groups,
+            indices=indices,
+            method=self.refine_method_selector.currentText(),
+            window=self.refine_window_spin.value(),
+            polarity=self.refine_polarity_selector.currentText(),
+            half_shift=self.viewer.half_shift,
+        )
+
+    def on_refine_on_click_changed(self, state):
+        r"""
+        Toggle the refinement of new clicks.
+        """
+        self.refine_on_click = state == QtCore.Qt.Checked
+        self._append_log(f"Refine new clicks: {self.refine_on_click}")
+
+    def on_refine_group(self):
+        r"""
+        Refine all clicks of the current group.
+        """
+        group = self.click_manager.current_group
+        n = self._refine(groups=[group])
+        self._append_log(
+            f"Refined {n} clicks of group '{group}' ({self.refine_method_selector.currentText()})"
+        )
+        self._is_saved = False
+        self.update()
+
+    def on_refine_all(self):
+        r"""
+        Refine all clicks of all groups.
+        """
+        n = self._refine()
+        self._append_log(
+            f"Refined {n} clicks in all groups ({self.refine_method_selector.currentText()})"
+        )
+        self._is_saved = False
+        self.update()
+
+    def on_reset_refinement(self):
+        r"""
+        Restore the raw clicks of the current group.
+        """
+        group = self.click_manager.current_group
+        self.click_manager.reset_refinement(group)
+        self._append_log(f"Restored raw clicks of group '{group}'")
+        self._is_saved = False
+        self.update()
+
+    # ============================================================
+    # Snap to features
+    # ============================================================
+    def _start_feature_detection(self):
+        r"""
+        Detect the features of the current image in a background thread.
+        """
+        if self._feature_task is not None:
+            self._feature_task.cancel()
+
+        kind = self.snap_kind_selector.currentText()
+        task = BackgroundTask(detect_features, self.image, kind=kind, parent=self)
+        task.progress_signal.connect(
+            lambda p: self.snap_status_label.setText(f"Detecting {kind}s... {100 * p:.0f}%")
+        )
+        task.result_signal.connect(lambda points: self._on_features_detected(task, points))
+        task.error_signal.connect(lambda e: self._append_log(f"Feature detection failed: {e}"))
+
+        def finish():
+            # Failed or cancelled: forget the task before it is deleted (a new detection can start)
+            if self._feature_task is task:
+                self._feature_task = None
+                self.snap_status_label.setText("Index: not built")
+
+        task.finished.connect(finish)
+        task.finished.connect(task.deleteLater)
+
+        self._feature_task = task
+        self.snap_status_label.setText(f"Detecting {kind}s...")
+        task.start()
+
+    def _on_features_detected(self, task: BackgroundTask, points: np.ndarray):
+        r"""
+        Build the spatial index once the detection is done.
+        """
+        if task is not self._feature_task:
+            return
+
+        self._feature_task = None
+        self._feature_index = FeatureIndex(points, cell_size=self.snap_radius_spin.value())
+        self.snap_status_label.setText(f"Index: {len(self._feature_index)} features")
+        self._append_log(f"Feature index built: {len(self._feature_index)} features")
+
+    def on_snap_changed(self, state):
+        r"""
+        Toggle the snap-to-feature mode.
+        """
+        self.snap_to_features = state == QtCore.Qt.Checked
+        self._append_log(f"Snap to features: {self.snap_to_features}")
+
+        if self.snap_to_features and self._feature_index is None and self._feature_task is None:
+            self._start_feature_detection()
+
+    def on_snap_kind_changed(self, kind: str):
+        r"""
+        Change the kind of snapped features (the index is rebuilt).
+        """
+        self._feature_index = None
+        self.snap_status_label.setText("Index: not built")
+        if self.snap_to_features:
+            self._start_feature_detection()
+
+    def on_stroke_changed(self, state):
+        r"""
+        Toggle the freehand strokes (Shift + drag).
+        """
+        enabled = state == QtCore.Qt.Checked
+        self.viewer.stroke_modifier = QtCore.Qt.ShiftModifier if enabled else None
+        self._append_log(f"Freehand strokes: {enabled}")
+
+    def on_stroke_tolerance_changed(self, value: float):
+        r"""
+        Change the simplification tolerance of the next strokes.
+        """
+        self.viewer.stroke_tolerance = value
+
+    # ============================================================
+    # Long tasks
+    # ============================================================
+    def _run_long_task(self, task: BackgroundTask, label: str, on_result):
+        r"""
+        Start a cancellable task with a progress bar in the status bar.
+
+        Only one long task runs at a time.
+        """
+        if self._long_task is not None:
+            QtWidgets.QMessageBox.information(
+                self, "Busy", "Another task is running. Cancel it first."
+            )
+            return
+
+        def finish():
+            self._long_task = None
+            self.progress_label.hide()
+            self.progress_bar.hide()
+            self.cancel_task_btn.hide()
+
+        task.progress_signal.connect(lambda p: self.progress_bar.setValue(int(100 * p)))
+        task.result_signal.connect(on_result)
+        task.error_signal.connect(
+            lambda e: QtWidgets.QMessageBox.critical(self, "Error", f"{label} failed: {e}")
+        )
+        task.cancelled_signal.connect(lambda: self._append_log(f"{label} cancelled."))
+        task.finished.connect(finish)
+        task.finished.connect(task.deleteLater)
+
+        self._long_task = task
+        self.progress_label.setText(label)
+        self.progress_bar.setValue(0)
+        self.progress_label.show()
+        self.progress_bar.show()
+        self.cancel_task_btn.show()
+        task.start()
+
+    def on_cancel_task(self):
+        r"""
+        Cancel the running long task.
+        """
+        if self._long_task is not None:
+            self._long_task.cancel()
+
+    # ============================================================
+    # Propagation (frame sequences)
+    # ============================================================
+    def on_propagate(self):
+        r"""
+        Track the clicks of all the groups of the current frame into the next frames.
+
+        The tracking runs in a background task; the points are stored in the frames where
+        their group has no click yet, and the low-confidence points are flagged for review.
+        """
+        if self.frame_cache is None:
+            QtWidgets.QMessageBox.information(
+                self, "Propagation", "Load a video or an image stack first."
+            )
+            return
+
+        n_frames = min(
+            self.propagate_frames_spin.value(), len(self.frame_cache) - 1 - self.frame_index
+        )
+        shift = 0.0 if self.viewer.half_shift else 0.5
+
+        group_points = []
+        points = []
+        for group, pts in self.click_manager.groups.items():
+            if not any(x is not None and y is not None for x, y in pts):
+                continue
+            group_points.append((group, len(pts)))
+            points.extend(
+                (np.nan, np.nan) if x is None or y is None else (x - shift, y - shift)
+                for x, y in pts
+            )
+
+        if not points or n_frames <= 0:
+            QtWidgets.QMessageBox.information(
+                self, "Propagation", "Nothing to propagate (no clicks or last frame)."
+            )
+            return
+
+        cache = self.frame_cache
+        task = BackgroundTask(
+            propagate_points,
+            cache.get,
+            self.frame_index,
+            np.array(points, dtype=np.float64),
+            n_frames,
+            win_size=self.propagate_window_spin.value() | 1,
+            parent=self,
+        )
+        self._run_long_task(
+            task,
+            "Propagation",
+            lambda results: self._on_propagated(cache, group_points, shift, results),
+        )
+
+    def _on_propagated(self, cache: FrameCache, group_points, shift: float, results):
+        r"""
+        Store the tracked points in the click managers of their frames.
+        """
+        if self.frame_cache is not cache:
+            # The sequence was closed or replaced during the tracking
+            return
+
+        targets = [(index, self._frame_click_manager(index)) for index, _, _ in results]
+        stored, flagged = store_propagation(
+            targets,
+            group_points,
+            results,
+            shift=shift,
+            min_confidence=self.propagate_confidence_spin.value(),
+        )
+
+        self._append_log(
+            f"Propagated {stored} points into {len(results)} frames ({flagged} flagged for review)."
+        )
+        self._is_saved = False
+        self.update()
+
+    # ============================================================
+    # Template matching
+    # ============================================================
+    def on_match_template(self):
+        r"""
+        Find all the targets similar to the last click of the current group.
+
+        The matches are stored in a new group for review, with their correlation
+        in the ``score`` point data column.
+        """
+        source = self.click_manager.current_group
+        pts = [p for p in self.click_manager.groups[source] if p[0] is not None]
+
+        if not pts:
+            QtWidgets.QMessageBox.information(
+                self, "Template matching", "Click an example target first."
+            )
+            return
+
+        shift = 0.0 if self.viewer.half_shift else 0.5
+        x, y = pts[-1]
+
+        task = BackgroundTask(
+            find_template_matches,
+            self.image,
+            (x - shift, y - shift),
+            half_size=self.match_size_spin.value(),
+            threshold=self.match_threshold_spin.value(),
+            parent=self,
+        )
+        self._run_long_task(
+            task,
+            "Template matching",
+            lambda result: self._on_template_matches(source, shift, result),
+        )
+
+    def _on_template_matches(self, source: str, shift: float, result):
+        r"""
+        Store the template matches in a new group.
+        """
+        points, scores = result
+
+        name = f"{source}_matches"
+        i = 1
+        while name in self.click_manager.groups:
+            i += 1
+            name = f"{source}_matches_{i}"
+
+        self.click_manager.add_clicks(points + shift, name)
+        self.click_manager.set_point_data("score", scores.tolist(), name)
+        self.click_manager.set_group(name)
+
+        self._append_log(f"Template matching: {len(points)} matches stored in group '{name}'")
+        self._is_saved = False
+        self.update()
+
     def on_precision_changed(self, state):
         r"""
         Toggle integer/float precision mode.
         """
         INT = state == QtCore.Qt.Checked
         self.click_manager.precision_mode = "int" if INT else "float"
+        for click_manager in self._other_frame_click_managers():
+            click_manager.precision_mode = "int" if INT else "float"
         self._append_log(f"Precision mode: {'INT' if INT else 'FLOAT'}")
         self.update()
 
@@ -903,7 +2313,9 @@ class ClickImageApp(QtWidgets.QMainWindow):
 
         half_shift = state == QtCore.Qt.Checked
 
-        if self.click_manager.n_clicks > 0:
+        managers = [self.click_manager] + self._other_frame_click_managers()
+
+        if any(cm.n_clicks > 0 for cm in managers):
 
             msg = QtWidgets.QMessageBox(self)
             msg.setWindowTitle("Existing clicks detected")
@@ -917,10 +2329,11 @@ class ClickImageApp(QtWidgets.QMainWindow):
             choice = msg.exec_()
 
             if choice == QtWidgets.QMessageBox.Yes:
-                if half_shift:
-                    self.click_manager.to_half_shift_on()
-                else:
-                    self.click_manager.to_half_shift_off()
+                for cm in managers:
+                    if half_shift:
+                        cm.to_half_shift_on()
+                    else:
+                        cm.to_half_shift_off()
 
         self.viewer.half_shift = half_shift
         self._append_log(f"Half-Shift mode: {half_shift}")
@@ -934,6 +2347,13 @@ class ClickImageApp(QtWidgets.QMainWindow):
         self._append_log(f"Display clicks: {self.show_clicks}")
         self.update()
 
+    def on_perf_hud_toggled(self, checked: bool):
+        r"""
+        Toggle the performance HUD.
+        """
+        self.viewer.set_perf_hud_enabled(checked)
+        self._append_log(f"Performance HUD: {checked}")
+
     # ============================================================
     # Design
     # ============================================================
@@ -950,6 +2370,28 @@ class ClickImageApp(QtWidgets.QMainWindow):
 
             self._append_log(f"Crosshair color set to: {color.name()}")
 
+    def on_loupe_changed(self, state):
+        r"""
+        Toggle the magnifier loupe.
+        """
+        self.viewer.loupe.enabled = state == QtCore.Qt.Checked
+        self.viewer._schedule_crosshair()
+        self._append_log(f"Loupe: {self.viewer.loupe.enabled}")
+
+    def on_loupe_zoom_changed(self, zoom: str):
+        r"""
+        Change the enlargement factor of the loupe.
+        """
+        self.viewer.loupe.zoom = int(zoom)
+        self.viewer._schedule_crosshair()
+
+    def on_loupe_size_changed(self, size: str):
+        r"""
+        Change the size of the loupe.
+        """
+        self.viewer.loupe.loupe_size = int(size)
+        self.viewer._schedule_crosshair()
+
     def choose_color(self):
         color = QtWidgets.QColorDialog.getColor(self.marker_color, self)
 
@@ -1026,6 +2468,9 @@ class ClickImageApp(QtWidgets.QMainWindow):
             return
 
         self.click_manager.rename_group(old_name, new_name)
+        for click_manager in self._other_frame_click_managers():
+            if old_name in click_manager.groups:
+                click_manager.rename_group(old_name, new_name)
 
         self._append_log(f"Renamed group {old_name} → {new_name}")
         self._is_saved = False
@@ -1055,6 +2500,9 @@ class ClickImageApp(QtWidgets.QMainWindow):
             return
 
         self.click_manager.remove_group(current)
+        for click_manager in self._other_frame_click_managers():
+            if current in click_manager.groups and len(click_manager.groups) > 1:
+                click_manager.remove_group(current)
 
         self._append_log(f"Deleted group: {current}")
         self._is_saved = False
@@ -1089,7 +2537,8 @@ class ClickImageApp(QtWidgets.QMainWindow):
             # -------------------------------------------------
             # Save
             # -------------------------------------------------
-            self.click_manager.save_to_csv(self.output_path)
+            # One CSV for a sequence: the frame of each click is a point data column
+            self.collect_clicks().save_to_csv(self.output_path)
 
             self._append_log(f"Saved to {self.output_path}")
             self._is_saved = True
@@ -1133,7 +2582,27 @@ class ClickImageApp(QtWidgets.QMainWindow):
             # -------------------------
             # Load ClickManager
             # -------------------------
-            self.click_manager = ClickManager.load_from_csv(file_path)
+            click_manager = ThreadSafeClickManager.load_from_csv(file_path)
+
+            if self.frame_cache is not None:
+                # Clicks of a sequence: dispatch them on their frames
+                has_frames = any(
+                    FRAME_COLUMN in click_manager.point_data_columns(group)
+                    for group in click_manager.groups
+                )
+                frames = split_frames(click_manager) if has_frames else {0: click_manager}
+
+                current = frames.get(self.frame_index)
+                if current is None:
+                    current = ThreadSafeClickManager(precision_mode=click_manager.precision_mode)
+                    for group in click_manager.groups:
+                        current.add_group(group)
+                    frames[self.frame_index] = current
+
+                self.frame_clicks = frames
+                click_manager = current
+
+            self._set_click_manager(click_manager)
 
             self._append_log(f"Clicks loaded from {file_path}")
 
@@ -1151,15 +2620,15 @@ class ClickImageApp(QtWidgets.QMainWindow):
     # ============================================================
     def _append_log(self, msg: str):
         r"""
-        Append log message.
+        Append log message (batched, displayed at the next event-loop iteration).
         """
-        self.log_text_edit.append(msg)
+        self.log_panel.log(msg)
 
     def clear_logs(self):
         r"""
         Clear log message.
         """
-        self.log_text_edit.clear()
+        self.log_panel.clear()
 
     # ============================================================
     # Close event
@@ -1167,9 +2636,9 @@ class ClickImageApp(QtWidgets.QMainWindow):
 
     def closeEvent(self, event):
         r"""
-        Confirm exit if unsaved.
+        Confirm exit if unsaved (unless ``confirm_exit`` is False).
         """
-        if not self._is_saved:
+        if self.confirm_exit and not self._is_saved:
             res = QtWidgets.QMessageBox.question(
                 self,
                 "Exit",
@@ -1180,4 +2649,12 @@ class ClickImageApp(QtWidgets.QMainWindow):
                 event.ignore()
                 return
 
+        for task in (self._feature_task, self._long_task):
+            if task is not None:
+                task.cancel()
+                task.wait()
+
+        self.closed_signal.emit(self.collect_clicks())
+        self._close_sequence()
+        self.log_panel.close_log_file()
         event.accept()
@@ -18,10 +18,185 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import csv
 from collections import defaultdict
-from typing import Tuple, List, Optional, Union, Dict, Literal
+from typing import Callable, Tuple, List, Optional, Union, Dict, Literal
+
+import numpy as np
+
+from .tracing import traced
+from .transforms import CoordinateTransform
 
 Number = Union[int, float]
 Point = Tuple[Optional[Number], Optional[Number]]
+Listener = Callable[[dict], None]
+
+
+class _GroupStats:
+    r"""
+    Aggregates of one group, maintained incrementally by :class:`ClickManager`.
+
+    Counts and coordinate sums are exact under additions and removals. The bounding box
+    is extended on additions and only marked stale when a removed point lies on it;
+    it is then recomputed from the group on the next query.
+    """
+
+    __slots__ = ["count", "placeholders", "sum_x", "sum_y", "bbox", "bbox_valid"]
+
+    def __init__(self, points: List[Point] = ()) -> None:
+        self.count = 0
+        self.placeholders = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.bbox: Optional[List[float]] = None
+        self.bbox_valid = True
+        for x, y in points:
+            self.add(x, y)
+
+    def add(self, x: Optional[float], y: Optional[float]) -> None:
+        self.count += 1
+        if x is None or y is None:
+            self.placeholders += 1
+            return
+        self.sum_x += x
+        self.sum_y += y
+        if not self.bbox_valid:
+            return
+        if self.bbox is None:
+            self.bbox = [x, y, x, y]
+        else:
+            bbox = self.bbox
+            bbox[0] = min(bbox[0], x)
+            bbox[1] = min(bbox[1], y)
+            bbox[2] = max(bbox[2], x)
+            bbox[3] = max(bbox[3], y)
+
+    def remove(self, x: Optional[float], y: Optional[float]) -> None:
+        self.count -= 1
+        if x is None or y is None:
+            self.placeholders -= 1
+            return
+        self.sum_x -= x
+        self.sum_y -= y
+        if self.count == self.placeholders:
+            self.sum_x = self.sum_y = 0.0
+            self.bbox = None
+            self.bbox_valid = True
+        elif self.bbox is not None and (
+            x in (self.bbox[0], self.bbox[2]) or y in (self.bbox[1], self.bbox[3])
+        ):
+            self.bbox_valid = False
+
+    def add_many(self, points: np.ndarray) -> None:
+        r"""
+        Vectorized :meth:`add` of points with shape (N, 2) (NaN rows are placeholders).
+        """
+        valid = points[~np.isnan(points[:, 0])]
+        self.count += len(points)
+        self.placeholders += len(points) - len(valid)
+        if not len(valid):
+            return
+        self.sum_x += float(valid[:, 0].sum())
+        self.sum_y += float(valid[:, 1].sum())
+        if not self.bbox_valid:
+            return
+        x0, y0 = valid.min(axis=0).tolist()
+        x1, y1 = valid.max(axis=0).tolist()
+        if self.bbox is None:
+            self.bbox = [x0, y0, x1, y1]
+        else:
+            bbox = self.bbox
+            self.bbox = [min(bbox[0], x0), min(bbox[1], y0), max(bbox[2], x1), max(bbox[3], y1)]
+
+    def remove_many(self, points: np.ndarray) -> None:
+        r"""
+        Vectorized :meth:`remove` of points with shape (N, 2) (NaN rows are placeholders).
+        """
+        valid = points[~np.isnan(points[:, 0])]
+        self.count -= len(points)
+        self.placeholders -= len(points) - len(valid)
+        if not len(valid):
+            return
+        self.sum_x -= float(valid[:, 0].sum())
+        self.sum_y -= float(valid[:, 1].sum())
+        if self.count == self.placeholders:
+            self.sum_x = self.sum_y = 0.0
+            self.bbox = None
+            self.bbox_valid = True
+        elif self.bbox is not None and (
+            np.isin(valid[:, 0], (self.bbox[0], self.bbox[2])).any()
+            or np.isin(valid[:, 1], (self.bbox[1], self.bbox[3])).any()
+        ):
+            self.bbox_valid = False
+
+    def shift(self, offset: float) -> None:
+        n_valid = self.count - self.placeholders
+        self.sum_x += n_valid * offset
+        self.sum_y += n_valid * offset
+        if self.bbox is not None:
+            self.bbox = [v + offset for v in self.bbox]
+
+
+def _as_points(points) -> np.ndarray:
+    r"""
+    Validate points as a float array with shape (N, 2), NaN rows for the placeholders
+    (a row with a single NaN coordinate becomes a placeholder).
+
+    Raises
+    ------
+    ValueError
+        If the shape is not (N, 2) or a coordinate is infinite.
+    """
+    array = np.array(points, dtype=np.float64)
+    if array.size == 0:
+        return array.reshape(0, 2)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"Expected points with shape (N, 2), got {array.shape}.")
+    if np.isinf(array).any():
+        raise ValueError("Click coordinates must be finite (NaN for a placeholder).")
+    array[np.isnan(array).any(axis=1)] = np.nan
+    return array
+
+
+def _as_indices(indices, n: int) -> np.ndarray:
+    r"""
+    Validate click indices (negative indices count from the end) and return them in [0, n).
+
+    Raises
+    ------
+    ValueError
+        If the indices are not integers.
+    IndexError
+        If an index is out of range.
+    """
+    array = np.asarray(indices).reshape(-1)
+    if array.size == 0:
+        return array.astype(np.int64)
+    if not np.issubdtype(array.dtype, np.integer):
+        raise ValueError("Click indices must be integers.")
+    array = array.astype(np.int64)
+    out = (array < -n) | (array >= n)
+    if out.any():
+        raise IndexError(f"Click index {array[out][0]} out of range for {n} clicks.")
+    return array % n
+
+
+def _point_list(points: np.ndarray) -> List[Point]:
+    r"""
+    Stored points of a validated array (see :func:`_as_points`).
+    """
+    result = list(zip(points[:, 0].tolist(), points[:, 1].tolist()))
+    for i in np.flatnonzero(np.isnan(points[:, 0])).tolist():
+        result[i] = (None, None)
+    return result
+
+
+def _point_array(points: List[Point]) -> np.ndarray:
+    r"""
+    Float array with shape (N, 2) of stored points, NaN for the placeholders.
+    """
+    return np.array(
+        [(np.nan, np.nan) if x is None or y is None else (x, y) for x, y in points],
+        dtype=np.float64,
+    ).reshape(-1, 2)
 
 
 class ClickManager:
@@ -31,9 +206,44 @@ class ClickManager:
     This class stores 2D coordinates of points clicked on an image, grouped by string identifiers.
     It supports both float (subpixel) and integer precision modes.
     Points are all the time saved as float but the precision mode apply on output.
+
+    Optional per-point data columns (e.g. the raw coordinates of refined clicks) can be attached
+    to a group with :meth:`set_point_data`. They are kept aligned with the clicks of the group
+    and saved as extra CSV columns.
+
+    Per-group aggregates (counts, placeholders, centroid, bounding box) are maintained on every
+    mutation: :meth:`group_stats` reads them in constant time, :attr:`n_clicks` in O(number of groups).
+    The edits of the ``groups`` dictionary that bypass the methods are only detected when they
+    change the length of a group: a same-length edit (e.g. ``groups[g][i] = (x, y)``) leaves
+    the centroid and the bounding box stale (use :meth:`set_click` or :meth:`move_clicks`).
+
+    Many clicks are changed at once with the batched methods (:meth:`add_clicks`,
+    :meth:`remove_clicks`, :meth:`move_clicks` and :meth:`replace_group`): they take NumPy
+    arrays, validate them in vectorized form and send one event per batch.
+
+    Listeners registered with :meth:`add_listener` are notified of the mutations
+    (groups, clicks and point data) with an event dictionary, so views can be updated
+    incrementally instead of being rebuilt. A copy of the manager (e.g. in another process)
+    is kept up to date with :meth:`to_snapshot`, :meth:`from_snapshot` and :meth:`apply_event`.
+
+    Named coordinate transforms (see :mod:`pyclickimage.transforms`) can be attached with
+    :meth:`add_transform`: the stored pixel coordinates are never modified, the calibrated
+    coordinates are computed per group with one vectorized call (:meth:`transform_group`)
+    and exported as extra ``<name>_x`` and ``<name>_y`` CSV columns.
     """
 
-    __slots__ = ["groups", "current_group", "_precision_mode"]
+    __slots__ = [
+        "groups",
+        "current_group",
+        "point_data",
+        "_precision_mode",
+        "_listeners",
+        "_stats",
+        "_n_clicks",
+        "_transforms",
+    ]
+
+    COORDINATE_COLUMNS = ("raw_x", "raw_y")
 
     def __init__(self, precision_mode: Literal["float", "int"] = "float") -> None:
         r"""
@@ -47,6 +257,11 @@ class ClickManager:
         """
         self.groups: Dict[str, List[Point]] = defaultdict(list)
         self.current_group: str = "default"
+        self.point_data: Dict[str, Dict[str, List[Optional[float]]]] = {}
+        self._listeners: List[Listener] = []
+        self._stats: Dict[str, _GroupStats] = {}
+        self._n_clicks = 0
+        self._transforms: Dict[str, CoordinateTransform] = {}
 
         self._precision_mode: Literal["float", "int"] = "float"
         self.precision_mode = precision_mode
@@ -85,7 +300,10 @@ class ClickManager:
         """
         if mode not in ("float", "int"):
             raise ValueError("precision_mode must be 'float' or 'int'")
+        if mode == self._precision_mode:
+            return
         self._precision_mode = mode
+        self._notify("precision_mode", mode=mode)
 
     @property
     def use_int_precision(self) -> bool:
@@ -99,7 +317,7 @@ class ClickManager:
         r"""
         Set precision mode using boolean.
         """
-        self._precision_mode = "int" if value else "float"
+        self.precision_mode = "int" if value else "float"
 
     @property
     def use_float_precision(self) -> bool:
@@ -113,7 +331,7 @@ class ClickManager:
         r"""
         Set float precision mode using boolean.
         """
-        self._precision_mode = "float" if value else "int"
+        self.precision_mode = "float" if value else "int"
 
     def _convert(self, value: Optional[Number]) -> Optional[Number]:
         r"""
@@ -135,6 +353,175 @@ class ClickManager:
             return int(round(value))
         return float(value)
 
+    # =========================================================
+    # LISTENERS
+    # =========================================================
+
+    def add_listener(self, listener: Listener) -> None:
+        r"""
+        Register a callback notified of the mutations.
+
+        The callback receives an event dictionary with a ``"type"`` key:
+
+        - ``{"type": "group_added", "group": name}``
+        - ``{"type": "group_removed", "group": name}``
+        - ``{"type": "group_renamed", "old": old_name, "new": new_name}``
+        - ``{"type": "current_group", "group": name}``
+        - ``{"type": "click_added", "group": name, "index": i, "x": x, "y": y}``
+        - ``{"type": "click_removed", "group": name, "index": i}``
+        - ``{"type": "clicks_added", "group": name, "start": i, "points": [[x, y], ...]}``
+        - ``{"type": "clicks_removed", "group": name, "indices": [i, ...]}`` (sorted)
+        - ``{"type": "clicks_moved", "group": name, "indices": [i, ...], "points": [[x, y], ...]}``
+        - ``{"type": "group_cleared", "group": name}``
+        - ``{"type": "group_replaced", "group": name, "points": [[x, y], ...]}``
+        - ``{"type": "shifted", "offset": offset}`` (half-shift conversion of all the groups)
+        - ``{"type": "point_data_set", "group": name, "column": column, "values": [...]}``
+        - ``{"type": "point_data_removed", "group": name, "column": column}``
+        - ``{"type": "precision_mode", "mode": mode}``
+
+        The events only contain built-in types, and the stored (unconverted) coordinates
+        (None for the placeholders). A batched method sends a single event.
+
+        Parameters
+        ----------
+        listener : Callable[[dict], None]
+            The callback.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        r"""
+        Unregister a callback added with :meth:`add_listener`.
+
+        Parameters
+        ----------
+        listener : Callable[[dict], None]
+            The callback.
+        """
+        self._listeners.remove(listener)
+
+    def _notify(self, event_type: str, **payload) -> None:
+        r"""
+        Send an event to the listeners.
+        """
+        if not self._listeners:
+            return
+        event = {"type": event_type}
+        event.update(payload)
+        for listener in list(self._listeners):
+            listener(event)
+
+    def apply_event(self, event: dict) -> None:
+        r"""
+        Apply a mutation event of another manager (see :meth:`add_listener`) to this one.
+
+        Applying the events of a manager, in order, to a copy made with :meth:`from_snapshot`
+        keeps the copy identical to it.
+
+        Parameters
+        ----------
+        event : dict
+            The event.
+
+        Raises
+        ------
+        ValueError
+            If the event type is unknown.
+        """
+        kind = event["type"]
+        group = event.get("group")
+        if kind == "group_added":
+            self.add_group(group)
+        elif kind == "group_removed":
+            self.remove_group(group)
+        elif kind == "group_renamed":
+            self.rename_group(event["old"], event["new"])
+        elif kind == "current_group":
+            self.set_group(group)
+        elif kind == "click_added":
+            self.add_click(event["x"], event["y"], group)
+        elif kind == "click_removed":
+            self.remove_click(event["index"], group)
+        elif kind == "clicks_added":
+            self.add_clicks(event["points"], group)
+        elif kind == "clicks_removed":
+            self.remove_clicks(event["indices"], group)
+        elif kind == "clicks_moved":
+            self.move_clicks(event["indices"], event["points"], group)
+        elif kind == "group_cleared":
+            self.clear_group(group)
+        elif kind == "group_replaced":
+            self.replace_group(event["points"], group)
+        elif kind == "shifted":
+            if event["offset"] < 0:
+                self.to_half_shift_on()
+            else:
+                self.to_half_shift_off()
+        elif kind == "point_data_set":
+            self.set_point_data(event["column"], event["values"], group)
+        elif kind == "point_data_removed":
+            self.remove_point_data(event["column"], group)
+        elif kind == "precision_mode":
+            self.precision_mode = event["mode"]
+        else:
+            raise ValueError(f"Unknown event type '{kind}'.")
+
+    # =========================================================
+    # SNAPSHOTS
+    # =========================================================
+
+    def to_snapshot(self) -> dict:
+        r"""
+        Return the clicks, point data and settings as built-in types (picklable, JSON-serializable).
+
+        The coordinates are stored values (not converted with the precision mode).
+        The attached transforms and listeners are not part of the snapshot.
+
+        Returns
+        -------
+        dict
+            ``{"precision_mode", "current_group", "groups": {group: [[x, y], ...]},
+            "point_data": {group: {column: [...]}}}``.
+        """
+        return {
+            "precision_mode": self._precision_mode,
+            "current_group": self.current_group,
+            "groups": {group: [list(p) for p in points] for group, points in self.groups.items()},
+            "point_data": {
+                group: {column: list(values) for column, values in columns.items()}
+                for group, columns in self.point_data.items()
+            },
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "ClickManager":
+        r"""
+        Build a manager from :meth:`to_snapshot`.
+
+        Parameters
+        ----------
+        snapshot : dict
+            The snapshot.
+
+        Returns
+        -------
+        ClickManager
+            New instance.
+        """
+        instance = cls(precision_mode=snapshot.get("precision_mode", "float"))
+        groups = snapshot.get("groups", {})
+        if groups:
+            instance.groups.clear()
+        for group, points in groups.items():
+            instance.groups[group] = [(p[0], p[1]) for p in points]
+        instance._rebuild_stats()
+        for group, columns in snapshot.get("point_data", {}).items():
+            for column, values in columns.items():
+                instance.set_point_data(column, values, group)
+        current = snapshot.get("current_group")
+        instance.current_group = current if current in instance.groups else next(iter(instance.groups))
+        return instance
+
     # =========================================================
     # GROUPS
     # =========================================================
@@ -150,7 +537,10 @@ class ClickManager:
         """
         if not isinstance(group_name, str):
             raise ValueError("Group name must be a string.")
-        self.groups.setdefault(group_name, [])
+        if group_name not in self.groups:
+            self.groups[group_name] = []
+            self._stats[group_name] = _GroupStats()
+            self._notify("group_added", group=group_name)
 
     def set_group(self, group_name: str) -> None:
         r"""
@@ -162,7 +552,9 @@ class ClickManager:
             Name of the group to activate.
         """
         self.add_group(group_name)
-        self.current_group = group_name
+        if self.current_group != group_name:
+            self.current_group = group_name
+            self._notify("current_group", group=group_name)
 
     def remove_group(self, group_name: Optional[str] = None) -> None:
         r"""
@@ -179,10 +571,15 @@ class ClickManager:
         if group_name not in self.groups:
             raise KeyError(f"Group '{group_name}' does not exist.")
 
+        self._n_clicks -= self._group_stats(group_name).count
+        del self._stats[group_name]
         del self.groups[group_name]
+        self.point_data.pop(group_name, None)
+        self._notify("group_removed", group=group_name)
 
         if self.current_group == group_name:
             self.current_group = next(iter(self.groups), "default")
+            self._notify("current_group", group=self.current_group)
 
     def rename_group(self, old_name: str, new_name: str) -> None:
         r"""
@@ -205,10 +602,16 @@ class ClickManager:
         if new_name in self.groups:
             raise KeyError(f"Group '{new_name}' already exists.")
 
+        self._group_stats(old_name)
+        self._stats[new_name] = self._stats.pop(old_name)
         self.groups[new_name] = self.groups.pop(old_name)
+        if old_name in self.point_data:
+            self.point_data[new_name] = self.point_data.pop(old_name)
+        self._notify("group_renamed", old=old_name, new=new_name)
 
         if self.current_group == old_name:
             self.current_group = new_name
+            self._notify("current_group", group=new_name)
 
     # =========================================================
     # CLICKS
@@ -216,9 +619,16 @@ class ClickManager:
     @property
     def n_clicks(self) -> int:
         r"""
-        Return the number of clicks
+        Return the number of clicks, in O(number of groups).
+
+        The group lengths are summed, so the groups edited directly (``groups`` dictionary)
+        are counted; when the sum or the set of groups differs from the maintained count,
+        the aggregates are rebuilt.
         """
-        return sum(len(g) for _, g in self.groups.items())
+        n = sum(len(points) for points in self.groups.values())
+        if n != self._n_clicks or self._stats.keys() != self.groups.keys():
+            self._rebuild_stats()
+        return n
 
     def add_click(
         self, x: Optional[Number], y: Optional[Number], group_name: Optional[str] = None
@@ -243,7 +653,15 @@ class ClickManager:
         x = float(x) if x is not None else None
         y = float(y) if y is not None else None
 
-        self.groups[group_name].append((x, y))
+        stats = self._group_stats(group_name)
+        points = self.groups[group_name]
+        points.append((x, y))
+        stats.add(x, y)
+        self._n_clicks += 1
+
+        for values in self.point_data.get(group_name, {}).values():
+            values.append(None)
+        self._notify("click_added", group=group_name, index=len(points) - 1, x=x, y=y)
 
     def to_half_shift_on(self):
         r"""
@@ -259,6 +677,10 @@ class ClickManager:
                 )
                 for (x, y) in points
             ]
+        for stats in self._stats.values():
+            stats.shift(-0.5)
+        self._shift_coordinate_columns(-0.5)
+        self._notify("shifted", offset=-0.5)
 
     def to_half_shift_off(self):
         r"""
@@ -274,6 +696,21 @@ class ClickManager:
                 )
                 for (x, y) in points
             ]
+        for stats in self._stats.values():
+            stats.shift(+0.5)
+        self._shift_coordinate_columns(+0.5)
+        self._notify("shifted", offset=+0.5)
+
+    def _shift_coordinate_columns(self, offset: float) -> None:
+        r"""
+        Shift the point data columns storing coordinates (see ``COORDINATE_COLUMNS``).
+        """
+        for columns in self.point_data.values():
+            for name in self.COORDINATE_COLUMNS:
+                if name in columns:
+                    columns[name] = [
+                        (v + offset) if v is not None else None for v in columns[name]
+                    ]
 
     def extract_group(self, group_name: Optional[str] = None) -> List[Point]:
         r"""
@@ -320,6 +757,40 @@ class ClickManager:
         x, y = self.groups[group_name][index]
         return self._convert(x), self._convert(y)
 
+    def set_click(
+        self,
+        index: int,
+        x: Optional[Number],
+        y: Optional[Number],
+        group_name: Optional[str] = None,
+    ) -> None:
+        r"""
+        Move a click (its index and point data are kept).
+
+        Parameters
+        ----------
+        index : int
+            Index of the click.
+        x : Optional[Number]
+            New X coordinate of the click.
+        y : Optional[Number]
+            New Y coordinate of the click.
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+        """
+        group_name = group_name or self.current_group
+
+        x = float(x) if x is not None else None
+        y = float(y) if y is not None else None
+
+        stats = self._group_stats(group_name)
+        points = self.groups[group_name]
+        stats.remove(*points[index])
+        points[index] = (x, y)
+        stats.add(x, y)
+        self._notify("clicks_moved", group=group_name, indices=[index % len(points)], points=[[x, y]])
+
     def remove_click(self, index: int, group_name: Optional[str] = None) -> None:
         r"""
         Remove a click by index.
@@ -333,7 +804,16 @@ class ClickManager:
             Default is None.
         """
         group_name = group_name or self.current_group
-        del self.groups[group_name][index]
+        stats = self._group_stats(group_name)
+        points = self.groups[group_name]
+        index = index % len(points) if points else index
+        x, y = points.pop(index)
+        stats.remove(x, y)
+        self._n_clicks -= 1
+
+        for values in self.point_data.get(group_name, {}).values():
+            del values[index]
+        self._notify("click_removed", group=group_name, index=index)
 
     def clear_group(self, group_name: Optional[str] = None) -> None:
         r"""
@@ -346,7 +826,611 @@ class ClickManager:
             Default is None.
         """
         group_name = group_name or self.current_group
+        self._n_clicks -= self._group_stats(group_name).count
         self.groups[group_name].clear()
+        self._stats[group_name] = _GroupStats()
+
+        for values in self.point_data.get(group_name, {}).values():
+            values.clear()
+        self._notify("group_cleared", group=group_name)
+
+    # =========================================================
+    # BATCHED CLICKS
+    # =========================================================
+
+    def add_clicks(self, points: np.ndarray, group_name: Optional[str] = None) -> None:
+        r"""
+        Append clicks to a group (one ``clicks_added`` event).
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Points with shape (N, 2), NaN for the placeholders.
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Raises
+        ------
+        ValueError
+            If the shape is not (N, 2) or a coordinate is infinite.
+        """
+        group_name = group_name or self.current_group
+        array = _as_points(points)
+        self.add_group(group_name)
+
+        stats = self._group_stats(group_name)
+        clicks = self.groups[group_name]
+        start = len(clicks)
+        new = _point_list(array)
+        clicks.extend(new)
+        stats.add_many(array)
+        self._n_clicks += len(new)
+
+        for values in self.point_data.get(group_name, {}).values():
+            values.extend([None] * len(new))
+        if new and self._listeners:
+            self._notify("clicks_added", group=group_name, start=start, points=[list(p) for p in new])
+
+    def remove_clicks(self, indices: np.ndarray, group_name: Optional[str] = None) -> None:
+        r"""
+        Remove clicks by index (one ``clicks_removed`` event). The other clicks keep their order.
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+            Indices of the clicks (negative indices count from the end, duplicates are ignored).
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Raises
+        ------
+        IndexError
+            If an index is out of range.
+        """
+        group_name = group_name or self.current_group
+
+        if group_name not in self.groups:
+            raise KeyError(f"Group '{group_name}' does not exist.")
+
+        clicks = self.groups[group_name]
+        removed = np.unique(_as_indices(indices, len(clicks)))
+        if not removed.size:
+            return
+
+        stats = self._group_stats(group_name)
+        removed_list = removed.tolist()
+        stats.remove_many(_point_array([clicks[i] for i in removed_list]))
+        keep = np.ones(len(clicks), dtype=bool)
+        keep[removed] = False
+        kept = np.flatnonzero(keep).tolist()
+        clicks[:] = [clicks[i] for i in kept]
+        self._n_clicks -= len(removed_list)
+
+        for values in self.point_data.get(group_name, {}).values():
+            values[:] = [values[i] for i in kept]
+        self._notify("clicks_removed", group=group_name, indices=removed_list)
+
+    def move_clicks(
+        self, indices: np.ndarray, points: np.ndarray, group_name: Optional[str] = None
+    ) -> None:
+        r"""
+        Move clicks (one ``clicks_moved`` event). Their indices and point data are kept.
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+            Indices of the clicks (negative indices count from the end).
+        points : numpy.ndarray
+            New positions with shape (N, 2), one per index, NaN for the placeholders.
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Raises
+        ------
+        ValueError
+            If the indices and points do not match, or an index is repeated.
+        IndexError
+            If an index is out of range.
+        """
+        group_name = group_name or self.current_group
+
+        if group_name not in self.groups:
+            raise KeyError(f"Group '{group_name}' does not exist.")
+
+        clicks = self.groups[group_name]
+        moved = _as_indices(indices, len(clicks))
+        array = _as_points(points)
+        if len(moved) != len(array):
+            raise ValueError(f"Expected {len(moved)} points, got {len(array)}.")
+        if len(np.unique(moved)) != len(moved):
+            raise ValueError("Each click can only be moved once per batch.")
+        if not len(moved):
+            return
+
+        stats = self._group_stats(group_name)
+        moved_list = moved.tolist()
+        new = _point_list(array)
+        stats.remove_many(_point_array([clicks[i] for i in moved_list]))
+        for i, point in zip(moved_list, new):
+            clicks[i] = point
+        stats.add_many(array)
+        if self._listeners:
+            self._notify(
+                "clicks_moved", group=group_name, indices=moved_list, points=[list(p) for p in new]
+            )
+
+    def group_array(self, group_name: Optional[str] = None) -> np.ndarray:
+        r"""
+        Stored clicks of a group as an array (the input of the batched methods).
+
+        Parameters
+        ----------
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Returns
+        -------
+        numpy.ndarray
+            Points with shape (N, 2), NaN for the placeholders (not converted with the precision mode).
+        """
+        group_name = group_name or self.current_group
+
+        if group_name not in self.groups:
+            raise KeyError(f"Group '{group_name}' does not exist.")
+
+        return _point_array(self.groups[group_name])
+
+    def replace_group(self, points: np.ndarray, group_name: Optional[str] = None) -> None:
+        r"""
+        Replace all the clicks of a group (one ``group_replaced`` event).
+
+        The point data of the group are kept with the same number of clicks
+        (the clicks are replaced one for one), and removed otherwise.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Points with shape (N, 2), NaN for the placeholders.
+        group_name : Optional[str]
+            Group name (created if needed). If None, uses current group.
+            Default is None.
+
+        Raises
+        ------
+        ValueError
+            If the shape is not (N, 2) or a coordinate is infinite.
+        """
+        group_name = group_name or self.current_group
+        array = _as_points(points)
+        self.add_group(group_name)
+
+        count = self._group_stats(group_name).count
+        new = _point_list(array)
+        stats = _GroupStats()
+        stats.add_many(array)
+        self.groups[group_name] = new
+        self._stats[group_name] = stats
+        self._n_clicks += len(new) - count
+        if len(new) != count:
+            self.point_data.pop(group_name, None)
+        if self._listeners:
+            self._notify("group_replaced", group=group_name, points=[list(p) for p in new])
+
+    # =========================================================
+    # STATISTICS
+    # =========================================================
+
+    def _group_stats(self, group_name: str) -> _GroupStats:
+        r"""
+        Return the aggregates of a group (rebuilt if the group was modified directly).
+        """
+        stats = self._stats.get(group_name)
+        if stats is None or stats.count != len(self.groups[group_name]):
+            if stats is not None:
+                self._n_clicks -= stats.count
+            stats = _GroupStats(self.groups[group_name])
+            self._stats[group_name] = stats
+            self._n_clicks += stats.count
+        return stats
+
+    def _rebuild_stats(self) -> None:
+        r"""
+        Rebuild all the aggregates (after a bulk load writing the groups directly).
+        """
+        self._stats = {group: _GroupStats(points) for group, points in self.groups.items()}
+        self._n_clicks = sum(stats.count for stats in self._stats.values())
+
+    def group_stats(self, group_name: Optional[str] = None) -> dict:
+        r"""
+        Return the statistics of a group in constant time.
+
+        A direct edit of the ``groups`` dictionary changing the length of the group is detected
+        (the aggregates of the group are rebuilt); a same-length edit is not (see :class:`ClickManager`).
+
+        The bounding box is only recomputed (O(n) for this group) after the removal
+        of a point lying on it.
+
+        Parameters
+        ----------
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Returns
+        -------
+        dict
+            Dictionary with the keys:
+
+            - ``count``: number of clicks, placeholders included.
+            - ``placeholders``: number of clicks without coordinates.
+            - ``centroid``: mean (x, y) of the clicks with coordinates, or None.
+            - ``bbox``: (min_x, min_y, max_x, max_y) of the clicks with coordinates, or None.
+
+            Coordinates are floats, regardless of the precision mode.
+        """
+        group_name = group_name or self.current_group
+
+        if group_name not in self.groups:
+            raise KeyError(f"Group '{group_name}' does not exist.")
+
+        stats = self._group_stats(group_name)
+        if not stats.bbox_valid:
+            stats = _GroupStats(self.groups[group_name])
+            self._stats[group_name] = stats
+
+        n_valid = stats.count - stats.placeholders
+        return {
+            "count": stats.count,
+            "placeholders": stats.placeholders,
+            "centroid": (stats.sum_x / n_valid, stats.sum_y / n_valid) if n_valid else None,
+            "bbox": tuple(stats.bbox) if n_valid else None,
+        }
+
+    def stats(self) -> Dict[str, dict]:
+        r"""
+        Return the statistics of all the groups (see :meth:`group_stats`).
+
+        Returns
+        -------
+        Dict[str, dict]
+            Statistics by group name.
+        """
+        return {group: self.group_stats(group) for group in self.groups}
+
+    # =========================================================
+    # POINT DATA
+    # =========================================================
+
+    def point_data_columns(self, group_name: Optional[str] = None) -> List[str]:
+        r"""
+        Return the names of the point data columns of a group.
+
+        Parameters
+        ----------
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Returns
+        -------
+        List[str]
+            Column names.
+        """
+        group_name = group_name or self.current_group
+        return list(self.point_data.get(group_name, {}))
+
+    def get_point_data(
+        self, column: str, group_name: Optional[str] = None
+    ) -> List[Optional[float]]:
+        r"""
+        Get a point data column of a group.
+
+        Parameters
+        ----------
+        column : str
+            Column name.
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Returns
+        -------
+        List[Optional[float]]
+            One value per click of the group (None if not set).
+        """
+        group_name = group_name or self.current_group
+
+        if group_name not in self.groups:
+            raise KeyError(f"Group '{group_name}' does not exist.")
+
+        values = self.point_data.get(group_name, {}).get(column)
+        if values is None:
+            return [None] * len(self.groups[group_name])
+        return list(values)
+
+    def set_point_data(
+        self,
+        column: str,
+        values: List[Optional[float]],
+        group_name: Optional[str] = None,
+    ) -> None:
+        r"""
+        Set a point data column of a group.
+
+        Parameters
+        ----------
+        column : str
+            Column name. Must not collide with the CSV columns "Group", "Index", "X" and "Y".
+        values : List[Optional[float]]
+            One value per click of the group (None for missing values).
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Raises
+        ------
+        ValueError
+            If the number of values does not match the number of clicks.
+        """
+        group_name = group_name or self.current_group
+
+        if group_name not in self.groups:
+            raise KeyError(f"Group '{group_name}' does not exist.")
+        if column in ("Group", "Index", "X", "Y"):
+            raise ValueError(f"'{column}' is a reserved column name.")
+        if len(values) != len(self.groups[group_name]):
+            raise ValueError(
+                f"Expected {len(self.groups[group_name])} values for group '{group_name}', got {len(values)}."
+            )
+
+        values = [float(v) if v is not None else None for v in values]
+        self.point_data.setdefault(group_name, {})[column] = values
+        if self._listeners:
+            self._notify("point_data_set", group=group_name, column=column, values=list(values))
+
+    def remove_point_data(self, column: str, group_name: Optional[str] = None) -> None:
+        r"""
+        Remove a point data column of a group (no error if it does not exist).
+
+        Parameters
+        ----------
+        column : str
+            Column name.
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+        """
+        group_name = group_name or self.current_group
+        columns = self.point_data.get(group_name)
+        if columns is None:
+            return
+        if columns.pop(column, None) is not None:
+            self._notify("point_data_removed", group=group_name, column=column)
+        if not columns:
+            del self.point_data[group_name]
+
+    # =========================================================
+    # REFINEMENT
+    # =========================================================
+
+    def refine_clicks(
+        self,
+        indices: List[int],
+        points: List[Point],
+        group_name: Optional[str] = None,
+    ) -> None:
+        r"""
+        Replace clicks by their refined positions, keeping the raw positions.
+
+        The raw position of a click is stored in the ``raw_x`` and ``raw_y`` point data columns
+        the first time it is refined, so refining twice still keeps the original click.
+
+        Parameters
+        ----------
+        indices : List[int]
+            Indices of the refined clicks in the group.
+        points : List[Point]
+            Refined (x, y) coordinates, one per index.
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+        """
+        group_name = group_name or self.current_group
+
+        if group_name not in self.groups:
+            raise KeyError(f"Group '{group_name}' does not exist.")
+        if len(indices) != len(points):
+            raise ValueError("indices and points must have the same length.")
+
+        clicks = self.groups[group_name]
+        stats = self._group_stats(group_name)
+        raw_x = self.get_point_data("raw_x", group_name)
+        raw_y = self.get_point_data("raw_y", group_name)
+        moved = []
+
+        for index, (x, y) in zip(indices, points):
+            old_x, old_y = clicks[index]
+            if old_x is None or old_y is None or x is None or y is None:
+                continue
+            if raw_x[index] is None:
+                raw_x[index] = old_x
+                raw_y[index] = old_y
+            clicks[index] = (float(x), float(y))
+            stats.remove(old_x, old_y)
+            stats.add(float(x), float(y))
+            moved.append(index % len(clicks))
+
+        if moved and self._listeners:
+            self._notify(
+                "clicks_moved",
+                group=group_name,
+                indices=moved,
+                points=[list(clicks[i]) for i in moved],
+            )
+        self.set_point_data("raw_x", raw_x, group_name)
+        self.set_point_data("raw_y", raw_y, group_name)
+
+    def reset_refinement(self, group_name: Optional[str] = None) -> None:
+        r"""
+        Restore the raw positions of the refined clicks of a group.
+
+        Parameters
+        ----------
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+        """
+        group_name = group_name or self.current_group
+        raw_x = self.get_point_data("raw_x", group_name)
+        raw_y = self.get_point_data("raw_y", group_name)
+        self.replace_group(
+            _point_array(
+                [
+                    (x, y) if rx is None else (rx, ry)
+                    for (x, y), rx, ry in zip(self.groups[group_name], raw_x, raw_y)
+                ]
+            ),
+            group_name,
+        )
+        self.remove_point_data("raw_x", group_name)
+        self.remove_point_data("raw_y", group_name)
+
+    def extract_raw_group(self, group_name: Optional[str] = None) -> List[Point]:
+        r"""
+        Extract the clicks of a group as originally clicked (before refinement).
+
+        Parameters
+        ----------
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Returns
+        -------
+        List[Point]
+            Raw (x, y) coordinates, converted with the precision mode.
+        """
+        group_name = group_name or self.current_group
+        raw_x = self.get_point_data("raw_x", group_name)
+        raw_y = self.get_point_data("raw_y", group_name)
+        return [
+            (self._convert(x), self._convert(y))
+            if rx is None
+            else (self._convert(rx), self._convert(ry))
+            for (x, y), rx, ry in zip(self.groups[group_name], raw_x, raw_y)
+        ]
+
+    # =========================================================
+    # MERGE
+    # =========================================================
+
+    def merge(self, other: "ClickManager", prefix: str = "") -> None:
+        r"""
+        Append the clicks and point data of another manager.
+
+        Clicks of groups with the same name are appended after the existing ones.
+        Both managers must use the same half-shift convention.
+
+        Parameters
+        ----------
+        other : ClickManager
+            The manager to merge.
+        prefix : str
+            Prefix added to the group names of ``other``.
+            Default is "".
+        """
+        for group, points in other.groups.items():
+            name = prefix + group
+            self.add_group(name)
+            start = len(self.groups[name])
+            self.add_clicks(other.group_array(group), name)
+
+            for column in other.point_data_columns(group):
+                values = self.get_point_data(column, name)
+                values[start:] = other.get_point_data(column, group)
+                self.set_point_data(column, values, name)
+
+    # =========================================================
+    # CALIBRATED COORDINATES
+    # =========================================================
+
+    def add_transform(self, name: str, transform: CoordinateTransform) -> None:
+        r"""
+        Attach a coordinate transform (replaces a transform with the same name).
+
+        Parameters
+        ----------
+        name : str
+            Name of the transform, prefix of the exported columns ``<name>_x`` and ``<name>_y``.
+        transform : CoordinateTransform
+            The transform (pixel-center coordinates to calibrated coordinates).
+        """
+        if not name:
+            raise ValueError(f"Invalid transform name '{name}'.")
+        self._transforms[name] = transform
+
+    def remove_transform(self, name: str) -> None:
+        r"""
+        Detach a coordinate transform (no error if it does not exist).
+        """
+        self._transforms.pop(name, None)
+
+    @property
+    def transforms(self) -> Dict[str, CoordinateTransform]:
+        r"""
+        Attached coordinate transforms by name.
+        """
+        return dict(self._transforms)
+
+    def transform_group(self, name: str, group_name: Optional[str] = None) -> np.ndarray:
+        r"""
+        Calibrated coordinates of a group with an attached transform.
+
+        Parameters
+        ----------
+        name : str
+            Name of the transform.
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Returns
+        -------
+        numpy.ndarray
+            Calibrated points with shape (N, 2), NaN for the placeholders.
+        """
+        group_name = group_name or self.current_group
+        return self._transforms[name].apply(self.group_array(group_name))
+
+    def calibrated_columns(self, group_name: Optional[str] = None) -> Dict[str, List[Optional[float]]]:
+        r"""
+        Calibrated coordinates of a group as columns ``<name>_x`` and ``<name>_y`` (None for missing values).
+
+        Parameters
+        ----------
+        group_name : Optional[str]
+            Group name. If None, uses current group.
+            Default is None.
+
+        Returns
+        -------
+        Dict[str, List[Optional[float]]]
+            One list per column, one value per click.
+        """
+        group_name = group_name or self.current_group
+        points = self.group_array(group_name)
+        columns = {}
+        for name, transform in self._transforms.items():
+            calibrated = transform.apply(points)
+            for axis, suffix in enumerate("xy"):
+                columns[f"{name}_{suffix}"] = [
+                    None if np.isnan(v) else v for v in calibrated[:, axis].tolist()
+                ]
+        return columns
 
     # =========================================================
     # EXPORT
@@ -368,24 +1452,55 @@ class ClickManager:
             for group, points in self.groups.items()
         }
 
+    @traced(category="io")
     def save_to_csv(self, path: str) -> None:
         r"""
         Save clicks to CSV.
 
+        The point data columns follow the coordinates, then the calibrated columns of the
+        attached transforms (see :meth:`add_transform`), computed once per group.
+        The coordinates and the raw coordinates of the refined clicks (``raw_x``, ``raw_y``)
+        are written with the precision mode.
+
         Parameters
         ----------
         path : str
             Output file path.
         """
+        calibrated = [f"{name}_{suffix}" for name in self._transforms for suffix in "xy"]
+        extra = sorted(
+            {c for columns in self.point_data.values() for c in columns} - set(calibrated)
+        )
+        extra += calibrated
+
         with open(path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            writer.writerow(["Group", "Index", "X", "Y"])
+            writer.writerow(["Group", "Index", "X", "Y"] + extra)
 
             for group, points in self.groups.items():
+                if not extra:
+                    for i, (x, y) in enumerate(points):
+                        writer.writerow([group, i, self._convert(x), self._convert(y)])
+                    continue
+
+                calibrated_values = self.calibrated_columns(group) if calibrated else {}
+                columns = [
+                    calibrated_values[c] if c in calibrated_values else self.get_point_data(c, group)
+                    for c in extra
+                ]
+                # The raw coordinates follow the precision mode, as X and Y
+                columns = [
+                    [self._convert(v) for v in col] if c in self.COORDINATE_COLUMNS else col
+                    for c, col in zip(extra, columns)
+                ]
                 for i, (x, y) in enumerate(points):
-                    writer.writerow([group, i, self._convert(x), self._convert(y)])
+                    writer.writerow(
+                        [group, i, self._convert(x), self._convert(y)]
+                        + ["" if col[i] is None else col[i] for col in columns]
+                    )
 
     @classmethod
+    @traced(category="io")
     def load_from_csv(
         cls, path: str, precision_mode: Literal["float", "int"] = "float"
     ) -> "ClickManager":
@@ -407,11 +1522,15 @@ class ClickManager:
         """
         instance = cls(precision_mode=precision_mode)
 
+        extra_values: Dict[str, Dict[str, List[Optional[float]]]] = {}
+
         with open(path, "r", encoding="utf-8") as f:
             reader = csv.reader(f)
-            next(reader)
+            header = next(reader)
+            extra = header[4:]
 
-            for group, _, x, y in reader:
+            for row in reader:
+                group, _, x, y = row[:4]
 
                 instance.add_group(group)
 
@@ -420,4 +1539,18 @@ class ClickManager:
 
                 instance.groups[group].append((x_val, y_val))
 
+                if extra:
+                    columns = extra_values.setdefault(
+                        group, {c: [] for c in extra}
+                    )
+                    for c, v in zip(extra, row[4:]):
+                        columns[c].append(float(v) if v != "" else None)
+
+        for group, columns in extra_values.items():
+            for c, values in columns.items():
+                if any(v is not None for v in values):
+                    instance.set_point_data(c, values, group)
+
+        instance._rebuild_stats()
+
         return instance
@@ -0,0 +1,312 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from typing import Callable, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from .refinement import to_gray_float
+from .tracing import traced
+
+FeatureKind = Literal["corner", "blob", "extremum"]
+
+FEATURE_KINDS = ("corner", "blob", "extremum")
+
+
+def _strict_maxima(response: np.ndarray) -> np.ndarray:
+    r"""
+    Mask of the 3x3 local maxima, keeping a single pixel (the first in raster order) per plateau.
+    """
+    h, w = response.shape
+    mask = response >= cv2.dilate(response, np.ones((3, 3), np.uint8))
+    pad = np.pad(response, 1, mode="constant", constant_values=-np.inf)
+    for dy, dx in ((-1, -1), (-1, 0), (-1, 1), (0, -1)):
+        mask &= response > pad[1 + dy : 1 + dy + h, 1 + dx : 1 + dx + w]
+    return mask
+
+
+def _response(
+    gray: np.ndarray, kind: FeatureKind, scale: float
+) -> Tuple[List[Tuple[np.ndarray, np.ndarray]], np.ndarray]:
+    r"""
+    Compute the response maps of a tile, each with the mask of its local maxima
+    (refined on this map), and the strength map used for the quality threshold.
+    """
+    if kind == "corner":
+        response = cv2.cornerMinEigenVal(gray, blockSize=max(3, int(2 * scale) | 1))
+    elif kind == "blob":
+        blurred = cv2.GaussianBlur(gray, (0, 0), scale)
+        response = np.abs(cv2.Laplacian(blurred, cv2.CV_32F)) * scale * scale
+    else:
+        blurred = cv2.GaussianBlur(gray, (0, 0), scale)
+        kernel = np.ones((3, 3), np.uint8)
+        # The local contrast only rejects flat areas and ranks the extrema:
+        # its peaks are not at the extrema, which are refined on the intensity itself.
+        contrast = cv2.dilate(blurred, kernel) - cv2.erode(blurred, kernel)
+        flat = contrast <= 0
+        maxima = _strict_maxima(blurred) & ~flat
+        minima = _strict_maxima(-blurred) & ~flat
+        return [(blurred, maxima), (-blurred, minima)], contrast
+
+    return [(response, _strict_maxima(response) & (response > 0))], response
+
+
+def subpixel_peak(response: np.ndarray, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+    r"""
+    Refine integer maxima of a response map with a 3-point parabola in x and y.
+
+    Parameters
+    ----------
+    response : numpy.ndarray
+        Response map with shape (H, W).
+    ys, xs : numpy.ndarray
+        Integer row and column indices of the maxima.
+
+    Returns
+    -------
+    numpy.ndarray
+        Sub-pixel (x, y) positions with shape (N, 2).
+    """
+    h, w = response.shape
+    inner = (xs > 0) & (xs < w - 1) & (ys > 0) & (ys < h - 1)
+    fx = np.zeros(xs.shape, np.float32)
+    fy = np.zeros(ys.shape, np.float32)
+
+    y, x = ys[inner], xs[inner]
+    c = response[y, x]
+    for f, l, r in (
+        (fx, response[y, x - 1], response[y, x + 1]),
+        (fy, response[y - 1, x], response[y + 1, x]),
+    ):
+        denom = l - 2.0 * c + r
+        f[inner] = np.where(denom < 0, 0.5 * (l - r) / np.where(denom < 0, denom, -1.0), 0.0)
+
+    return np.stack([xs + fx, ys + fy], axis=1)
+
+
+def _detect_tile(
+    gray: np.ndarray,
+    bounds: Tuple[int, int, int, int],
+    kind: FeatureKind,
+    scale: float,
+    margin: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    r"""
+    Detect the candidate features of one tile (with a margin to avoid border effects).
+    """
+    x0, y0, x1, y1 = bounds
+    h, w = gray.shape
+    mx0, my0 = max(0, x0 - margin), max(0, y0 - margin)
+    mx1, my1 = min(w, x1 + margin), min(h, y1 + margin)
+
+    tile = np.ascontiguousarray(gray[my0:my1, mx0:mx1])
+    responses, strength = _response(tile, kind, scale)
+
+    # Keep only the maxima inside the tile core (the margin belongs to the neighbours)
+    core = np.zeros(strength.shape, bool)
+    core[y0 - my0 : y1 - my0, x0 - mx0 : x1 - mx0] = True
+
+    points, values = [], []
+    for response, mask in responses:
+        ys, xs = np.nonzero(mask & core)
+        points.append(subpixel_peak(response, ys, xs))
+        values.append(strength[ys, xs])
+
+    points = np.concatenate(points, axis=0)
+    points[:, 0] += mx0
+    points[:, 1] += my0
+    return points, np.concatenate(values, axis=0)
+
+
+@traced(category="compute")
+def detect_features(
+    image: np.ndarray,
+    kind: FeatureKind = "corner",
+    scale: float = 1.5,
+    quality: float = 0.01,
+    max_features: int = 200_000,
+    tile_size: int = 512,
+    max_workers: Optional[int] = None,
+    cancel_event: Optional[threading.Event] = None,
+    progress: Optional[Callable[[float], None]] = None,
+) -> np.ndarray:
+    r"""
+    Detect image features (corners, blobs or intensity extrema) with sub-pixel positions.
+
+    The image is split into tiles processed in a thread pool (OpenCV releases the GIL).
+    The local maxima of each tile are gathered, and only the ones with a response above
+    ``quality`` times the strongest response of the whole image are kept.
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        Image with shape (H, W) or (H, W, 3) (BGR).
+    kind : str
+        "corner" (minimum eigenvalue), "blob" (Laplacian of Gaussian) or "extremum"
+        (local maxima and minima of the smoothed intensity).
+        Default is "corner".
+    scale : float
+        Smoothing scale in pixels.
+        Default is 1.5.
+    quality : float
+        Minimal response relative to the strongest one.
+        Default is 0.01.
+    max_features : int
+        Maximum number of features kept (the strongest).
+        Default is 200000.
+    tile_size : int
+        Side length of the tiles.
+        Default is 512.
+    max_workers : int, optional
+        Number of threads. If None, uses the number of CPUs.
+    cancel_event : threading.Event, optional
+        If set during the detection, ``concurrent.futures.CancelledError`` is raised.
+    progress : Callable[[float], None], optional
+        Called with the fraction of processed tiles.
+
+    Returns
+    -------
+    numpy.ndarray
+        Feature positions with shape (N, 2), in pixel-center coordinates
+        ((0, 0) on the center of the first pixel).
+    """
+    if kind not in FEATURE_KINDS:
+        raise ValueError(f"kind must be one of {FEATURE_KINDS}")
+
+    gray = to_gray_float(image)
+    h, w = gray.shape
+    margin = int(math.ceil(4 * scale)) + 2
+
+    tiles = [
+        (x, y, min(w, x + tile_size), min(h, y + tile_size))
+        for y in range(0, h, tile_size)
+        for x in range(0, w, tile_size)
+    ]
+
+    points, values = [], []
+    workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_detect_tile, gray, bounds, kind, scale, margin) for bounds in tiles
+        ]
+        for i, future in enumerate(futures):
+            if cancel_event is not None and cancel_event.is_set():
+                for f in futures:
+                    f.cancel()
+                raise CancelledError()
+            p, v = future.result()
+            points.append(p)
+            values.append(v)
+            if progress is not None:
+                progress((i + 1) / len(futures))
+
+    points = np.concatenate(points, axis=0) if points else np.zeros((0, 2), np.float32)
+    values = np.concatenate(values, axis=0) if values else np.zeros(0, np.float32)
+    if values.size == 0:
+        return points.astype(np.float64)
+
+    keep = values >= quality * values.max()
+    points, values = points[keep], values[keep]
+    if points.shape[0] > max_features:
+        strongest = np.argpartition(-values, max_features)[:max_features]
+        points = points[strongest]
+
+    return points.astype(np.float64)
+
+
+class FeatureIndex:
+    r"""
+    Uniform-grid spatial index answering nearest-feature queries in microseconds.
+
+    The features are sorted by grid cell once; a query only looks at the cells
+    overlapping the search disk.
+
+    Parameters
+    ----------
+    points : numpy.ndarray
+        Feature positions with shape (N, 2).
+    cell_size : float
+        Side length of the grid cells (about the typical search radius).
+        Default is 8.
+    """
+
+    __slots__ = ["points", "cell_size", "_cells"]
+
+    def __init__(self, points: np.ndarray, cell_size: float = 8.0) -> None:
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.cell_size = float(cell_size)
+        self._cells: Dict[Tuple[int, int], np.ndarray] = {}
+
+        if self.points.shape[0] == 0:
+            return
+
+        cells = np.floor(self.points / self.cell_size).astype(np.int64)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        cells = cells[order]
+        self.points = self.points[order]
+
+        change = np.flatnonzero(np.any(np.diff(cells, axis=0) != 0, axis=1)) + 1
+        starts = np.concatenate([[0], change])
+        ends = np.concatenate([change, [cells.shape[0]]])
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            cx, cy = cells[start]
+            self._cells[(int(cx), int(cy))] = self.points[start:end]
+
+    def __len__(self) -> int:
+        return self.points.shape[0]
+
+    def nearest(
+        self, x: float, y: float, radius: float
+    ) -> Optional[Tuple[float, float]]:
+        r"""
+        Return the feature nearest to (x, y) within ``radius``, or None.
+
+        Parameters
+        ----------
+        x, y : float
+            Query position (same convention as the indexed points).
+        radius : float
+            Search radius.
+
+        Returns
+        -------
+        Optional[Tuple[float, float]]
+            Position of the nearest feature.
+        """
+        size = self.cell_size
+        reach = int(math.ceil(radius / size))
+        cx, cy = int(math.floor(x / size)), int(math.floor(y / size))
+
+        best = None
+        best_d2 = radius * radius
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                cell = self._cells.get((i, j))
+                if cell is None:
+                    continue
+                d2 = (cell[:, 0] - x) ** 2 + (cell[:, 1] - y) ** 2
+                k = int(d2.argmin())
+                if d2[k] <= best_d2:
+                    best_d2 = float(d2[k])
+                    best = (float(cell[k, 0]), float(cell[k, 1]))
+        return best
@@ -0,0 +1,197 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+from typing import Literal, Optional
+
+import numpy as np
+
+from .click_manager import ClickManager
+
+ClickFormat = Literal["csv", "json", "npz"]
+
+FORMATS = ("csv", "json", "npz")
+
+
+def detect_format(path: str) -> ClickFormat:
+    r"""
+    Return the click file format from the file extension.
+
+    Parameters
+    ----------
+    path : str
+        Path of the click file (``.csv``, ``.json`` or ``.npz``).
+
+    Returns
+    -------
+    str
+        One of ``FORMATS``.
+
+    Raises
+    ------
+    ValueError
+        If the extension is not supported.
+    """
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported click file extension '.{ext}' (expected one of {FORMATS}).")
+    return ext
+
+
+def save_clicks(
+    click_manager: ClickManager, path: str, fmt: Optional[ClickFormat] = None
+) -> None:
+    r"""
+    Save clicks in CSV, JSON or NPZ format.
+
+    - CSV: :meth:`ClickManager.save_to_csv`.
+    - JSON: ``{"groups": {group: [[x, y], ...]}, "point_data": {group: {column: [...]}}}``,
+      with ``null`` for the missing values.
+    - NPZ: the group names in ``groups``, and for the i-th group an array ``xy_i`` with shape (N, 2)
+      and one array ``data_i_<column>`` per point data column, with NaN for the missing values.
+
+    The coordinates are converted with the precision mode of the manager. The calibrated
+    coordinates of the attached transforms (see :meth:`ClickManager.add_transform`) are
+    written in the same pass: CSV columns ``<name>_x`` and ``<name>_y``, JSON
+    ``{"calibrated": {name: {group: [[x, y], ...]}}}`` and NPZ arrays ``cal_<name>_i`` with
+    shape (N, 2). They are not converted with the precision mode and are ignored by
+    :func:`load_clicks` (except in CSV, where they are loaded as point data).
+
+    Parameters
+    ----------
+    click_manager : ClickManager
+        The clicks to save.
+    path : str
+        Output file path.
+    fmt : str, optional
+        Output format. If None, it is detected from the extension.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}")
+
+    if fmt == "csv":
+        click_manager.save_to_csv(path)
+        return
+
+    groups = list(click_manager.groups)
+
+    if fmt == "json":
+        data = {
+            "groups": {
+                group: [list(p) for p in click_manager.extract_group(group)] for group in groups
+            },
+            "point_data": {
+                group: {
+                    column: click_manager.get_point_data(column, group)
+                    for column in click_manager.point_data_columns(group)
+                }
+                for group in groups
+                if click_manager.point_data_columns(group)
+            },
+        }
+        if click_manager.transforms:
+            data["calibrated"] = {
+                name: {
+                    group: [
+                        [None if np.isnan(v) else v for v in p]
+                        for p in click_manager.transform_group(name, group).tolist()
+                    ]
+                    for group in groups
+                }
+                for name in click_manager.transforms
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return
+
+    arrays = {"groups": np.array(groups, dtype=str)}
+    for i, group in enumerate(groups):
+        points = click_manager.extract_group(group)
+        arrays[f"xy_{i}"] = np.array(
+            [[np.nan if v is None else v for v in p] for p in points], dtype=np.float64
+        ).reshape(-1, 2)
+        for column in click_manager.point_data_columns(group):
+            values = click_manager.get_point_data(column, group)
+            arrays[f"data_{i}_{column}"] = np.array(
+                [np.nan if v is None else v for v in values], dtype=np.float64
+            )
+        for name in click_manager.transforms:
+            arrays[f"cal_{name}_{i}"] = click_manager.transform_group(name, group)
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def load_clicks(
+    path: str,
+    fmt: Optional[ClickFormat] = None,
+    precision_mode: Literal["float", "int"] = "float",
+) -> ClickManager:
+    r"""
+    Load clicks saved by :func:`save_clicks` (or :meth:`ClickManager.save_to_csv`).
+
+    Parameters
+    ----------
+    path : str
+        Click file path.
+    fmt : str, optional
+        Input format. If None, it is detected from the extension.
+    precision_mode : str
+        Precision mode of the returned manager ("float" or "int").
+        Default is "float".
+
+    Returns
+    -------
+    ClickManager
+        Loaded instance.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}")
+
+    if fmt == "csv":
+        return ClickManager.load_from_csv(path, precision_mode=precision_mode)
+
+    instance = ClickManager(precision_mode=precision_mode)
+
+    if fmt == "json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for group, points in data.get("groups", {}).items():
+            instance.add_clicks(points, group)
+        for group, columns in data.get("point_data", {}).items():
+            for column, values in columns.items():
+                instance.set_point_data(column, values, group)
+        return instance
+
+    with np.load(path, allow_pickle=False) as npz:
+        groups = [str(g) for g in npz["groups"]]
+        columns = {}
+        for key in npz.files:
+            if key.startswith("data_"):
+                index, _, column = key[len("data_") :].partition("_")
+                columns.setdefault(int(index), []).append((column, key))
+
+        for i, group in enumerate(groups):
+            instance.add_clicks(npz[f"xy_{i}"], group)
+            for column, key in columns.get(i, []):
+                values = [None if np.isnan(v) else v for v in npz[key].tolist()]
+                instance.set_point_data(column, values, group)
+
+    return instance
@@ -0,0 +1,471 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from .click_manager import ClickManager
+from .tracing import traced
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".m4v", ".wmv", ".mpg", ".mpeg")
+STACK_EXTENSIONS = (".tif", ".tiff")
+
+FRAME_COLUMN = "frame"
+
+
+# =========================================================
+# SOURCES
+# =========================================================
+
+
+class FrameSource:
+    r"""
+    Random access to the frames of a sequence (base class).
+
+    Subclasses implement :meth:`read_range`; the reads are serialized by a lock,
+    so a source can be shared by the GUI thread and a read-ahead thread.
+
+    Parameters
+    ----------
+    path : str
+        Path of the sequence.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.n_frames = 0
+
+    def __len__(self) -> int:
+        return self.n_frames
+
+    def read(self, index: int) -> np.ndarray:
+        r"""
+        Decode one frame.
+
+        Parameters
+        ----------
+        index : int
+            Frame index.
+
+        Returns
+        -------
+        numpy.ndarray
+            The frame (BGR or gray).
+        """
+        return self.read_range(index, index + 1)[0]
+
+    def read_range(self, start: int, stop: int) -> List[np.ndarray]:
+        r"""
+        Decode the consecutive frames ``start`` to ``stop - 1`` (one seek, then sequential reads).
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        r"""
+        Release the underlying file.
+        """
+
+
+class VideoSource(FrameSource):
+    r"""
+    Frames of a video file read with ``cv2.VideoCapture``.
+
+    Sequential reads do not seek: reading frame ``i + 1`` after frame ``i`` only decodes one frame,
+    and short forward jumps are done with ``grab()`` (no conversion) instead of a keyframe seek.
+
+    Parameters
+    ----------
+    path : str
+        Path of the video.
+    max_skip : int
+        Maximal forward jump done by grabbing frames instead of seeking.
+        Default is 32.
+    """
+
+    def __init__(self, path: str, max_skip: int = 32) -> None:
+        super().__init__(path)
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError(f"Cannot open video '{path}'.")
+        self.n_frames = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.fps = float(self.capture.get(cv2.CAP_PROP_FPS)) or None
+        self.max_skip = max_skip
+        self._position = 0
+
+        if self.n_frames <= 0:
+            # Some containers do not store the frame count: count once
+            while self.capture.grab():
+                self.n_frames += 1
+            self._seek(0)
+
+    def _seek(self, index: int) -> None:
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+        self._position = index
+
+    def read_range(self, start: int, stop: int) -> List[np.ndarray]:
+        start = max(0, start)
+        stop = min(self.n_frames, stop)
+        with self.lock:
+            if not (self._position <= start <= self._position + self.max_skip):
+                self._seek(start)
+            while self._position < start:
+                self.capture.grab()
+                self._position += 1
+
+            frames = []
+            for _ in range(start, stop):
+                ok, frame = self.capture.read()
+                if not ok:
+                    raise IOError(f"Cannot decode frame {self._position} of '{self.path}'.")
+                self._position += 1
+                frames.append(frame)
+            return frames
+
+    def close(self) -> None:
+        with self.lock:
+            self.capture.release()
+
+
+class TiffStackSource(FrameSource):
+    r"""
+    Pages of a multi-page TIFF (z-stack, time-lapse) read with ``cv2.imreadmulti``.
+
+    Parameters
+    ----------
+    path : str
+        Path of the TIFF file.
+    flags : int
+        ``cv2.imread`` flags of the pages.
+        Default is ``cv2.IMREAD_COLOR`` (8-bit BGR, as the still images).
+    """
+
+    def __init__(self, path: str, flags: int = cv2.IMREAD_COLOR) -> None:
+        super().__init__(path)
+        self.flags = flags
+        self.n_frames = int(cv2.imcount(path, flags))
+        if self.n_frames <= 0:
+            raise ValueError(f"Cannot read '{path}'.")
+
+    def read_range(self, start: int, stop: int) -> List[np.ndarray]:
+        start = max(0, start)
+        stop = min(self.n_frames, stop)
+        with self.lock:
+            ok, frames = cv2.imreadmulti(
+                self.path, start, stop - start, flags=self.flags
+            )
+        if not ok or len(frames) != stop - start:
+            raise IOError(f"Cannot decode pages {start}-{stop - 1} of '{self.path}'.")
+        return list(frames)
+
+
+def open_frame_source(path: str) -> FrameSource:
+    r"""
+    Open a video or a multi-page TIFF from its extension.
+
+    Parameters
+    ----------
+    path : str
+        Path of the sequence.
+
+    Returns
+    -------
+    FrameSource
+        The source.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in STACK_EXTENSIONS:
+        return TiffStackSource(path)
+    return VideoSource(path)
+
+
+# =========================================================
+# CACHE
+# =========================================================
+
+
+class FrameCache:
+    r"""
+    LRU cache of decoded frames with a background read-ahead in both directions.
+
+    :meth:`get` returns a cached frame immediately, or decodes it synchronously.
+    After each :meth:`get`, a worker thread decodes the frames around the current one:
+    the next ``ahead`` frames in one sequential pass, then the previous ``behind`` frames in
+    one pass starting from a single seek (backward stepping never seeks frame by frame).
+
+    Parameters
+    ----------
+    source : FrameSource
+        The frame source.
+    capacity : int
+        Maximum number of cached frames.
+        Default is 64.
+    ahead : int
+        Number of frames decoded ahead of the current frame.
+        Default is 16.
+    behind : int
+        Number of frames decoded behind the current frame.
+        Default is 8.
+    """
+
+    def __init__(
+        self, source: FrameSource, capacity: int = 64, ahead: int = 16, behind: int = 8
+    ) -> None:
+        self.source = source
+        self.capacity = max(1, capacity)
+        self.ahead = ahead
+        self.behind = behind
+        self.hits = 0
+        self.misses = 0
+
+        self._frames: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._center: Optional[int] = None
+        self._generation = 0
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._read_ahead, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    @property
+    def nbytes(self) -> int:
+        r"""
+        Memory used by the cached frames.
+        """
+        with self._lock:
+            return sum(frame.nbytes for frame in self._frames.values())
+
+    def _store(self, index: int, frame: np.ndarray) -> None:
+        self._frames[index] = frame
+        self._frames.move_to_end(index)
+        while len(self._frames) > self.capacity:
+            self._frames.popitem(last=False)
+
+    def shrink(self, nbytes: int) -> int:
+        r"""
+        Free at least ``nbytes`` bytes (least recently used frames first) and lower the capacity,
+        so the read-ahead does not fill the cache again. The most recent frame is kept.
+
+        Parameters
+        ----------
+        nbytes : int
+            Bytes to free.
+
+        Returns
+        -------
+        int
+            Freed bytes.
+        """
+        freed = 0
+        with self._lock:
+            while freed < nbytes and len(self._frames) > 1:
+                _, frame = self._frames.popitem(last=False)
+                freed += frame.nbytes
+            self.capacity = max(1, min(self.capacity, len(self._frames)))
+        return freed
+
+    def peek(self, index: int) -> Optional[np.ndarray]:
+        r"""
+        Return a cached frame, or None (never decodes).
+        """
+        with self._lock:
+            return self._frames.get(index)
+
+    @traced(category="io")
+    def get(self, index: int) -> np.ndarray:
+        r"""
+        Return a frame (cached or decoded now) and move the read-ahead around it.
+
+        Parameters
+        ----------
+        index : int
+            Frame index.
+
+        Returns
+        -------
+        numpy.ndarray
+            The frame.
+        """
+        if not 0 <= index < len(self.source):
+            raise IndexError(f"Frame {index} out of range [0, {len(self.source)}).")
+
+        with self._lock:
+            frame = self._frames.get(index)
+            if frame is not None:
+                self._frames.move_to_end(index)
+                self.hits += 1
+
+        if frame is None:
+            self.misses += 1
+            frame = self.source.read(index)
+            with self._lock:
+                self._store(index, frame)
+
+        with self._lock:
+            self._center = index
+            self._generation += 1
+            self._wake.notify()
+        return frame
+
+    def _missing(self, indices: List[int]) -> List[int]:
+        return [i for i in indices if 0 <= i < len(self.source) and i not in self._frames]
+
+    def _read_ahead(self) -> None:
+        while True:
+            with self._lock:
+                while not self._stopped and self._center is None:
+                    self._wake.wait()
+                if self._stopped:
+                    return
+                center, generation = self._center, self._generation
+                self._center = None
+
+                # Forward block first, then the backward block (each decoded in one pass)
+                blocks = []
+                forward = self._missing(list(range(center + 1, center + 1 + self.ahead)))
+                if forward:
+                    blocks.append((forward[0], forward[-1] + 1))
+                backward = self._missing(list(range(center - self.behind, center)))
+                if backward:
+                    blocks.append((backward[0], backward[-1] + 1))
+
+            for start, stop in blocks:
+                # Decode in small chunks to react quickly to a new position
+                for chunk in range(start, stop, 4):
+                    if self._is_stale(generation):
+                        break
+                    try:
+                        frames = self.source.read_range(chunk, min(stop, chunk + 4))
+                    except (IOError, cv2.error):
+                        break
+                    with self._lock:
+                        for offset, frame in enumerate(frames):
+                            if chunk + offset not in self._frames:
+                                self._store(chunk + offset, frame)
+                        # Keep the current frame the most recently used
+                        if center in self._frames:
+                            self._frames.move_to_end(center)
+
+    def _is_stale(self, generation: int) -> bool:
+        with self._lock:
+            return self._stopped or self._generation != generation
+
+    def close(self) -> None:
+        r"""
+        Stop the read-ahead thread and release the source.
+        """
+        with self._lock:
+            self._stopped = True
+            self._wake.notify()
+        self._thread.join()
+        self.source.close()
+
+
+# =========================================================
+# CLICKS PER FRAME
+# =========================================================
+
+
+def merge_frames(frames: Dict[int, ClickManager]) -> ClickManager:
+    r"""
+    Merge per-frame clicks into one manager with a ``frame`` point data column.
+
+    Parameters
+    ----------
+    frames : Dict[int, ClickManager]
+        Clicks by frame index.
+
+    Returns
+    -------
+    ClickManager
+        All the clicks; the frame of each click is in the ``frame`` column.
+    """
+    managers = list(frames.values())
+    merged = ClickManager(precision_mode=managers[0].precision_mode if managers else "float")
+    for index in sorted(frames):
+        click_manager = frames[index]
+        starts = {group: len(merged.groups.get(group, ())) for group in click_manager.groups}
+        merged.merge(click_manager)
+        for group, start in starts.items():
+            values = merged.get_point_data(FRAME_COLUMN, group)
+            values[start:] = [float(index)] * (len(values) - start)
+            merged.set_point_data(FRAME_COLUMN, values, group)
+    return merged
+
+
+def split_frames(click_manager: ClickManager) -> Dict[int, ClickManager]:
+    r"""
+    Split clicks with a ``frame`` point data column by frame (inverse of :func:`merge_frames`).
+
+    All the groups exist in every returned manager (of the type of ``click_manager``).
+    Clicks without frame go to frame 0.
+
+    Parameters
+    ----------
+    click_manager : ClickManager
+        Clicks with a ``frame`` column.
+
+    Returns
+    -------
+    Dict[int, ClickManager]
+        Clicks by frame index.
+    """
+    frames: Dict[int, ClickManager] = {}
+    groups = list(click_manager.groups)
+
+    def frame_manager(index: int) -> ClickManager:
+        if index not in frames:
+            manager = type(click_manager)(precision_mode=click_manager.precision_mode)
+            for group in groups:
+                manager.add_group(group)
+            frames[index] = manager
+        return frames[index]
+
+    for group in groups:
+        columns = [c for c in click_manager.point_data_columns(group) if c != FRAME_COLUMN]
+        frame_of = click_manager.get_point_data(FRAME_COLUMN, group)
+        rows: Dict[int, List[int]] = {}
+        for i, value in enumerate(frame_of):
+            rows.setdefault(int(value) if value is not None else 0, []).append(i)
+
+        points = click_manager.group_array(group)
+        for index, indices in rows.items():
+            manager = frame_manager(index)
+            manager.add_clicks(points[indices], group)
+            for column in columns:
+                values = click_manager.get_point_data(column, group)
+                manager.set_point_data(column, [values[i] for i in indices], group)
+
+    return frames
+
+
+def frame_range(frames: Dict[int, ClickManager]) -> Tuple[int, int]:
+    r"""
+    Smallest and largest frame indices with clicks, or (0, 0).
+    """
+    used = [i for i, manager in frames.items() if manager.n_clicks]
+    return (min(used), max(used)) if used else (0, 0)
@@ -0,0 +1,317 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from PyQt5 import QtCore, QtWidgets
+
+from .click_manager import ClickManager
+
+
+class GroupListModel(QtCore.QAbstractListModel):
+    r"""
+    List model of the group names of a :class:`ClickManager`, updated incrementally.
+
+    The model applies the group events of the click manager (see :meth:`apply_event`):
+    an added group inserts one row, a renamed group changes one row and a removed group
+    removes one row.
+    The row of a group is found in O(1) with :meth:`row_of`.
+
+    Parameters
+    ----------
+    parent : QObject, optional
+        Parent object.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Click manager events
+    # ------------------------------------------------------------------
+    def apply_event(self, event: dict) -> None:
+        r"""
+        Apply a group event of :meth:`ClickManager.add_listener` (other events are ignored).
+
+        Parameters
+        ----------
+        event : dict
+            The event.
+        """
+        kind = event["type"]
+        if kind == "group_added":
+            self.insert_group(event["group"])
+        elif kind == "group_removed":
+            self.remove_group(event["group"])
+        elif kind == "group_renamed":
+            self.rename_group(event["old"], event["new"])
+
+    # ------------------------------------------------------------------
+    # Qt model
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.DisplayRole):
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole) and index.isValid():
+            return self._names[index.row()]
+        return None
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+    def set_groups(self, names: Iterable[str]) -> None:
+        r"""
+        Replace all the rows.
+        """
+        self.beginResetModel()
+        self._names = list(names)
+        self._rows = {name: i for i, name in enumerate(self._names)}
+        self.endResetModel()
+
+    def insert_group(self, name: str) -> None:
+        r"""
+        Append a group at the end of the list.
+        """
+        if name in self._rows:
+            return
+        row = len(self._names)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._names.append(name)
+        self._rows[name] = row
+        self.endInsertRows()
+
+    def remove_group(self, name: str) -> None:
+        r"""
+        Remove the row of a group.
+        """
+        row = self._rows.pop(name, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self._names[row]
+        for following in self._names[row:]:
+            self._rows[following] -= 1
+        self.endRemoveRows()
+
+    def rename_group(self, old_name: str, new_name: str) -> None:
+        r"""
+        Rename the row of a group in place.
+        """
+        row = self._rows.pop(old_name, None)
+        if row is None:
+            return
+        self._names[row] = new_name
+        self._rows[new_name] = row
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def row_of(self, name: str) -> int:
+        r"""
+        Row of a group, or -1 if the group is unknown.
+        """
+        return self._rows.get(name, -1)
+
+    def name_at(self, row: int) -> str:
+        r"""
+        Name of the group at a row.
+        """
+        return self._names[row]
+
+
+class GroupSelector(QtWidgets.QWidget):
+    r"""
+    Searchable group list (filter field + list view) for sessions with thousands of groups.
+
+    The API follows ``QComboBox`` (``currentTextChanged``, ``setCurrentText``,
+    ``currentIndex``, ``setCurrentIndex``, ``count``) with indices in the visible (filtered) rows.
+    Selecting a group costs O(1) regardless of the number of groups.
+
+    Parameters
+    ----------
+    parent : QWidget, optional
+        Parent widget.
+    """
+
+    currentTextChanged = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.group_model = GroupListModel(self)
+
+        self.proxy = QtCore.QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.group_model)
+        self.proxy.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+
+        self.filter_edit = QtWidgets.QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter groups...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self.set_filter)
+        self.filter_edit.returnPressed.connect(self._on_filter_return)
+
+        self.view = QtWidgets.QListView()
+        self.view.setModel(self.proxy)
+        self.view.setUniformItemSizes(True)
+        self.view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.view.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.view.setMaximumHeight(140)
+        self.view.selectionModel().currentChanged.connect(self._on_current_changed)
+
+        # Removed or filtered rows move the view's current index: it is not a user selection
+        self._syncing = False
+        self._click_manager: Optional[ClickManager] = None
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.filter_edit)
+        layout.addWidget(self.view)
+
+        self._current = ""
+
+    # ------------------------------------------------------------------
+    # QComboBox-like API
+    # ------------------------------------------------------------------
+    def count(self) -> int:
+        r"""
+        Number of visible groups.
+        """
+        return self.proxy.rowCount()
+
+    def currentText(self) -> str:
+        r"""
+        Name of the selected group.
+        """
+        return self._current
+
+    def setCurrentText(self, name: str) -> None:
+        r"""
+        Select a group by name (O(1)).
+        """
+        row = self.group_model.row_of(name)
+        if row < 0:
+            return
+        index = self.proxy.mapFromSource(self.group_model.index(row))
+        if index.isValid():
+            self.view.selectionModel().setCurrentIndex(
+                index, QtCore.QItemSelectionModel.ClearAndSelect
+            )
+            self.view.scrollTo(index)
+        else:
+            # Hidden by the filter: keep it as current without a visible selection
+            self.view.selectionModel().clearCurrentIndex()
+        self._set_current(name)
+
+    def currentIndex(self) -> int:
+        r"""
+        Visible row of the selected group, or -1.
+        """
+        return self.view.currentIndex().row()
+
+    def setCurrentIndex(self, row: int) -> None:
+        r"""
+        Select the group at a visible row.
+        """
+        index = self.proxy.index(row, 0)
+        if index.isValid():
+            self.setCurrentText(index.data())
+
+    # ------------------------------------------------------------------
+    # Navigation and filter
+    # ------------------------------------------------------------------
+    def select_next(self) -> None:
+        r"""
+        Select the next visible group (wraps around).
+        """
+        self._step(+1)
+
+    def select_previous(self) -> None:
+        r"""
+        Select the previous visible group (wraps around).
+        """
+        self._step(-1)
+
+    def _step(self, step: int) -> None:
+        count = self.count()
+        if count == 0:
+            return
+        row = self.currentIndex()
+        if row < 0:
+            row = 0 if step > 0 else count - 1
+        else:
+            row = (row + step) % count
+        self.setCurrentIndex(row)
+
+    def set_filter(self, text: str) -> None:
+        r"""
+        Show only the groups containing ``text`` (case insensitive).
+        """
+        self._syncing = True
+        try:
+            self.proxy.setFilterFixedString(text)
+        finally:
+            self._syncing = False
+        if self._current:
+            self.setCurrentText(self._current)
+
+    def _on_filter_return(self) -> None:
+        if self.count() > 0 and self.currentIndex() < 0:
+            self.setCurrentIndex(0)
+        self.view.setFocus()
+
+    def _on_current_changed(self, current: QtCore.QModelIndex, previous) -> None:
+        if current.isValid() and not self._syncing:
+            self._set_current(current.data())
+
+    def _set_current(self, name: str) -> None:
+        if name == self._current:
+            return
+        self._current = name
+        self.currentTextChanged.emit(name)
+
+    # ------------------------------------------------------------------
+    # Click manager
+    # ------------------------------------------------------------------
+    def attach(self, click_manager: ClickManager) -> None:
+        r"""
+        Follow the groups of a click manager and select its current group (without signal).
+
+        Parameters
+        ----------
+        click_manager : ClickManager
+            The click manager.
+        """
+        if self._click_manager is not None:
+            self._click_manager.remove_listener(self._on_event)
+        self._click_manager = click_manager
+        self.group_model.set_groups(click_manager.groups)
+        click_manager.add_listener(self._on_event)
+
+        blocked = self.blockSignals(True)
+        self._current = ""
+        self.setCurrentText(click_manager.current_group)
+        self.blockSignals(blocked)
+
+    def _on_event(self, event: dict) -> None:
+        self._syncing = True
+        try:
+            self.group_model.apply_event(event)
+        finally:
+            self._syncing = False
@@ -0,0 +1,516 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from PyQt5 import QtWidgets, QtCore, QtGui
+from PyQt5.QtTest import QTest
+
+from .click_image_app import ClickImageApp
+
+SESSION_VERSION = 1
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    r"""
+    Summarize latency samples.
+
+    Parameters
+    ----------
+    samples : Sequence[float]
+        Latencies in milliseconds.
+
+    Returns
+    -------
+    Dict[str, float]
+        Number of samples, p50, p90, p99 and max latency (ms).
+    """
+    if len(samples) == 0:
+        return {"n": 0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+
+    values = np.asarray(samples, dtype=np.float64)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "n": int(values.size),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
+
+
+class _DialogResponder(QtCore.QObject):
+    r"""
+    Answer the modal message boxes opened by the application.
+
+    The application asks for confirmation (half-shift toggle, group deletion, ...)
+    with ``QMessageBox.exec_``. Without an answer the harness would block forever,
+    so a zero-interval timer polls for the active modal widget and presses the
+    requested button.
+    """
+
+    def __init__(self, button=QtWidgets.QMessageBox.Yes, parent=None):
+        super().__init__(parent)
+        self.button = button
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._answer)
+
+    def __enter__(self):
+        self._timer.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._timer.stop()
+        return False
+
+    def _answer(self):
+        widget = QtWidgets.QApplication.activeModalWidget()
+        if isinstance(widget, QtWidgets.QMessageBox):
+            button = widget.button(self.button)
+            if button is not None:
+                button.click()
+            else:
+                widget.reject()
+
+
+class SessionRecorder(QtCore.QObject):
+    r"""
+    Record the interactions of a user with a :class:`ClickImageApp`.
+
+    The recorder listens to the viewer mouse events and to the widgets driving the
+    update pipeline (contrast sliders, group selector, half-shift checkbox).
+    Clicks are stored with their viewport position and the view transform at the
+    time of the click, so that a replay produces exactly the same scene coordinates.
+    The image shape is stored when the recording starts, and an ``image`` event records
+    the new shape when another image (or frame) of a different shape is displayed.
+
+    Parameters
+    ----------
+    app : ClickImageApp
+        The application to record.
+    """
+
+    def __init__(self, app: ClickImageApp):
+        super().__init__(app)
+        self.app = app
+        self.events: List[dict] = []
+        self.image_shape = list(app.image.shape)
+        self._shape = self.image_shape
+        self._t0 = time.perf_counter()
+        self._press_pos: Optional[QtCore.QPoint] = None
+
+        app.viewer.viewport().installEventFilter(self)
+
+        for name in ("alpha_slider", "beta_slider", "min_slider", "max_slider"):
+            getattr(app, name).valueChanged.connect(
+                lambda value, name=name: self._record(
+                    "slider", slider=name, value=int(value)
+                )
+            )
+        app.group_selector.currentTextChanged.connect(
+            lambda name: self._record("group", group=name)
+        )
+        app.half_shift_checkbox.stateChanged.connect(
+            lambda state: self._record(
+                "half_shift", checked=bool(state == QtCore.Qt.Checked)
+            )
+        )
+
+    def _record(self, kind: str, **data) -> None:
+        shape = list(self.app.image.shape)
+        if shape != self._shape:
+            # Image loaded since the previous event: the next events apply to this canvas
+            self._shape = shape
+            self.events.append({"t": time.perf_counter() - self._t0, "kind": "image", "shape": shape})
+        event = {"t": time.perf_counter() - self._t0, "kind": kind}
+        event.update(data)
+        self.events.append(event)
+
+    def eventFilter(self, obj, event) -> bool:
+        r"""
+        Record valid clicks (press and release at the same place) on the viewport.
+        """
+        if event.type() == QtCore.QEvent.MouseButtonPress:
+            self._press_pos = event.pos()
+        elif event.type() == QtCore.QEvent.MouseButtonRelease:
+            if (
+                self._press_pos is not None
+                and (event.pos() - self._press_pos).manhattanLength() <= 2
+            ):
+                viewer = self.app.viewer
+                t = viewer.transform()
+                self._record(
+                    "click",
+                    button="right" if event.button() == QtCore.Qt.RightButton else "left",
+                    pos=[event.pos().x(), event.pos().y()],
+                    transform=[
+                        t.m11(), t.m12(), t.m13(),
+                        t.m21(), t.m22(), t.m23(),
+                        t.m31(), t.m32(), t.m33(),
+                    ],
+                    scroll=[
+                        viewer.horizontalScrollBar().value(),
+                        viewer.verticalScrollBar().value(),
+                    ],
+                )
+            self._press_pos = None
+        return False
+
+    def save(self, path: str) -> None:
+        r"""
+        Save the recorded session to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            Output file path.
+        """
+        session = {
+            "version": SESSION_VERSION,
+            "image_shape": self.image_shape,
+            "events": self.events,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(session, f)
+
+    @staticmethod
+    def load(path: str) -> dict:
+        r"""
+        Load a recorded session.
+
+        Parameters
+        ----------
+        path : str
+            Path to the JSON session file.
+
+        Returns
+        -------
+        dict
+            The session with keys ``version``, ``image_shape`` (when the recording started)
+            and ``events``.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            session = json.load(f)
+        if session.get("version") != SESSION_VERSION:
+            raise ValueError(f"Unsupported session version: {session.get('version')}")
+        return session
+
+
+class LatencyHarness:
+    r"""
+    Drive a :class:`ClickImageApp` with synthetic events and measure latencies.
+
+    Each event is sent through ``QTest`` (or through the real widget for sliders and
+    selectors) and the viewport is repainted synchronously, so that the measured
+    latency covers the whole pipeline from the input event to the painted frame.
+
+    Parameters
+    ----------
+    app : ClickImageApp
+        The application to drive. It must be shown.
+    seed : int
+        Seed of the random generator used for the synthetic events.
+        Default is 0.
+    """
+
+    def __init__(self, app: ClickImageApp, seed: int = 0):
+        self.app = app
+        self.rng = np.random.default_rng(seed)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _measure(self, kind: str, action) -> None:
+        viewport = self.app.viewer.viewport()
+        t0 = time.perf_counter()
+        action()
+        viewport.repaint()
+        self.latencies[kind].append((time.perf_counter() - t0) * 1e3)
+
+    def _click_at(self, pos: QtCore.QPoint, button=QtCore.Qt.LeftButton) -> None:
+        QTest.mouseClick(self.app.viewer.viewport(), button, QtCore.Qt.NoModifier, pos)
+
+    def _random_image_pos(self) -> QtCore.QPoint:
+        viewer = self.app.viewer
+        rect = viewer.mapFromScene(viewer.sceneRect()).boundingRect()
+        rect = rect.intersected(viewer.viewport().rect()).adjusted(1, 1, -1, -1)
+        x = int(self.rng.integers(rect.left(), max(rect.left() + 1, rect.right())))
+        y = int(self.rng.integers(rect.top(), max(rect.top() + 1, rect.bottom())))
+        return QtCore.QPoint(x, y)
+
+    # ------------------------------------------------------------------
+    # Synthetic scenarios
+    # ------------------------------------------------------------------
+    def click_storm(self, n: int) -> None:
+        r"""
+        Send ``n`` left clicks at random positions on the image.
+        """
+        for _ in range(n):
+            pos = self._random_image_pos()
+            self._measure("click_to_marker", lambda: self._click_at(pos))
+
+    def slider_drag(self, n: int, slider: str = "alpha_slider") -> None:
+        r"""
+        Drag a contrast slider through ``n`` successive values.
+        """
+        widget = getattr(self.app, slider)
+        values = np.linspace(widget.minimum(), widget.maximum(), n).astype(int)
+        for value in values:
+            self._measure("slider_to_repaint", lambda: widget.setValue(int(value)))
+
+    def group_switches(self, n: int) -> None:
+        r"""
+        Switch ``n`` times between the existing groups.
+        """
+        selector = self.app.group_selector
+        count = selector.count()
+        if count < 2:
+            return
+        for i in range(n):
+            self._measure(
+                "group_switch",
+                lambda: selector.setCurrentIndex((selector.currentIndex() + 1) % count),
+            )
+
+    def half_shift_toggles(self, n: int) -> None:
+        r"""
+        Toggle the half-shift checkbox ``n`` times, accepting the shift of the points.
+        """
+        checkbox = self.app.half_shift_checkbox
+        with _DialogResponder(QtWidgets.QMessageBox.Yes):
+            for _ in range(n):
+                self._measure(
+                    "half_shift_toggle", lambda: checkbox.setChecked(not checkbox.isChecked())
+                )
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+    def replay(self, session: dict, realtime: bool = False) -> None:
+        r"""
+        Replay a recorded session deterministically.
+
+        The view transform and scroll positions of each recorded click are restored
+        before the mouse event is sent, so the clicks land on the same scene coordinates.
+        An ``image`` event displays a random image of the recorded shape.
+
+        Parameters
+        ----------
+        session : dict
+            Session loaded with :meth:`SessionRecorder.load`.
+        realtime : bool
+            If True, wait between the events to respect the recorded timing.
+            Default is False.
+        """
+        app = self.app
+        viewer = app.viewer
+        t_start = time.perf_counter()
+
+        with _DialogResponder(QtWidgets.QMessageBox.Yes):
+            for event in session["events"]:
+                if realtime:
+                    delay = event["t"] - (time.perf_counter() - t_start)
+                    if delay > 0:
+                        QTest.qWait(int(delay * 1e3))
+
+                kind = event["kind"]
+                if kind == "click":
+                    viewer.setTransform(QtGui.QTransform(*event["transform"]))
+                    viewer.horizontalScrollBar().setValue(event["scroll"][0])
+                    viewer.verticalScrollBar().setValue(event["scroll"][1])
+                    button = (
+                        QtCore.Qt.RightButton
+                        if event["button"] == "right"
+                        else QtCore.Qt.LeftButton
+                    )
+                    pos = QtCore.QPoint(*event["pos"])
+                    self._measure(
+                        "click_to_marker", lambda: self._click_at(pos, button)
+                    )
+                elif kind == "slider":
+                    widget = getattr(app, event["slider"])
+                    self._measure(
+                        "slider_to_repaint", lambda: widget.setValue(event["value"])
+                    )
+                elif kind == "group":
+                    app.click_manager.add_group(event["group"])
+                    app.update_groups()
+                    self._measure(
+                        "group_switch",
+                        lambda: app.group_selector.setCurrentText(event["group"]),
+                    )
+                elif kind == "half_shift":
+                    self._measure(
+                        "half_shift_toggle",
+                        lambda: app.half_shift_checkbox.setChecked(event["checked"]),
+                    )
+                elif kind == "image":
+                    h, w = event["shape"][:2]
+                    app.set_image(self.rng.integers(0, 256, (h, w, 3), dtype=np.uint8))
+                    app.update()
+                    QtWidgets.QApplication.processEvents()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        r"""
+        Return the latency percentiles for each kind of event.
+        """
+        return {kind: percentiles(v) for kind, v in self.latencies.items()}
+
+
+def _make_app(image_size: int, n_points: int, n_groups: int, seed: int) -> ClickImageApp:
+    rng = np.random.default_rng(seed)
+    image = rng.integers(0, 256, (image_size, image_size, 3), dtype=np.uint8)
+
+    app = ClickImageApp(image)
+    app._is_saved = True
+    app.resize(1280, 800)
+    app.show()
+    QtWidgets.QApplication.processEvents()
+
+    for g in range(1, n_groups):
+        app.click_manager.add_group(f"group_{g}")
+    app.click_manager.add_clicks(rng.uniform(0, image_size - 1, (n_points, 2)))
+    app.update()
+    QtWidgets.QApplication.processEvents()
+    return app
+
+
+def run_benchmark(
+    image_sizes: Sequence[int] = (512, 2048),
+    n_points: Sequence[int] = (0, 1000, 10000),
+    n_events: int = 50,
+    seed: int = 0,
+) -> List[dict]:
+    r"""
+    Measure the GUI latencies as the image size and the number of points grow.
+
+    A QApplication must exist (use ``QT_QPA_PLATFORM=offscreen`` on headless machines).
+
+    Parameters
+    ----------
+    image_sizes : Sequence[int]
+        Side length of the square test images.
+    n_points : Sequence[int]
+        Number of points already present in the current group.
+    n_events : int
+        Number of events sent for each scenario.
+    seed : int
+        Seed for the images, points and event positions.
+
+    Returns
+    -------
+    List[dict]
+        One entry per configuration with the keys ``image_size``, ``n_points``
+        and ``latencies`` (see :meth:`LatencyHarness.report`).
+    """
+    results = []
+    for size in image_sizes:
+        for n in n_points:
+            app = _make_app(size, n, n_groups=4, seed=seed)
+            harness = LatencyHarness(app, seed=seed)
+            harness.click_storm(n_events)
+            harness.slider_drag(n_events)
+            harness.group_switches(n_events)
+            harness.half_shift_toggles(max(1, n_events // 10))
+            results.append(
+                {"image_size": size, "n_points": n, "latencies": harness.report()}
+            )
+            app._is_saved = True
+            app.close()
+            app.deleteLater()
+            QtWidgets.QApplication.processEvents()
+    return results
+
+
+def _print_report(results: List[dict]) -> None:
+    print(
+        f"{'size':>6} {'points':>7} {'event':<18} {'n':>5} "
+        f"{'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  (ms)"
+    )
+    for result in results:
+        for kind, stats in sorted(result["latencies"].items()):
+            print(
+                f"{result['image_size']:>6} {result['n_points']:>7} {kind:<18} "
+                f"{stats['n']:>5} {stats['p50']:>9.2f} {stats['p90']:>9.2f} "
+                f"{stats['p99']:>9.2f} {stats['max']:>9.2f}"
+            )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    r"""
+    Command line entry point of the latency harness.
+
+    .. code-block:: console
+
+        python -m pyclickimage.harness --sizes 512 4096 --points 0 10000
+        python -m pyclickimage.harness --replay session.json --realtime
+
+    """
+    parser = argparse.ArgumentParser(description="PyClickImage GUI latency harness.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[512, 2048])
+    parser.add_argument("--points", type=int, nargs="+", default=[0, 1000, 10000])
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--replay", type=str, help="Replay a recorded session instead of the synthetic scenarios."
+    )
+    parser.add_argument(
+        "--realtime", action="store_true", help="Respect the recorded timing during replay."
+    )
+    parser.add_argument("--json", type=str, help="Write the results to a JSON file.")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    qapp = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    if args.replay is not None:
+        session = SessionRecorder.load(args.replay)
+        h, w = session["image_shape"][:2]
+        rng = np.random.default_rng(args.seed)
+        app = ClickImageApp(rng.integers(0, 256, (h, w, 3), dtype=np.uint8))
+        app._is_saved = True
+        app.resize(1280, 800)
+        app.show()
+        qapp.processEvents()
+        harness = LatencyHarness(app, seed=args.seed)
+        harness.replay(session, realtime=args.realtime)
+        results = [
+            {"image_size": max(h, w), "n_points": app.click_manager.n_clicks, "latencies": harness.report()}
+        ]
+        app._is_saved = True
+        app.close()
+    else:
+        results = run_benchmark(args.sizes, args.points, args.events, args.seed)
+
+    _print_report(results)
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,511 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import math
+import time
+import shutil
+import hashlib
+import threading
+from concurrent.futures import CancelledError
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from .batch import read_header_size
+from .memory import MemoryBudgetError, format_bytes
+from .tracing import span
+
+CACHE_DIR_ENV_VAR = "PYCLICKIMAGE_CACHE_DIR"
+CACHE_SIZE_ENV_VAR = "PYCLICKIMAGE_CACHE_SIZE"
+
+DEFAULT_CACHE_SIZE = 4 * 1024**3
+
+_SAMPLE_SIZE = 64 * 1024
+
+# Reduced decodes of the progressive loading, by reduction factor
+_REDUCED_FLAGS = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+}
+
+
+# =========================================================
+# PYRAMID
+# =========================================================
+
+
+def build_pyramid(image: np.ndarray, min_side: int = 512) -> List[np.ndarray]:
+    r"""
+    Build the display pyramid of an image: the image, then halved levels down to ``min_side``.
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        Full resolution image.
+    min_side : int
+        The last level is the first one with its largest side at most ``min_side``.
+        Default is 512.
+
+    Returns
+    -------
+    List[numpy.ndarray]
+        Levels by decreasing resolution (level ``k`` is about ``2**k`` times smaller).
+    """
+    levels = [image]
+    while max(levels[-1].shape[:2]) > min_side:
+        h, w = levels[-1].shape[:2]
+        levels.append(
+            cv2.resize(
+                levels[-1], ((w + 1) // 2, (h + 1) // 2), interpolation=cv2.INTER_AREA
+            )
+        )
+    return levels
+
+
+def level_for_zoom(zoom: float, n_levels: int) -> int:
+    r"""
+    Coarsest pyramid level with at least one level pixel per screen pixel.
+
+    Parameters
+    ----------
+    zoom : float
+        Screen pixels per image pixel.
+    n_levels : int
+        Number of levels of the pyramid.
+
+    Returns
+    -------
+    int
+        Level index in ``[0, n_levels - 1]``.
+    """
+    if zoom <= 0 or n_levels <= 1:
+        return 0
+    return max(0, min(n_levels - 1, int(math.floor(math.log2(1.0 / zoom)))))
+
+
+def thumbnail(image: np.ndarray, size: int = 256) -> np.ndarray:
+    r"""
+    Downsample an image so that its largest side is at most ``size``.
+    """
+    h, w = image.shape[:2]
+    factor = size / max(h, w)
+    if factor >= 1:
+        return image
+    return cv2.resize(
+        image,
+        (max(1, round(w * factor)), max(1, round(h * factor))),
+        interpolation=cv2.INTER_AREA,
+    )
+
+
+# =========================================================
+# CACHE
+# =========================================================
+
+
+def default_cache_dir() -> str:
+    r"""
+    Cache directory: ``PYCLICKIMAGE_CACHE_DIR``, or ``pyclickimage`` in the user cache directory.
+    """
+    path = os.environ.get(CACHE_DIR_ENV_VAR)
+    if path:
+        return path
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "pyclickimage")
+
+
+def file_fingerprint(path: str, flags: int = cv2.IMREAD_COLOR) -> str:
+    r"""
+    Fast content fingerprint of an image file.
+
+    The file size, its modification time and four 64 KiB samples (start, end and two inner
+    positions) are hashed with BLAKE2b, so the cost does not depend on the file size.
+    The modification time catches the rewrites of the same size changing unsampled bytes
+    (e.g. pixels of an uncompressed TIFF or BMP). The decoding flags are part of the key
+    since they change the decoded pixels.
+
+    Parameters
+    ----------
+    path : str
+        Image file path.
+    flags : int
+        ``cv2.imread`` flags.
+        Default is ``cv2.IMREAD_COLOR``.
+
+    Returns
+    -------
+    str
+        Hexadecimal key.
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{size}:{stat.st_mtime_ns}:{flags}".encode())
+    with open(path, "rb") as f:
+        if size <= 4 * _SAMPLE_SIZE:
+            digest.update(f.read())
+        else:
+            for offset in (0, size // 3, 2 * size // 3, size - _SAMPLE_SIZE):
+                f.seek(offset)
+                digest.update(f.read(_SAMPLE_SIZE))
+    return digest.hexdigest()
+
+
+class ImageCache:
+    r"""
+    Content-addressed disk cache of decoded image pyramids and thumbnails.
+
+    Each entry is a directory named after :func:`file_fingerprint`, with one uncompressed
+    ``.npy`` file per pyramid level (memory mapped when loaded, so a cached image is usable
+    before it is read from disk), a ``thumbnail.png`` and a ``meta.json``.
+    The modification time of the entry directory records its last use: when the total size
+    exceeds ``max_bytes``, the least recently used entries are deleted.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Cache directory. If None, uses :func:`default_cache_dir`.
+    max_bytes : int, optional
+        Size cap of the cache. If None, uses ``PYCLICKIMAGE_CACHE_SIZE`` (bytes) or 4 GiB.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None) -> None:
+        self.directory = directory or default_cache_dir()
+        if max_bytes is None:
+            max_bytes = int(os.environ.get(CACHE_SIZE_ENV_VAR, DEFAULT_CACHE_SIZE))
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def load(self, path: str, flags: int = cv2.IMREAD_COLOR) -> Optional[List[np.ndarray]]:
+        r"""
+        Return the cached pyramid of an image file (memory-mapped, read-only), or None.
+
+        Parameters
+        ----------
+        path : str
+            Image file path.
+        flags : int
+            ``cv2.imread`` flags.
+            Default is ``cv2.IMREAD_COLOR``.
+        """
+        entry = self._entry(file_fingerprint(path, flags))
+        try:
+            with open(os.path.join(entry, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            levels = [
+                np.load(os.path.join(entry, f"level_{k}.npy"), mmap_mode="r")
+                for k in range(meta["levels"])
+            ]
+        except (OSError, ValueError, KeyError):
+            return None
+        os.utime(entry)
+        return levels
+
+    def load_thumbnail(self, path: str, flags: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+        r"""
+        Return the cached thumbnail of an image file, or None.
+        """
+        entry = self._entry(file_fingerprint(path, flags))
+        image = cv2.imread(os.path.join(entry, "thumbnail.png"), cv2.IMREAD_UNCHANGED)
+        if image is not None:
+            os.utime(entry)
+        return image
+
+    def store(self, path: str, levels: List[np.ndarray], flags: int = cv2.IMREAD_COLOR) -> None:
+        r"""
+        Store the pyramid of an image file, then evict the least recently used entries.
+
+        The entry is written in a temporary directory and renamed, so a concurrent
+        :meth:`load` never sees a partial entry.
+
+        Parameters
+        ----------
+        path : str
+            Image file path.
+        levels : List[numpy.ndarray]
+            Pyramid (see :func:`build_pyramid`).
+        flags : int
+            ``cv2.imread`` flags used to decode the image.
+            Default is ``cv2.IMREAD_COLOR``.
+        """
+        key = file_fingerprint(path, flags)
+        entry = self._entry(key)
+        if os.path.isdir(entry):
+            os.utime(entry)
+            return
+
+        nbytes = sum(level.nbytes for level in levels)
+        if nbytes > self.max_bytes:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{entry}.tmp{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        try:
+            with span("ImageCache.store", "io", {"path": path}):
+                for k, level in enumerate(levels):
+                    np.save(os.path.join(tmp, f"level_{k}.npy"), np.ascontiguousarray(level))
+                cv2.imwrite(os.path.join(tmp, "thumbnail.png"), thumbnail(levels[-1]))
+                with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                    json.dump(
+                        {
+                            "source": os.path.abspath(path),
+                            "shape": list(levels[0].shape),
+                            "dtype": str(levels[0].dtype),
+                            "levels": len(levels),
+                            "bytes": nbytes,
+                        },
+                        f,
+                    )
+            os.replace(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        self.evict()
+
+    def entries(self) -> List[dict]:
+        r"""
+        Cached entries (``key``, ``bytes``, ``last_used``) from the least to the most recently used.
+        """
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for key in os.listdir(self.directory):
+            entry = self._entry(key)
+            try:
+                with open(os.path.join(entry, "meta.json"), "r", encoding="utf-8") as f:
+                    nbytes = json.load(f)["bytes"]
+                last_used = os.path.getmtime(entry)
+            except (OSError, ValueError, KeyError):
+                # Partial entry of an interrupted store: removed once it is old enough
+                if ".tmp" in key and time.time() - os.path.getmtime(entry) > 3600:
+                    shutil.rmtree(entry, ignore_errors=True)
+                continue
+            entries.append({"key": key, "bytes": nbytes, "last_used": last_used})
+        entries.sort(key=lambda e: e["last_used"])
+        return entries
+
+    @property
+    def nbytes(self) -> int:
+        r"""
+        Total size of the cached entries.
+        """
+        return sum(e["bytes"] for e in self.entries())
+
+    def evict(self) -> int:
+        r"""
+        Delete the least recently used entries until the cache fits in ``max_bytes``.
+
+        Returns
+        -------
+        int
+            Number of deleted entries.
+        """
+        entries = self.entries()
+        total = sum(e["bytes"] for e in entries)
+        removed = 0
+        for e in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._entry(e["key"]), ignore_errors=True)
+            total -= e["bytes"]
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        r"""
+        Delete all the entries.
+        """
+        for e in self.entries():
+            shutil.rmtree(self._entry(e["key"]), ignore_errors=True)
+
+
+def read_image_levels(
+    path: str,
+    cache: Optional[ImageCache] = None,
+    flags: int = cv2.IMREAD_COLOR,
+    min_side: int = 512,
+) -> Optional[List[np.ndarray]]:
+    r"""
+    Read the display pyramid of an image file, from the cache when possible.
+
+    On a cache miss, the image is decoded with ``cv2.imread``, its pyramid is built and stored.
+
+    Parameters
+    ----------
+    path : str
+        Image file path.
+    cache : ImageCache, optional
+        Disk cache. If None, the image is always decoded.
+    flags : int
+        ``cv2.imread`` flags.
+        Default is ``cv2.IMREAD_COLOR``.
+    min_side : int
+        Largest side of the coarsest level.
+        Default is 512.
+
+    Returns
+    -------
+    Optional[List[numpy.ndarray]]
+        Levels by decreasing resolution, or None if the file cannot be decoded.
+    """
+    if cache is not None:
+        with span("ImageCache.load", "io", {"path": path}):
+            levels = cache.load(path, flags)
+        if levels is not None:
+            return levels
+
+    with span("cv2.imread", "io", {"path": path}):
+        image = cv2.imread(path, flags)
+    if image is None:
+        return None
+
+    levels = build_pyramid(image, min_side)
+    if cache is not None:
+        try:
+            cache.store(path, levels, flags)
+        except OSError:
+            pass
+    return levels
+
+
+def load_image_levels(
+    path: str,
+    cache: Optional[ImageCache] = None,
+    min_side: int = 512,
+    preview_side: int = 1024,
+    preview: Optional[Callable[[np.ndarray, Tuple[int, int]], None]] = None,
+    max_bytes: Optional[int] = None,
+    cancel_event: Optional[threading.Event] = None,
+    progress: Optional[Callable[[float], None]] = None,
+    flags: int = cv2.IMREAD_COLOR,
+) -> List[np.ndarray]:
+    r"""
+    Progressive version of :func:`read_image_levels`, meant for a worker thread.
+
+    On a cache miss of a large JPEG, a reduced decode (``cv2.IMREAD_REDUCED_COLOR_8``, ``_4``
+    or ``_2``, decoded at the reduced size by libjpeg) is reported to ``preview`` first,
+    with the full resolution size read from the header. Then the image is fully decoded,
+    its pyramid is built and stored in the cache. Other formats have no fast reduced decode:
+    they are only decoded at full resolution.
+
+    The decoding itself cannot be interrupted: ``cancel_event`` is checked between the stages.
+
+    Parameters
+    ----------
+    path : str
+        Image file path.
+    cache : ImageCache, optional
+        Disk cache. If None, the image is always decoded.
+    min_side : int
+        Largest side of the coarsest level.
+        Default is 512.
+    preview_side : int
+        Minimal largest side of the preview: the largest reduction factor keeping it is used.
+        Default is 1024.
+    preview : Callable[[numpy.ndarray, Tuple[int, int]], None], optional
+        Called with the preview image and the (width, height) of the full resolution image.
+    max_bytes : int, optional
+        Memory allowed for a decoded image and its pyramid (see :meth:`MemoryGovernor.allowance`).
+        Cached images are memory mapped and always allowed. If None, no limit.
+    cancel_event : threading.Event, optional
+        If set, ``concurrent.futures.CancelledError`` is raised at the next stage.
+    progress : Callable[[float], None], optional
+        Called with the fraction of completed stages.
+    flags : int
+        ``cv2.imread`` flags of the full resolution decode (e.g. ``cv2.IMREAD_UNCHANGED`` to keep
+        16-bit and float images). The preview is always an 8-bit BGR image.
+        Default is ``cv2.IMREAD_COLOR``.
+
+    Returns
+    -------
+    List[numpy.ndarray]
+        Levels by decreasing resolution.
+
+    Raises
+    ------
+    ValueError
+        If the file cannot be decoded.
+    MemoryBudgetError
+        If the size read from the header exceeds ``max_bytes`` (nothing is decoded).
+    """
+
+    def stage(fraction: float) -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            raise CancelledError()
+        if progress is not None:
+            progress(fraction)
+
+    if cache is not None:
+        with span("ImageCache.load", "io", {"path": path}):
+            levels = cache.load(path, flags)
+        if levels is not None:
+            stage(1.0)
+            return levels
+    stage(0.05)
+
+    size = read_header_size(path)
+    if max_bytes is not None and size is not None:
+        # BGR uint8 image and its pyramid (1/4 + 1/16 + ... < 1/3 of the image)
+        nbytes = size[0] * size[1] * 3 * 4 // 3
+        if nbytes > max_bytes:
+            raise MemoryBudgetError(
+                f"The image ({size[0]}x{size[1]}, {format_bytes(nbytes)} decoded) does not fit "
+                f"in the memory budget ({format_bytes(max_bytes)} available)."
+            )
+    ext = os.path.splitext(path)[1].lower()
+    if preview is not None and size is not None and ext in (".jpg", ".jpeg"):
+        width, height = size
+        factor = next((f for f in (8, 4, 2) if max(width, height) // f >= preview_side), None)
+        if factor is not None:
+            with span("cv2.imread reduced", "io", {"path": path, "factor": factor}):
+                small = cv2.imread(path, _REDUCED_FLAGS[factor])
+            if small is not None:
+                # EXIF orientation is applied by OpenCV: the header size may be transposed
+                if abs(small.shape[1] - math.ceil(width / factor)) > 1:
+                    width, height = height, width
+                stage(0.2)
+                preview(small, (width, height))
+
+    with span("cv2.imread", "io", {"path": path}):
+        image = cv2.imread(path, flags)
+    if image is None:
+        raise ValueError(f"Cannot read image '{path}'.")
+    stage(0.8)
+
+    levels = build_pyramid(image, min_side)
+    stage(0.9)
+
+    if cache is not None:
+        try:
+            cache.store(path, levels, flags)
+        except OSError:
+            pass
+    stage(1.0)
+    return levels
@@ -16,10 +16,23 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Union
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from .perf_hud import PerfStats, PerfHud, hud_enabled_from_env
+from .tracing import traced, current_tracer
+from .loupe import Loupe
+from .strokes import StrokeSimplifier
+
+Scale = Union[float, Tuple[float, float]]
+
+# Estimated size of a marker (two line items in the scene and their paint state)
+MARKER_NBYTES = 512
+
+# Estimated size of a path vertex (painter path element)
+PATH_VERTEX_NBYTES = 24
+
 
 class ImageViewer(QtWidgets.QGraphicsView):
     r"""
@@ -29,6 +42,9 @@ class ImageViewer(QtWidgets.QGraphicsView):
     - zoom with mouse wheel
     - precise click detection (drag-safe)
     - marker system for annotation
+    - freehand strokes: dragging with ``stroke_modifier`` held (Shift by default) samples the
+      cursor, simplified online (see :class:`StrokeSimplifier`) and drawn as one path item,
+      then ``stroke_signal`` sends the simplified points
 
     half-shift :
 
@@ -39,6 +55,8 @@ class ImageViewer(QtWidgets.QGraphicsView):
 
     left_click_signal = QtCore.pyqtSignal(float, float)
     right_click_signal = QtCore.pyqtSignal(float, float)
+    stroke_signal = QtCore.pyqtSignal(object)
+    zoom_changed_signal = QtCore.pyqtSignal(float)
 
     # ======================================================================
     # INIT
@@ -74,10 +92,20 @@ class ImageViewer(QtWidgets.QGraphicsView):
         self.setMouseTracking(True)
 
         # ------------------------------------------------------------------
-        # Crosshair (red guide lines)
+        # Crosshair (red guide lines, drawn in drawForeground)
         # ------------------------------------------------------------------
         self._crosshair_color = QtGui.QColor(255, 0, 0)
-        self._create_crosshair()
+        self._cursor_pos: Optional[QtCore.QPoint] = None
+        self._crosshair_pos: Optional[QtCore.QPoint] = None
+        self._crosshair_rects: List[QtCore.QRect] = []
+
+        # Mouse moves are coalesced to the display refresh rate
+        screen = QtGui.QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen is not None else 60.0
+        self._crosshair_timer = QtCore.QTimer(self)
+        self._crosshair_timer.setSingleShot(True)
+        self._crosshair_timer.setInterval(int(1000 / max(refresh_rate, 1.0)))
+        self._crosshair_timer.timeout.connect(self._flush_crosshair)
 
         # ------------------------------------------------------------------
         # Coordinate label
@@ -92,15 +120,38 @@ class ImageViewer(QtWidgets.QGraphicsView):
         self._coord_label.move(10, 10)
         self._coord_label.hide()
 
+        # ------------------------------------------------------------------
+        # Performance HUD (below the coordinate label)
+        # ------------------------------------------------------------------
+        self.perf = PerfStats()
+        self._perf_hud = PerfHud(self.perf, self)
+        self._perf_hud.move(10, 40)
+        self._perf_hud.set_enabled(hud_enabled_from_env())
+
+        # Magnifier (disabled by default, its source is set by the application)
+        self.loupe = Loupe(self)
+
         # ------------------------------------------------------------------
         # Markers storage
         # ------------------------------------------------------------------
         self._markers: List[
             Tuple[QtWidgets.QGraphicsLineItem, QtWidgets.QGraphicsLineItem]
         ] = []
+        self._paths: List[QtWidgets.QGraphicsPathItem] = []
+        self._path_vertices = 0
         self.auto_marker = True
         self.half_shift = bool(half_shift)
 
+        # ------------------------------------------------------------------
+        # Freehand stroke (modifier + drag, None to disable)
+        # ------------------------------------------------------------------
+        self.stroke_modifier: Optional[QtCore.Qt.KeyboardModifier] = QtCore.Qt.ShiftModifier
+        self.stroke_tolerance = 1.0
+        self.stroke_color = QtGui.QColor(0, 0, 255)
+        self._stroke: Optional[StrokeSimplifier] = None
+        self._stroke_path: Optional[QtGui.QPainterPath] = None
+        self._stroke_item: Optional[QtWidgets.QGraphicsPathItem] = None
+
     # ======================================================================
     # IMAGE LOADING
     # ======================================================================
@@ -121,14 +172,21 @@ class ImageViewer(QtWidgets.QGraphicsView):
         pixmap = QtGui.QPixmap(path)
         self.set_image(pixmap=pixmap)
 
-    def set_image(self, pixmap: QtGui.QPixmap):
+    @traced()
+    def set_image(self, pixmap: QtGui.QPixmap, scale: Scale = 1.0):
         r"""
         Set the displayed image in the viewer.
 
+        The pixmap can be a downsampled level of the image: with ``scale`` (image pixels per
+        pixmap pixel), the scene coordinates stay the full resolution image coordinates.
+
         Parameters
         ----------
         pixmap : QtGui.QPixmap
             Image already converted for Qt display.
+        scale : float or Tuple[float, float]
+            Scale of the pixmap (a factor, or the factors along x and y).
+            Default is 1.0.
         """
 
         if not hasattr(self, "_scene"):
@@ -137,18 +195,115 @@ class ImageViewer(QtWidgets.QGraphicsView):
 
         self._scene.clear()
 
+        self.perf.set_memory("pixmap", pixmap.width() * pixmap.height() * pixmap.depth() // 8)
         self._pixmap_item = QtWidgets.QGraphicsPixmapItem(pixmap)
+        self._set_pixmap_scale(scale)
         self._scene.addItem(self._pixmap_item)
-        self._create_crosshair()
 
-        self.setSceneRect(self._pixmap_item.boundingRect())
+        self.setSceneRect(self._pixmap_item.sceneBoundingRect())
 
         self.resetTransform()
         self.fitInView(self._pixmap_item, QtCore.Qt.KeepAspectRatio)
 
-        # IMPORTANT: reset markers if needed
+        # IMPORTANT: reset markers if needed (their items were deleted by clear)
         self._zoom = 0
         self._markers = []
+        self._paths = []
+        self._path_vertices = 0
+        # A stroke in progress is dropped with its item
+        self._stroke = None
+        self._stroke_path = None
+        self._stroke_item = None
+        self._schedule_crosshair()
+        self.zoom_changed_signal.emit(self.zoom)
+
+    @traced()
+    def replace_pixmap(self, pixmap: QtGui.QPixmap, scale: Scale = 1.0):
+        r"""
+        Replace the displayed pixmap of the same image (another pyramid level or another rendering),
+        keeping the view and the markers.
+
+        Parameters
+        ----------
+        pixmap : QtGui.QPixmap
+            Image already converted for Qt display.
+        scale : float or Tuple[float, float]
+            Scale of the pixmap (see :meth:`set_image`).
+            Default is 1.0.
+        """
+        if self._pixmap_item is None:
+            self.set_image(pixmap, scale)
+            return
+
+        self.perf.set_memory("pixmap", pixmap.width() * pixmap.height() * pixmap.depth() // 8)
+        self._pixmap_item.setPixmap(pixmap)
+        self._set_pixmap_scale(scale)
+
+    def _set_pixmap_scale(self, scale: Scale) -> None:
+        sx, sy = (scale, scale) if isinstance(scale, (int, float)) else scale
+        self._pixmap_item.setTransform(QtGui.QTransform.fromScale(sx, sy))
+        # Magnified levels are smoothed, the full resolution shows the pixels
+        self._pixmap_item.setTransformationMode(
+            QtCore.Qt.SmoothTransformation if sx > 1 or sy > 1 else QtCore.Qt.FastTransformation
+        )
+
+    @property
+    def zoom(self) -> float:
+        r"""
+        Screen pixels per image pixel.
+        """
+        return self.transform().m11()
+
+    @property
+    def pixmap_nbytes(self) -> int:
+        r"""
+        Bytes of the displayed pixmap.
+        """
+        if self._pixmap_item is None:
+            return 0
+        pixmap = self._pixmap_item.pixmap()
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    @property
+    def markers_nbytes(self) -> int:
+        r"""
+        Estimated bytes of the marker layer (markers and paths).
+        """
+        return len(self._markers) * MARKER_NBYTES + self._path_vertices * PATH_VERTEX_NBYTES
+
+    # ======================================================================
+    # PERFORMANCE HUD
+    # ======================================================================
+    def is_perf_hud_enabled(self) -> bool:
+        r"""
+        Return True if the performance HUD is displayed.
+        """
+        return self.perf.enabled
+
+    def set_perf_hud_enabled(self, enabled: bool) -> None:
+        r"""
+        Show or hide the performance HUD.
+
+        The HUD can also be enabled at startup with the ``PYCLICKIMAGE_HUD=1`` environment variable.
+
+        Parameters
+        ----------
+        enabled : bool
+            True to display the HUD and collect the timings.
+        """
+        self._perf_hud.set_enabled(enabled)
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        r"""
+        Paint the viewport, timing the paint when the HUD or the tracing is enabled.
+        """
+        if not self.perf.enabled and current_tracer() is None:
+            super().paintEvent(event)
+            return
+
+        with self.perf.stage("paint"):
+            super().paintEvent(event)
+        self.perf.frame()
 
     # ======================================================================
     # CROSSHAIR MANAGEMENT
@@ -161,34 +316,115 @@ class ImageViewer(QtWidgets.QGraphicsView):
 
     def set_crosshair_color(self, color):
         r"""
-        Set the crosshair color
+        Set the crosshair color (of the view and of the loupe)
         """
         self._crosshair_color = QtGui.QColor(color)
+        self.loupe.crosshair_color = QtGui.QColor(color)
 
-        pen = QtGui.QPen(self._crosshair_color)
-        pen.setWidthF(0)
+        for rect in self._crosshair_rects:
+            self.viewport().update(rect)
 
-        self._cross_h.setPen(pen)
-        self._cross_v.setPen(pen)
+    def _image_viewport_rect(self) -> QtCore.QRect:
+        r"""
+        Return the image rectangle in viewport coordinates (clipped to the viewport).
+        """
+        rect = self.mapFromScene(self._pixmap_item.sceneBoundingRect()).boundingRect()
+        return rect.intersected(self.viewport().rect())
 
-    def _create_crosshair(self):
+    def _compute_crosshair_rects(self, pos: QtCore.QPoint) -> List[QtCore.QRect]:
         r"""
-        Create the crosshair
+        Return the two thin viewport strips covered by a crosshair centered at ``pos``.
         """
-        pen = QtGui.QPen(self._crosshair_color)
-        pen.setWidthF(0)
+        rect = self._image_viewport_rect()
+        return [
+            QtCore.QRect(rect.left(), pos.y() - 1, rect.width(), 3),
+            QtCore.QRect(pos.x() - 1, rect.top(), 3, rect.height()),
+        ]
 
-        self._cross_h = QtWidgets.QGraphicsLineItem()
-        self._cross_v = QtWidgets.QGraphicsLineItem()
+    def _flush_crosshair(self) -> None:
+        r"""
+        Move the crosshair to the last cursor position.
 
-        self._cross_h.setPen(pen)
-        self._cross_v.setPen(pen)
+        Only the strips covered by the old and new crosshair are repainted,
+        and the coordinate label is updated at most once per displayed frame.
+        """
+        for rect in self._crosshair_rects:
+            self.viewport().update(rect)
+        self._crosshair_rects = []
+        self._crosshair_pos = None
+
+        if self._pixmap_item is None or self._cursor_pos is None:
+            self._coord_label.hide()
+            self.loupe.hide()
+            return
 
-        self._scene.addItem(self._cross_h)
-        self._scene.addItem(self._cross_v)
+        scene_pos = self.mapToScene(self._cursor_pos)
+        if not self._pixmap_item.sceneBoundingRect().contains(scene_pos):
+            self._coord_label.hide()
+            self.loupe.hide()
+            return
 
-        self._cross_h.hide()
-        self._cross_v.hide()
+        self._crosshair_pos = QtCore.QPoint(self._cursor_pos)
+        self._crosshair_rects = self._compute_crosshair_rects(self._crosshair_pos)
+        for rect in self._crosshair_rects:
+            self.viewport().update(rect)
+
+        x, y = scene_pos.x(), scene_pos.y()
+        if self.half_shift:
+            x = x - 0.5
+            y = y - 0.5
+
+        text = f"X={x:.3f}  Y={y:.3f}"
+        length_changed = len(text) != len(self._coord_label.text())
+        self._coord_label.setText(text)
+        if length_changed:
+            self._coord_label.adjustSize()
+        self._coord_label.show()
+
+        if self.loupe.enabled:
+            self.loupe.show_at(
+                scene_pos.x(),
+                scene_pos.y(),
+                self.viewport().mapTo(self, self._cursor_pos),
+            )
+
+    def _schedule_crosshair(self) -> None:
+        r"""
+        Request a crosshair update at the next display frame.
+        """
+        if not self._crosshair_timer.isActive():
+            self._crosshair_timer.start()
+
+    def drawForeground(self, painter: QtGui.QPainter, rect: QtCore.QRectF) -> None:
+        r"""
+        Draw the crosshair over the scene, in viewport coordinates.
+        """
+        super().drawForeground(painter, rect)
+
+        if self._crosshair_pos is None or self._pixmap_item is None:
+            return
+
+        image_rect = self._image_viewport_rect()
+        pos = self._crosshair_pos
+
+        painter.save()
+        painter.resetTransform()
+        pen = QtGui.QPen(self._crosshair_color)
+        pen.setWidth(0)
+        painter.setPen(pen)
+        painter.drawLine(image_rect.left(), pos.y(), image_rect.right(), pos.y())
+        painter.drawLine(pos.x(), image_rect.top(), pos.x(), image_rect.bottom())
+        painter.restore()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        r"""
+        Scroll the view and repaint the crosshair strips moved by the scroll.
+        """
+        super().scrollContentsBy(dx, dy)
+
+        for rect in self._crosshair_rects:
+            self.viewport().update(rect.translated(dx, dy))
+        self._schedule_crosshair()
 
     def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
         r"""
@@ -201,32 +437,20 @@ class ImageViewer(QtWidgets.QGraphicsView):
         """
         super().mouseMoveEvent(event)
 
-        if self._pixmap_item is None:
-            return
-
-        scene_pos = self.mapToScene(event.pos())
-        rect = self._pixmap_item.sceneBoundingRect()
-
-        if not rect.contains(scene_pos):
-            self._cross_h.hide()
-            self._cross_v.hide()
-            return
+        self._cursor_pos = event.pos()
+        self._schedule_crosshair()
 
-        self._cross_h.show()
-        self._cross_v.show()
+        if self._stroke is not None:
+            self._extend_stroke(self.mapToScene(event.pos()))
 
-        self._cross_h.setLine(rect.left(), scene_pos.y(), rect.right(), scene_pos.y())
-
-        self._cross_v.setLine(scene_pos.x(), rect.top(), scene_pos.x(), rect.bottom())
-
-        x, y = scene_pos.x(), scene_pos.y()
-        if self.half_shift:
-            x = x - 0.5
-            y = y - 0.5
+    def leaveEvent(self, event: QtCore.QEvent) -> None:
+        r"""
+        Hide the crosshair when the cursor leaves the viewer.
+        """
+        super().leaveEvent(event)
 
-        self._coord_label.show()
-        self._coord_label.setText(f"X={x:.3f}  Y={y:.3f}")
-        self._coord_label.adjustSize()
+        self._cursor_pos = None
+        self._schedule_crosshair()
 
     # ======================================================================
     # ZOOM
@@ -257,6 +481,9 @@ class ImageViewer(QtWidgets.QGraphicsView):
             self.scale(1.0 / factor, 1.0 / factor)
             self._zoom -= 1
 
+        self._schedule_crosshair()
+        self.zoom_changed_signal.emit(self.zoom)
+
     def reset_view(self) -> None:
         r"""
         Reset the view to the initial state (no zoom, centered image).
@@ -283,6 +510,9 @@ class ImageViewer(QtWidgets.QGraphicsView):
         self.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
         self.setResizeAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
 
+        self._schedule_crosshair()
+        self.zoom_changed_signal.emit(self.zoom)
+
     # ======================================================================
     # CLICK HANDLING (SUBPIXEL SAFE)
     # ======================================================================
@@ -296,6 +526,18 @@ class ImageViewer(QtWidgets.QGraphicsView):
         event : QtGui.QMouseEvent
             Mouse press event.
         """
+        if (
+            event.button() == QtCore.Qt.LeftButton
+            and self.stroke_modifier is not None
+            and event.modifiers() & self.stroke_modifier
+            and self._pixmap_item is not None
+        ):
+            # Freehand stroke instead of a click (and no hand drag)
+            self._press_pos = None
+            self._start_stroke(self.mapToScene(event.pos()))
+            event.accept()
+            return
+
         self._press_pos = event.pos()
         super().mousePressEvent(event)
 
@@ -310,6 +552,10 @@ class ImageViewer(QtWidgets.QGraphicsView):
         """
         super().mouseReleaseEvent(event)
 
+        if self._stroke is not None and event.button() == QtCore.Qt.LeftButton:
+            self._finish_stroke()
+            return
+
         if self._pixmap_item is None or self._press_pos is None:
             return
 
@@ -341,6 +587,65 @@ class ImageViewer(QtWidgets.QGraphicsView):
         if self.auto_marker:
             self.add_marker((x, y), QtGui.QColor(0, 0, 255))
 
+    # ======================================================================
+    # FREEHAND STROKE
+    # ======================================================================
+
+    def _start_stroke(self, scene_pos: QtCore.QPointF) -> None:
+        r"""
+        Start a stroke at a scene position (one path item updated while drawing).
+        """
+        self._stroke = StrokeSimplifier(self.stroke_tolerance)
+        self._stroke_path = QtGui.QPainterPath()
+        pen = QtGui.QPen(self.stroke_color)
+        pen.setWidthF(0)
+        self._stroke_item = self.scene().addPath(QtGui.QPainterPath(), pen)
+        self._extend_stroke(scene_pos)
+
+    def _extend_stroke(self, scene_pos: QtCore.QPointF) -> None:
+        r"""
+        Add a cursor sample to the stroke (samples outside the image are ignored).
+        """
+        if not self._pixmap_item.sceneBoundingRect().contains(scene_pos):
+            return
+
+        shift = 0.5 if self.half_shift else 0.0
+        first = not self._stroke.vertices
+        if self._stroke.add(scene_pos.x() - shift, scene_pos.y() - shift):
+            # Vertex kept: the simplified part of the path only grows
+            x, y = self._stroke.vertices[-1]
+            if first:
+                self._stroke_path.moveTo(x + shift, y + shift)
+            else:
+                self._stroke_path.lineTo(x + shift, y + shift)
+
+        # Live tail: last vertex to the cursor
+        path = QtGui.QPainterPath(self._stroke_path)
+        path.lineTo(scene_pos)
+        self._stroke_item.setPath(path)
+
+    def _finish_stroke(self) -> None:
+        r"""
+        End the stroke: remove the live path and emit the simplified points.
+        """
+        points = self._stroke.points
+        self.scene().removeItem(self._stroke_item)
+        self._stroke = None
+        self._stroke_path = None
+        self._stroke_item = None
+
+        if len(points):
+            self.stroke_signal.emit(points)
+            if self.auto_marker:
+                self.add_path(points.tolist(), self.stroke_color)
+
+    @property
+    def is_stroking(self) -> bool:
+        r"""
+        True while a stroke is being drawn.
+        """
+        return self._stroke is not None
+
     # ======================================================================
     # MARKERS (SUBPIXEL CROSS STYLE)
     # ======================================================================
@@ -383,12 +688,43 @@ class ImageViewer(QtWidgets.QGraphicsView):
 
         self._markers.append((hline, vline))
 
+    def add_path(
+        self,
+        points: List[Tuple[float, float]],
+        color: QtGui.QColor = QtGui.QColor(0, 0, 255),
+    ) -> None:
+        r"""
+        Add a polyline (e.g. a stroke) as a single path item.
+
+        Parameters
+        ----------
+        points : List[Tuple[float, float]]
+            (x, y) coordinates of the vertices.
+        color : QtGui.QColor
+            Path color.
+        """
+        if not points:
+            return
+
+        shift = 0.5 if self.half_shift else 0.0
+        path = QtGui.QPainterPath()
+        path.addPolygon(QtGui.QPolygonF([QtCore.QPointF(x + shift, y + shift) for x, y in points]))
+
+        pen = QtGui.QPen(color)
+        pen.setWidthF(0)
+        self._paths.append(self.scene().addPath(path, pen))
+        self._path_vertices += len(points)
+
     def clear_markers(self) -> None:
         r"""
-        Remove all markers from the scene.
+        Remove all markers and paths from the scene.
         """
         for hline, vline in self._markers:
             self.scene().removeItem(hline)
             self.scene().removeItem(vline)
+        for item in self._paths:
+            self.scene().removeItem(item)
 
         self._markers.clear()
+        self._paths.clear()
+        self._path_vertices = 0
@@ -0,0 +1,269 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+import logging.handlers
+from collections import deque
+from typing import List, Optional
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class LogModel(QtCore.QAbstractListModel):
+    r"""
+    Plain-text list model backed by a ring buffer of lines.
+
+    When the buffer is full, the oldest lines are dropped.
+
+    Parameters
+    ----------
+    max_lines : int
+        Maximum number of lines kept.
+        Default is 10000.
+    parent : QObject, optional
+        Parent object.
+    """
+
+    def __init__(self, max_lines: int = 10_000, parent=None):
+        super().__init__(parent)
+        self._lines = deque(maxlen=max(1, int(max_lines)))
+
+    @property
+    def max_lines(self) -> int:
+        r"""
+        Maximum number of lines kept.
+        """
+        return self._lines.maxlen
+
+    def set_max_lines(self, max_lines: int) -> None:
+        r"""
+        Change the maximum number of lines (the oldest lines are dropped if needed).
+        """
+        self.beginResetModel()
+        self._lines = deque(self._lines, maxlen=max(1, int(max_lines)))
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and index.isValid():
+            return self._lines[index.row()]
+        return None
+
+    def append_lines(self, lines: List[str]) -> None:
+        r"""
+        Append a batch of lines with a single removal and a single insertion notification.
+        """
+        if not lines:
+            return
+        cap = self._lines.maxlen
+
+        if len(lines) >= cap:
+            self.beginResetModel()
+            self._lines.clear()
+            self._lines.extend(lines[-cap:])
+            self.endResetModel()
+            return
+
+        overflow = len(self._lines) + len(lines) - cap
+        if overflow > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._lines.popleft()
+            self.endRemoveRows()
+
+        start = len(self._lines)
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + len(lines) - 1)
+        self._lines.extend(lines)
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        r"""
+        Remove all the lines.
+        """
+        self.beginResetModel()
+        self._lines.clear()
+        self.endResetModel()
+
+    def lines(self) -> List[str]:
+        r"""
+        Return a copy of the kept lines.
+        """
+        return list(self._lines)
+
+
+class LogPanel(QtWidgets.QListView):
+    r"""
+    Bounded log panel appending the messages in batches, once per event-loop iteration.
+
+    :meth:`log` only queues the message: the queued messages are flushed together
+    (one model update, one scroll) when control returns to the event loop.
+    The full log can be mirrored to a rotating file on disk with :meth:`set_log_file`,
+    so the messages dropped from the panel are not lost.
+
+    Parameters
+    ----------
+    max_lines : int
+        Maximum number of lines kept in the panel.
+        Default is 10000.
+    parent : QWidget, optional
+        Parent widget.
+    """
+
+    def __init__(self, max_lines: int = 10_000, parent=None):
+        super().__init__(parent)
+
+        self.log_model = LogModel(max_lines, self)
+        self.setModel(self.log_model)
+
+        # Plain text, one line per row: uniform sizes keep the layout O(1)
+        self.setUniformItemSizes(True)
+        self.setWordWrap(False)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+
+        self._pending: List[str] = []
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush)
+
+        self._file_logger: Optional[logging.Logger] = None
+
+    # ------------------------------------------------------------------
+    # Logging
+    # ------------------------------------------------------------------
+    def log(self, msg: str) -> None:
+        r"""
+        Queue a message (multi-line messages are split into lines).
+
+        Parameters
+        ----------
+        msg : str
+            The message.
+        """
+        self._pending.extend(str(msg).splitlines() or [""])
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        r"""
+        Append the queued messages to the panel (and to the log file).
+        """
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+
+        if self._file_logger is not None:
+            for line in lines:
+                self._file_logger.info(line)
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.log_model.append_lines(lines)
+        if at_bottom:
+            self.scrollToBottom()
+
+    def clear(self) -> None:
+        r"""
+        Clear the panel (the log file is kept).
+        """
+        self._pending = []
+        self._flush_timer.stop()
+        self.log_model.clear()
+
+    def lines(self) -> List[str]:
+        r"""
+        Return the lines kept in the panel, including the queued ones.
+        """
+        return self.log_model.lines() + self._pending
+
+    def set_max_lines(self, max_lines: int) -> None:
+        r"""
+        Change the maximum number of lines kept in the panel.
+        """
+        self.log_model.set_max_lines(max_lines)
+
+    # ------------------------------------------------------------------
+    # File mirror
+    # ------------------------------------------------------------------
+    def set_log_file(
+        self,
+        path: Optional[str],
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+    ) -> None:
+        r"""
+        Mirror the full log to a rotating file.
+
+        Parameters
+        ----------
+        path : str, optional
+            Path of the log file. If None, the mirror is stopped.
+        max_bytes : int
+            Size of a file before rotation.
+            Default is 10 MB.
+        backup_count : int
+            Number of rotated files kept (``path.1``, ``path.2``, ...).
+            Default is 5.
+        """
+        self._close_log_file()
+        if path is None:
+            return
+
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+
+        logger = logging.getLogger(f"pyclickimage.log_panel.{id(self)}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        self._file_logger = logger
+
+    def _close_log_file(self) -> None:
+        if self._file_logger is None:
+            return
+        for handler in list(self._file_logger.handlers):
+            self._file_logger.removeHandler(handler)
+            handler.close()
+        self._file_logger = None
+
+    def close_log_file(self) -> None:
+        r"""
+        Flush the queued messages and close the log file.
+        """
+        self.flush()
+        self._close_log_file()
+
+    # ------------------------------------------------------------------
+    # Copy
+    # ------------------------------------------------------------------
+    def keyPressEvent(self, event: QtGui.QKeyEvent) -> None:
+        r"""
+        Copy the selected lines with the standard copy shortcut.
+        """
+        if event.matches(QtGui.QKeySequence.Copy):
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            lines = self.log_model.lines()
+            QtWidgets.QApplication.clipboard().setText("\n".join(lines[r] for r in rows))
+            return
+        super().keyPressEvent(event)
@@ -0,0 +1,228 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import cv2
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Loupe(QtWidgets.QLabel):
+    r"""
+    Magnifier following the cursor, rendered from the source image buffer.
+
+    The loupe shows a nearest-neighbour N× enlargement of the source pixels around the cursor,
+    with the display transform (contrast, colormap) applied only to a small cached region
+    of interest. While the cursor stays inside the cached region, a move only slices and
+    enlarges the cached pixels: the full-frame pipeline is never involved.
+
+    Parameters
+    ----------
+    parent : QWidget, optional
+        Parent widget (the viewer).
+    size : int
+        Side length of the loupe in screen pixels.
+        Default is 160.
+    zoom : int
+        Enlargement factor.
+        Default is 8.
+    """
+
+    def __init__(self, parent=None, size: int = 160, zoom: int = 8):
+        super().__init__(parent)
+
+        self._size = int(size)
+        self._zoom = int(zoom)
+        self._image: Optional[np.ndarray] = None
+        self._render: Optional[Callable[[np.ndarray], np.ndarray]] = None
+
+        # Cached rendered region: (x0, y0) origin in source pixels and RGB pixels
+        self._cache_origin: Tuple[int, int] = (0, 0)
+        self._cache: Optional[np.ndarray] = None
+
+        self.crosshair_color = QtGui.QColor(255, 0, 0)
+
+        self.setFixedSize(self._size, self._size)
+        self.setStyleSheet("border: 1px solid white;")
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.hide()
+
+        self.enabled = False
+
+    # ------------------------------------------------------------------
+    # Settings
+    # ------------------------------------------------------------------
+    @property
+    def zoom(self) -> int:
+        r"""
+        Enlargement factor.
+        """
+        return self._zoom
+
+    @zoom.setter
+    def zoom(self, value: int) -> None:
+        self._zoom = max(1, int(value))
+        self._cache = None
+
+    @property
+    def loupe_size(self) -> int:
+        r"""
+        Side length of the loupe in screen pixels.
+        """
+        return self._size
+
+    @loupe_size.setter
+    def loupe_size(self, value: int) -> None:
+        self._size = max(16, int(value))
+        self.setFixedSize(self._size, self._size)
+        self._cache = None
+
+    def set_source(
+        self, image: np.ndarray, render: Callable[[np.ndarray], np.ndarray]
+    ) -> None:
+        r"""
+        Set the source image and the display transform of the loupe.
+
+        Parameters
+        ----------
+        image : numpy.ndarray
+            Source image (BGR), never copied.
+        render : Callable[[numpy.ndarray], numpy.ndarray]
+            Display transform applied to a BGR region, returning an RGB uint8 region.
+        """
+        self._image = image
+        self._render = render
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        r"""
+        Drop the cached region (call when the display settings change).
+        """
+        self._cache = None
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def _n_pixels(self) -> int:
+        return int(math.ceil(self._size / self._zoom)) | 1
+
+    def _update_cache(self, px: int, py: int, n: int) -> None:
+        r"""
+        Render a region of 4x the visible crop around source pixel (px, py).
+        """
+        h, w = self._image.shape[:2]
+        half = 2 * n
+        x0, y0 = max(0, px - half), max(0, py - half)
+        x1, y1 = min(w, px + half + 1), min(h, py + half + 1)
+        self._cache_origin = (x0, y0)
+        self._cache = np.ascontiguousarray(self._render(self._image[y0:y1, x0:x1]))
+
+    def _crop(self, px: int, py: int, n: int) -> np.ndarray:
+        r"""
+        Return the n x n RGB crop centered on source pixel (px, py) (black outside the image).
+        """
+        h, w = self._image.shape[:2]
+        r = n // 2
+        x0, y0 = px - r, py - r
+
+        cx0, cy0 = self._cache_origin
+        if self._cache is not None:
+            ch, cw = self._cache.shape[:2]
+            inside = (
+                max(0, x0) >= cx0
+                and max(0, y0) >= cy0
+                and min(w, x0 + n) <= cx0 + cw
+                and min(h, y0 + n) <= cy0 + ch
+            )
+        else:
+            inside = False
+        if not inside:
+            self._update_cache(px, py, n)
+            cx0, cy0 = self._cache_origin
+
+        crop = np.zeros((n, n, 3), np.uint8)
+        sx0, sy0 = max(0, x0), max(0, y0)
+        sx1, sy1 = min(w, x0 + n), min(h, y0 + n)
+        if sx1 > sx0 and sy1 > sy0:
+            crop[sy0 - y0 : sy1 - y0, sx0 - x0 : sx1 - x0] = self._cache[
+                sy0 - cy0 : sy1 - cy0, sx0 - cx0 : sx1 - cx0
+            ]
+        return crop
+
+    def show_at(self, scene_x: float, scene_y: float, view_pos: QtCore.QPoint) -> None:
+        r"""
+        Render the loupe around a scene position and move it next to the cursor.
+
+        Parameters
+        ----------
+        scene_x, scene_y : float
+            Cursor position in scene (source pixel corner) coordinates.
+        view_pos : QtCore.QPoint
+            Cursor position in the parent widget.
+        """
+        if not self.enabled or self._image is None or self._render is None:
+            self.hide()
+            return
+
+        n = self._n_pixels()
+        px, py = int(math.floor(scene_x)), int(math.floor(scene_y))
+        crop = self._crop(px, py, n)
+
+        zoom = self._zoom
+        big = cv2.resize(crop, (n * zoom, n * zoom), interpolation=cv2.INTER_NEAREST)
+        qimg = QtGui.QImage(
+            big.data, big.shape[1], big.shape[0], 3 * big.shape[1], QtGui.QImage.Format_RGB888
+        )
+
+        # Keep the cursor at the center of the loupe
+        r = n // 2
+        cursor_x = (scene_x - (px - r)) * zoom
+        cursor_y = (scene_y - (py - r)) * zoom
+        offset_x = cursor_x - self._size / 2
+        offset_y = cursor_y - self._size / 2
+
+        pixmap = QtGui.QPixmap(self._size, self._size)
+        pixmap.fill(QtCore.Qt.black)
+        painter = QtGui.QPainter(pixmap)
+        painter.drawImage(QtCore.QPointF(-offset_x, -offset_y), qimg)
+
+        pen = QtGui.QPen(self.crosshair_color)
+        pen.setWidth(0)
+        painter.setPen(pen)
+        c = self._size / 2
+        painter.drawLine(QtCore.QPointF(c, 0), QtCore.QPointF(c, self._size))
+        painter.drawLine(QtCore.QPointF(0, c), QtCore.QPointF(self._size, c))
+        painter.end()
+
+        self.setPixmap(pixmap)
+
+        # Place the loupe beside the cursor, inside the parent
+        parent = self.parentWidget()
+        gap = 24
+        x, y = view_pos.x() + gap, view_pos.y() + gap
+        if parent is not None:
+            if x + self._size > parent.width():
+                x = view_pos.x() - gap - self._size
+            if y + self._size > parent.height():
+                y = view_pos.y() - gap - self._size
+        self.move(x, y)
+        if not self.isVisible():
+            self.show()
+            self.raise_()
@@ -0,0 +1,269 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MEMORY_BUDGET_ENV_VAR = "PYCLICKIMAGE_MEMORY_BUDGET"
+
+_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+
+def format_bytes(n: float) -> str:
+    r"""
+    Format a number of bytes in a human readable way (``12.3 MB``).
+    """
+    if abs(n) < 1024:
+        return f"{int(n)} B"
+    for unit in ("kB", "MB"):
+        n /= 1024
+        if abs(n) < 1024:
+            return f"{n:.1f} {unit}"
+    n /= 1024
+    return f"{n:.1f} GB"
+
+
+class MemoryBudgetError(MemoryError):
+    r"""
+    Raised when a buffer does not fit in the memory budget, even after evicting the caches.
+    """
+
+
+def parse_size(text: str) -> int:
+    r"""
+    Parse a number of bytes with an optional binary unit (``"536870912"``, ``"512M"``, ``"1.5 GB"``).
+
+    Raises
+    ------
+    ValueError
+        If the text is not a size.
+    """
+    match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([kKmMgGtT]?)[iI]?[bB]?\s*", text)
+    if match is None:
+        raise ValueError(f"Invalid size '{text}'.")
+    return int(float(match.group(1)) * _UNITS[match.group(2).lower()])
+
+
+def array_nbytes(array: Optional[np.ndarray]) -> int:
+    r"""
+    Bytes of an array held in process memory.
+
+    Memory-mapped arrays (e.g. the levels of the image cache) count for 0: their pages
+    belong to the file cache of the system, which reclaims them under memory pressure.
+    """
+    if array is None:
+        return 0
+    base = array
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap):
+            return 0
+        base = base.base
+    return array.nbytes
+
+
+def render_nbytes(shape: Tuple[int, ...], itemsize: int = 1) -> int:
+    r"""
+    Peak memory of the display of an image: float32 contrast buffer, contrasted copy,
+    RGB buffer and 32-bit pixmap.
+
+    Parameters
+    ----------
+    shape : Tuple[int, ...]
+        Shape of the displayed image (H, W[, C]).
+    itemsize : int
+        Bytes per channel of the image.
+        Default is 1.
+    """
+    h, w = shape[:2]
+    c = shape[2] if len(shape) > 2 else 1
+    return h * w * (c * (4 + itemsize) + 3 + 4)
+
+
+class _Consumer:
+    __slots__ = ["name", "size", "evict", "priority"]
+
+    def __init__(self, name, size, evict, priority):
+        self.name = name
+        self.size = size
+        self.evict = evict
+        self.priority = priority
+
+
+class MemoryGovernor:
+    r"""
+    Central accounting of the memory held by the image buffers, display caches and marker layers.
+
+    Each consumer is registered with a function returning its current size, so the accounting
+    is always up to date without notifications (even for caches filled by worker threads).
+    Consumers registered with an ``evict`` function are caches: when the budget is exceeded,
+    they are asked to free memory, by increasing ``priority``.
+
+    The budget is enforced in three ways by the application:
+
+    - :meth:`enforce` evicts the caches when the usage exceeds the budget;
+    - :meth:`fits` is used to choose a coarser display level when a level does not fit;
+    - :meth:`require` (or the ``max_bytes`` of a loader, see :meth:`allowance`) refuses to
+      load a buffer that does not fit, even after the eviction of all the caches.
+
+    Parameters
+    ----------
+    budget : int, optional
+        Memory budget in bytes. If None, the usage is tracked but not limited.
+    """
+
+    def __init__(self, budget: Optional[int] = None) -> None:
+        self.budget = budget
+        self._consumers: Dict[str, _Consumer] = {}
+
+    @classmethod
+    def from_env(cls) -> "MemoryGovernor":
+        r"""
+        Governor with the budget of the ``PYCLICKIMAGE_MEMORY_BUDGET`` environment variable
+        (bytes, or with a unit: ``"2G"``), unlimited if it is not set.
+        """
+        text = os.environ.get(MEMORY_BUDGET_ENV_VAR, "").strip()
+        return cls(parse_size(text) if text else None)
+
+    # =========================================================
+    # CONSUMERS
+    # =========================================================
+
+    def register(
+        self,
+        name: str,
+        size: Callable[[], int],
+        evict: Optional[Callable[[int], int]] = None,
+        priority: int = 0,
+    ) -> None:
+        r"""
+        Register a memory consumer (replaces a consumer with the same name).
+
+        Parameters
+        ----------
+        name : str
+            Name of the consumer (displayed in the usage).
+        size : Callable[[], int]
+            Return the bytes currently held.
+        evict : Callable[[int], int], optional
+            For caches: free at least the given number of bytes if possible, return the freed bytes.
+        priority : int
+            Caches with a lower priority are evicted first.
+            Default is 0.
+        """
+        self._consumers[name] = _Consumer(name, size, evict, priority)
+
+    def unregister(self, name: str) -> None:
+        r"""
+        Forget a consumer (no error if it does not exist).
+        """
+        self._consumers.pop(name, None)
+
+    def usage(self) -> Dict[str, int]:
+        r"""
+        Bytes held by each consumer.
+        """
+        return {name: int(c.size()) for name, c in self._consumers.items()}
+
+    @property
+    def total(self) -> int:
+        r"""
+        Bytes held by all the consumers.
+        """
+        return sum(self.usage().values())
+
+    @property
+    def evictable(self) -> int:
+        r"""
+        Bytes held by the caches.
+        """
+        return sum(int(c.size()) for c in self._consumers.values() if c.evict is not None)
+
+    def _caches(self) -> List[_Consumer]:
+        caches = [c for c in self._consumers.values() if c.evict is not None]
+        return sorted(caches, key=lambda c: c.priority)
+
+    # =========================================================
+    # BUDGET
+    # =========================================================
+
+    def allowance(self) -> Optional[int]:
+        r"""
+        Bytes that a new buffer may use: the free budget plus the caches (which can be evicted).
+        None if the budget is unlimited.
+        """
+        if self.budget is None:
+            return None
+        return max(0, self.budget - self.total + self.evictable)
+
+    def fits(self, nbytes: int) -> bool:
+        r"""
+        Make room for ``nbytes`` more bytes, evicting the caches if needed.
+
+        Returns
+        -------
+        bool
+            True if the bytes fit in the budget.
+        """
+        if self.budget is None:
+            return True
+        excess = self.total + nbytes - self.budget
+        for cache in self._caches():
+            if excess <= 0:
+                break
+            excess -= cache.evict(excess)
+        return excess <= 0
+
+    def require(self, nbytes: int, what: str = "buffer") -> None:
+        r"""
+        Make room for ``nbytes`` more bytes (see :meth:`fits`).
+
+        Raises
+        ------
+        MemoryBudgetError
+            If the bytes do not fit in the budget.
+        """
+        if not self.fits(nbytes):
+            raise MemoryBudgetError(self.describe_shortage(nbytes, what))
+
+    def enforce(self) -> int:
+        r"""
+        Evict the caches until the usage is within the budget.
+
+        Returns
+        -------
+        int
+            Freed bytes.
+        """
+        if self.budget is None:
+            return 0
+        before = self.total
+        self.fits(0)
+        return max(0, before - self.total)
+
+    def describe_shortage(self, nbytes: int, what: str = "buffer") -> str:
+        r"""
+        Message explaining why ``nbytes`` bytes do not fit.
+        """
+        return (
+            f"Not enough memory for the {what} ({format_bytes(nbytes)}): "
+            f"{format_bytes(self.total)} used of a {format_bytes(self.budget or 0)} budget "
+            f"(set {MEMORY_BUDGET_ENV_VAR} to change it)."
+        )
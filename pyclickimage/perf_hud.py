@@ -0,0 +1,225 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Dict
+
+from PyQt5 import QtCore, QtWidgets
+
+from .memory import format_bytes
+from .tracing import current_tracer
+
+HUD_ENV_VAR = "PYCLICKIMAGE_HUD"
+
+_NULL_STAGE = nullcontext()
+
+
+def hud_enabled_from_env() -> bool:
+    r"""
+    Return True if the ``PYCLICKIMAGE_HUD`` environment variable enables the HUD.
+    """
+    return os.environ.get(HUD_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class _Stage:
+    r"""
+    Context manager timing one stage of the pipeline.
+
+    The duration is recorded in the statistics (if enabled) and as a trace span (if tracing).
+    """
+
+    __slots__ = ["_stats", "_name", "_tracer", "_t0"]
+
+    def __init__(self, stats: "PerfStats", name: str, tracer):
+        self._stats = stats
+        self._name = name
+        self._tracer = tracer
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        t1 = time.perf_counter()
+        if self._stats.enabled:
+            self._stats.record(self._name, (t1 - self._t0) * 1e3)
+        if self._tracer is not None:
+            self._tracer.complete(self._name, "stage", self._t0, t1)
+        return False
+
+
+class PerfStats:
+    r"""
+    Collect per-stage timings, frame rate and memory usage of the viewer pipeline.
+
+    When disabled (and not tracing), :meth:`stage` returns a shared no-op context manager,
+    so the instrumented code only pays for a method call and two tests.
+
+    Parameters
+    ----------
+    enabled : bool
+        Initial state of the collection.
+        Default is False.
+    smoothing : float
+        Weight of the new sample in the exponential moving average of the timings.
+        Default is 0.2.
+    """
+
+    __slots__ = ["enabled", "smoothing", "last", "average", "memory", "_frames"]
+
+    def __init__(self, enabled: bool = False, smoothing: float = 0.2) -> None:
+        self.enabled = bool(enabled)
+        self.smoothing = smoothing
+        self.last: Dict[str, float] = {}
+        self.average: Dict[str, float] = {}
+        self.memory: Dict[str, int] = {}
+        self._frames = deque(maxlen=120)
+
+    def stage(self, name: str):
+        r"""
+        Return a context manager timing the stage ``name`` (in milliseconds).
+        """
+        tracer = current_tracer()
+        if not self.enabled and tracer is None:
+            return _NULL_STAGE
+        return _Stage(self, name, tracer)
+
+    def record(self, name: str, ms: float) -> None:
+        r"""
+        Record a duration in milliseconds for the stage ``name``.
+        """
+        self.last[name] = ms
+        previous = self.average.get(name)
+        if previous is None:
+            self.average[name] = ms
+        else:
+            self.average[name] = previous + self.smoothing * (ms - previous)
+
+    def frame(self) -> None:
+        r"""
+        Register a painted frame for the FPS estimate.
+        """
+        self._frames.append(time.perf_counter())
+
+    @property
+    def fps(self) -> float:
+        r"""
+        Frame rate measured over the last painted frames (last second only).
+        """
+        now = time.perf_counter()
+        recent = [t for t in self._frames if now - t <= 1.0]
+        if len(recent) < 2:
+            return float(len(recent))
+        return (len(recent) - 1) / max(recent[-1] - recent[0], 1e-9)
+
+    def set_memory(self, name: str, nbytes: int) -> None:
+        r"""
+        Set the number of bytes currently held by the buffer ``name``.
+        """
+        self.memory[name] = int(nbytes)
+
+    def reset(self) -> None:
+        r"""
+        Forget all the collected measures (memory usage is kept).
+        """
+        self.last.clear()
+        self.average.clear()
+        self._frames.clear()
+
+
+class PerfHud(QtWidgets.QLabel):
+    r"""
+    Overlay label displaying the content of a :class:`PerfStats`.
+
+    The text is refreshed by a timer (4 Hz) and not on every measure,
+    so the HUD does not slow down the pipeline it observes.
+
+    Parameters
+    ----------
+    stats : PerfStats
+        The statistics to display.
+    parent : QWidget, optional
+        Parent widget (the viewer).
+    """
+
+    STAGES = [
+        ("contrast", "Contrast"),
+        ("qimage", "QImage"),
+        ("markers", "Markers"),
+        ("table", "Table"),
+        ("paint", "Paint"),
+    ]
+
+    def __init__(self, stats: PerfStats, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+
+        self.setStyleSheet("""
+            background-color: rgba(0,0,0,180);
+            color: #9f9;
+            padding: 3px;
+            border: 1px solid white;
+            font-family: monospace;
+        """)
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(250)
+        self._timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def set_enabled(self, enabled: bool) -> None:
+        r"""
+        Show or hide the HUD and toggle the statistics collection.
+        """
+        self.stats.enabled = bool(enabled)
+        if enabled:
+            self.stats.reset()
+            self.refresh()
+            self.show()
+            self.raise_()
+            self._timer.start()
+        else:
+            self._timer.stop()
+            self.hide()
+
+    def refresh(self) -> None:
+        r"""
+        Update the displayed text.
+        """
+        lines = []
+        for key, label in self.STAGES:
+            last = self.stats.last.get(key)
+            if last is None:
+                lines.append(f"{label:<9}      -")
+            else:
+                avg = self.stats.average[key]
+                lines.append(f"{label:<9}{last:7.2f} ms (avg {avg:6.2f})")
+        lines.append(f"{'FPS':<9}{self.stats.fps:7.1f}")
+
+        total = 0
+        for name, nbytes in sorted(self.stats.memory.items()):
+            lines.append(f"{name:<9}{format_bytes(nbytes):>10}")
+            total += nbytes
+        lines.append(f"{'Memory':<9}{format_bytes(total):>10}")
+
+        self.setText("\n".join(lines))
+        self.adjustSize()
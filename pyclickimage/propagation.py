@@ -0,0 +1,263 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+from concurrent.futures import CancelledError
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from .click_manager import ClickManager
+
+CONFIDENCE_COLUMN = "confidence"
+REVIEW_COLUMN = "review"
+
+
+def to_gray_u8(image: np.ndarray) -> np.ndarray:
+    r"""
+    Convert a frame to the 8-bit gray image used by the tracker.
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        Frame with shape (H, W) or (H, W, 3) (BGR).
+
+    Returns
+    -------
+    numpy.ndarray
+        Gray image with shape (H, W) and dtype uint8.
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if image.dtype != np.uint8:
+        image = cv2.normalize(image, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+    return image
+
+
+def track_points(
+    previous: np.ndarray,
+    following: np.ndarray,
+    points: np.ndarray,
+    win_size: int = 21,
+    max_level: int = 3,
+    max_error: float = 1.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    r"""
+    Track points from a frame to the next one with pyramidal Lucas-Kanade.
+
+    All the points are tracked with one forward call and checked with one backward call
+    (``cv2.calcOpticalFlowPyrLK``). The confidence of a point decreases linearly with its
+    forward-backward error: 1 for a point tracked back to its origin, 0 for an error
+    of ``max_error`` pixels or more, or for a point lost by the tracker.
+
+    Parameters
+    ----------
+    previous : numpy.ndarray
+        Gray frame of the points (see :func:`to_gray_u8`).
+    following : numpy.ndarray
+        Gray next frame.
+    points : numpy.ndarray
+        Points with shape (N, 2) in pixel-center coordinates ((0, 0) on the center of the first pixel).
+    win_size : int
+        Side length of the tracking window.
+        Default is 21.
+    max_level : int
+        Number of pyramid levels above the full resolution.
+        Default is 3.
+    max_error : float
+        Forward-backward error (pixels) with a zero confidence.
+        Default is 1.0.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray]
+        Tracked points with shape (N, 2) (NaN for the lost points) and their confidence with shape (N,).
+    """
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 1, 2)
+    n = points.shape[0]
+    if n == 0:
+        return np.empty((0, 2)), np.empty(0)
+
+    criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 30, 0.01)
+    params = dict(winSize=(win_size, win_size), maxLevel=max_level, criteria=criteria)
+
+    tracked, status, _ = cv2.calcOpticalFlowPyrLK(previous, following, points, None, **params)
+    back, back_status, _ = cv2.calcOpticalFlowPyrLK(
+        following, previous, tracked, None, **params
+    )
+
+    error = np.linalg.norm((back - points).reshape(n, 2), axis=1)
+    ok = (status.ravel() == 1) & (back_status.ravel() == 1) & np.isfinite(error)
+
+    h, w = following.shape[:2]
+    tracked = tracked.reshape(n, 2).astype(np.float64)
+    ok &= (tracked[:, 0] >= -0.5) & (tracked[:, 0] <= w - 0.5)
+    ok &= (tracked[:, 1] >= -0.5) & (tracked[:, 1] <= h - 0.5)
+
+    confidence = np.where(ok, np.clip(1.0 - error / max_error, 0.0, 1.0), 0.0)
+    tracked[~ok] = np.nan
+    return tracked, confidence
+
+
+def propagate_points(
+    read_frame: Callable[[int], np.ndarray],
+    start: int,
+    points: np.ndarray,
+    n_frames: int,
+    win_size: int = 21,
+    max_level: int = 3,
+    max_error: float = 1.0,
+    cancel_event: Optional[threading.Event] = None,
+    progress: Optional[Callable[[float], None]] = None,
+) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    r"""
+    Track points from a frame into the next ``n_frames`` frames.
+
+    Each frame is decoded and converted to gray once; all the points are tracked
+    together (see :func:`track_points`). The confidence of a point is the minimum of its
+    confidences along the way, so a drift is never forgotten. A point lost by the tracker
+    stays lost (NaN) in the following frames.
+
+    Parameters
+    ----------
+    read_frame : Callable[[int], numpy.ndarray]
+        Return a frame from its index (e.g. :meth:`FrameCache.get`).
+    start : int
+        Index of the frame of the points.
+    points : numpy.ndarray
+        Points with shape (N, 2) in pixel-center coordinates. NaN points are not tracked.
+    n_frames : int
+        Number of frames after ``start``.
+    win_size : int
+        Side length of the tracking window.
+        Default is 21.
+    max_level : int
+        Number of pyramid levels above the full resolution.
+        Default is 3.
+    max_error : float
+        Forward-backward error (pixels) with a zero confidence.
+        Default is 1.0.
+    cancel_event : threading.Event, optional
+        If set during the tracking, ``concurrent.futures.CancelledError`` is raised.
+    progress : Callable[[float], None], optional
+        Called with the fraction of processed frames.
+
+    Returns
+    -------
+    List[Tuple[int, numpy.ndarray, numpy.ndarray]]
+        For each frame, its index, the points with shape (N, 2) and their confidence with shape (N,)
+        (0 for the lost points, NaN for the NaN input points).
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    valid = np.isfinite(points).all(axis=1)
+    confidence = np.where(valid, 1.0, np.nan)
+    current = points.copy()
+
+    previous = to_gray_u8(read_frame(start))
+    results = []
+
+    for step in range(1, n_frames + 1):
+        if cancel_event is not None and cancel_event.is_set():
+            raise CancelledError()
+
+        index = start + step
+        following = to_gray_u8(read_frame(index))
+
+        alive = np.flatnonzero(np.isfinite(current).all(axis=1))
+        tracked, step_confidence = track_points(
+            previous, following, current[alive], win_size, max_level, max_error
+        )
+
+        current = np.full_like(points, np.nan)
+        current[alive] = tracked
+        new_confidence = np.where(valid, 0.0, np.nan)
+        new_confidence[alive] = np.minimum(confidence[alive], step_confidence)
+        confidence = new_confidence
+
+        results.append((index, current.copy(), confidence.copy()))
+        previous = following
+
+        if progress is not None:
+            progress(step / n_frames)
+
+    return results
+
+
+def store_propagation(
+    click_managers: List[Tuple[int, ClickManager]],
+    group_points: List[Tuple[str, int]],
+    results: List[Tuple[int, np.ndarray, np.ndarray]],
+    shift: float = 0.0,
+    min_confidence: float = 0.5,
+) -> Tuple[int, int]:
+    r"""
+    Store propagated points in the click managers of the target frames.
+
+    The points of a group are written only in the frames where this group has no click yet
+    (manual annotations are never overwritten), in the same order as in the source frame, so a
+    landmark keeps its index across frames. Lost points are stored as placeholders (None, None)
+    and flagged; the placeholders of the source frame stay placeholders without flag.
+    The confidence is stored in the ``confidence`` point data column, and the ``review`` column
+    is 1 for the points below ``min_confidence``.
+
+    Parameters
+    ----------
+    click_managers : List[Tuple[int, ClickManager]]
+        Click manager of each target frame, with the frame index.
+    group_points : List[Tuple[str, int]]
+        Name and number of points of each tracked group, in the order of the tracked points.
+    results : List[Tuple[int, numpy.ndarray, numpy.ndarray]]
+        Output of :func:`propagate_points`.
+    shift : float
+        Offset added to the pixel-center coordinates (0.5 without half-shift).
+        Default is 0.0.
+    min_confidence : float
+        Points with a lower confidence are flagged for review.
+        Default is 0.5.
+
+    Returns
+    -------
+    Tuple[int, int]
+        Number of stored points and number of flagged points.
+    """
+    managers = dict(click_managers)
+    stored = flagged = 0
+
+    for index, points, confidence in results:
+        click_manager = managers[index]
+        offset = 0
+        for group, count in group_points:
+            block = slice(offset, offset + count)
+            offset += count
+            click_manager.add_group(group)
+            if click_manager.groups[group]:
+                continue
+
+            click_manager.add_clicks(points[block] + shift, group)
+
+            values = confidence[block]
+            review = (values < min_confidence).astype(np.float64)
+            click_manager.set_point_data(
+                CONFIDENCE_COLUMN, [None if np.isnan(v) else v for v in values.tolist()], group
+            )
+            click_manager.set_point_data(REVIEW_COLUMN, review.tolist(), group)
+            stored += count
+            flagged += int(review.sum())
+
+    return stored, flagged
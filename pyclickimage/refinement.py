@@ -0,0 +1,308 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Literal, Optional
+
+import numpy as np
+import cv2
+
+from .click_manager import ClickManager
+from .tracing import traced
+
+RefinementMethod = Literal["centroid", "gaussian", "corner"]
+Polarity = Literal["bright", "dark"]
+
+REFINEMENT_METHODS = ("centroid", "gaussian", "corner")
+
+
+def to_gray_float(image: np.ndarray) -> np.ndarray:
+    r"""
+    Convert an image (gray or BGR, any integer or float dtype) to a float32 gray image.
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        Input image with shape (H, W) or (H, W, 3).
+
+    Returns
+    -------
+    numpy.ndarray
+        Gray image with shape (H, W) and dtype float32.
+    """
+    image = np.asarray(image)
+    if image.ndim == 3:
+        if image.dtype not in (np.uint8, np.uint16, np.float32):
+            image = image.astype(np.float32)
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image.astype(np.float32, copy=False)
+
+
+def _patches(gray_pad: np.ndarray, cx: np.ndarray, cy: np.ndarray, w: int) -> np.ndarray:
+    r"""
+    Gather the (2w+1, 2w+1) windows centered on integer pixels (cx, cy) of a padded image.
+    """
+    offsets = np.arange(-w, w + 1)
+    rows = cy[:, None, None] + offsets[None, :, None] + w
+    cols = cx[:, None, None] + offsets[None, None, :] + w
+    return gray_pad[rows, cols]
+
+
+def _refine_centroid(patches: np.ndarray, w: int, polarity: Polarity) -> np.ndarray:
+    r"""
+    Intensity-weighted centroid of each window (background removed), as offsets from the center.
+    """
+    if polarity == "dark":
+        weights = patches.max(axis=(1, 2), keepdims=True) - patches
+    else:
+        weights = patches - patches.min(axis=(1, 2), keepdims=True)
+
+    offsets = np.arange(-w, w + 1, dtype=np.float32)
+    total = weights.sum(axis=(1, 2))
+    safe = np.where(total > 0, total, 1.0)
+    dx = (weights.sum(axis=1) * offsets[None, :]).sum(axis=1) / safe
+    dy = (weights.sum(axis=2) * offsets[None, :]).sum(axis=1) / safe
+    out = np.stack([dx, dy], axis=1)
+    out[total <= 0] = 0.0
+    return out
+
+
+def _refine_gaussian(patches: np.ndarray, w: int, polarity: Polarity) -> np.ndarray:
+    r"""
+    Sub-pixel Gaussian peak (3-point log-parabola fit around the window maximum), as offsets.
+    """
+    if polarity == "dark":
+        patches = patches.max(axis=(1, 2), keepdims=True) - patches
+    else:
+        patches = patches - patches.min(axis=(1, 2), keepdims=True)
+    n, size, _ = patches.shape
+
+    flat = patches.reshape(n, -1).argmax(axis=1)
+    py = np.clip(flat // size, 1, size - 2)
+    px = np.clip(flat % size, 1, size - 2)
+    idx = np.arange(n)
+
+    log = np.log(patches + 1e-6)
+
+    def fit(left, center, right):
+        denom = left - 2.0 * center + right
+        safe = np.where(denom < 0, denom, -1.0)
+        return np.where(denom < 0, 0.5 * (left - right) / safe, 0.0)
+
+    fx = fit(log[idx, py, px - 1], log[idx, py, px], log[idx, py, px + 1])
+    fy = fit(log[idx, py - 1, px], log[idx, py, px], log[idx, py + 1, px])
+
+    dx = np.clip(px - w + fx, -w, w)
+    dy = np.clip(py - w + fy, -w, w)
+    return np.stack([dx, dy], axis=1).astype(np.float32)
+
+
+def _refine_chunk(
+    gray: np.ndarray,
+    gray_pad: np.ndarray,
+    centers: np.ndarray,
+    method: RefinementMethod,
+    window: int,
+    polarity: Polarity,
+) -> np.ndarray:
+    r"""
+    Refine a chunk of valid points given in pixel-center coordinates.
+    """
+    if method == "corner":
+        corners = centers.reshape(-1, 1, 2).astype(np.float32).copy()
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 1e-3)
+        cv2.cornerSubPix(gray, corners, (window, window), (-1, -1), criteria)
+        return corners.reshape(-1, 2).astype(np.float64)
+
+    h, w = gray.shape
+    ci = np.rint(centers).astype(np.int64)
+    cx = np.clip(ci[:, 0], 0, w - 1)
+    cy = np.clip(ci[:, 1], 0, h - 1)
+    patches = _patches(gray_pad, cx, cy, window)
+
+    if method == "centroid":
+        offsets = _refine_centroid(patches, window, polarity)
+    else:
+        offsets = _refine_gaussian(patches, window, polarity)
+
+    return np.stack([cx, cy], axis=1) + offsets
+
+
+@traced(category="compute")
+def refine_points(
+    image: np.ndarray,
+    points: np.ndarray,
+    method: RefinementMethod = "centroid",
+    window: int = 5,
+    polarity: Polarity = "bright",
+    half_shift: bool = True,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 8192,
+) -> np.ndarray:
+    r"""
+    Refine many clicks at once to the center of the local target.
+
+    The points are processed in chunks: each chunk gathers all its windows with one
+    fancy-indexing operation (``centroid`` and ``gaussian``) or one ``cv2.cornerSubPix``
+    call (``corner``), and the chunks are spread over a thread pool.
+
+    Available methods:
+
+    - ``centroid``: intensity-weighted centroid of the window.
+    - ``gaussian``: sub-pixel Gaussian peak around the window maximum.
+    - ``corner``: saddle point / corner with ``cv2.cornerSubPix``.
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        Image with shape (H, W) or (H, W, 3) (BGR).
+    points : numpy.ndarray
+        Click coordinates with shape (N, 2). Rows with NaN (placeholders) are returned unchanged.
+    method : str
+        Refinement method.
+        Default is "centroid".
+    window : int
+        Half-size of the search window (the window is ``2 * window + 1`` pixels wide).
+        Default is 5.
+    polarity : str
+        "bright" for bright targets on a dark background, "dark" otherwise (ignored by ``corner``).
+        Default is "bright".
+    half_shift : bool
+        Coordinates convention of the points (True: (0,0) on the center of the first pixel).
+        Default is True.
+    max_workers : int, optional
+        Number of threads. If None, uses the number of CPUs.
+    chunk_size : int
+        Number of points per chunk.
+        Default is 8192.
+
+    Returns
+    -------
+    numpy.ndarray
+        Refined coordinates with shape (N, 2) in the same convention as the input.
+    """
+    if method not in REFINEMENT_METHODS:
+        raise ValueError(f"method must be one of {REFINEMENT_METHODS}")
+    if window < 1:
+        raise ValueError("window must be >= 1")
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    out = points.copy()
+    valid = np.flatnonzero(np.isfinite(points).all(axis=1))
+    if valid.size == 0:
+        return out
+
+    gray = to_gray_float(image)
+    gray_pad = None
+    if method != "corner":
+        gray_pad = cv2.copyMakeBorder(
+            gray, window, window, window, window, cv2.BORDER_REPLICATE
+        )
+
+    shift = 0.0 if half_shift else 0.5
+    centers = points[valid] - shift
+
+    chunks = [
+        centers[i : i + chunk_size] for i in range(0, centers.shape[0], chunk_size)
+    ]
+
+    if len(chunks) == 1:
+        results = [_refine_chunk(gray, gray_pad, chunks[0], method, window, polarity)]
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(
+                    lambda c: _refine_chunk(gray, gray_pad, c, method, window, polarity),
+                    chunks,
+                )
+            )
+
+    out[valid] = np.concatenate(results, axis=0) + shift
+    return out
+
+
+def refine_click_manager(
+    click_manager: ClickManager,
+    image: np.ndarray,
+    groups: Optional[Iterable[str]] = None,
+    indices: Optional[Iterable[int]] = None,
+    method: RefinementMethod = "centroid",
+    window: int = 5,
+    polarity: Polarity = "bright",
+    half_shift: bool = True,
+    max_workers: Optional[int] = None,
+) -> int:
+    r"""
+    Refine the clicks of a :class:`ClickManager` in place (raw positions are kept).
+
+    All the selected clicks of all the groups are refined in a single :func:`refine_points` call.
+
+    Parameters
+    ----------
+    click_manager : ClickManager
+        The clicks to refine.
+    image : numpy.ndarray
+        Image on which the clicks were made.
+    groups : Iterable[str], optional
+        Groups to refine. If None, all the groups are refined.
+    indices : Iterable[int], optional
+        Indices of the clicks to refine in each group. If None, all the clicks are refined.
+    method, window, polarity, half_shift, max_workers
+        See :func:`refine_points`.
+
+    Returns
+    -------
+    int
+        Number of refined clicks.
+    """
+    groups = list(click_manager.groups) if groups is None else list(groups)
+    selection = None if indices is None else list(indices)
+
+    slices = []
+    coords = []
+    for group in groups:
+        points = click_manager.groups[group]
+        idx = range(len(points)) if selection is None else selection
+        idx = [i for i in idx if points[i][0] is not None and points[i][1] is not None]
+        if not idx:
+            continue
+        slices.append((group, idx))
+        coords.extend(points[i] for i in idx)
+
+    if not coords:
+        return 0
+
+    refined = refine_points(
+        image,
+        np.array(coords, dtype=np.float64),
+        method=method,
+        window=window,
+        polarity=polarity,
+        half_shift=half_shift,
+        max_workers=max_workers,
+    )
+
+    start = 0
+    for group, idx in slices:
+        block = refined[start : start + len(idx)]
+        click_manager.refine_clicks(idx, [tuple(p) for p in block.tolist()], group)
+        start += len(idx)
+
+    return len(coords)
@@ -0,0 +1,400 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import sys
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .click_manager import ClickManager
+
+ImageSpec = Tuple[str, Tuple[int, ...], str]
+
+
+class SharedImage:
+    r"""
+    NumPy array stored in a :class:`multiprocessing.shared_memory.SharedMemory` block.
+
+    Another process attaches the block with :meth:`attach` and uses the same memory,
+    without copy or pickling. Write (or decode) the image directly into :attr:`array`
+    to avoid any copy, or use :meth:`from_array` (one copy).
+
+    Parameters
+    ----------
+    shape : Tuple[int, ...]
+        Shape of the array.
+    dtype : numpy.dtype
+        Data type of the array.
+    name : str, optional
+        Name of an existing block to attach. If None, a new block is created.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype, name: Optional[str] = None) -> None:
+        self.shape = tuple(int(n) for n in shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.owner = name is None
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "SharedImage":
+        r"""
+        Copy an array into a new shared block.
+        """
+        shared = cls(array.shape, array.dtype)
+        np.copyto(shared.array, array)
+        return shared
+
+    @classmethod
+    def attach(cls, spec: ImageSpec) -> "SharedImage":
+        r"""
+        Attach the block described by :attr:`spec` (in another process).
+        """
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    @property
+    def spec(self) -> ImageSpec:
+        r"""
+        Picklable description of the block: (name, shape, dtype).
+        """
+        return self._shm.name, self.shape, self.dtype.str
+
+    def close(self) -> None:
+        r"""
+        Release the view of this process (the block itself is kept, see :meth:`unlink`).
+        """
+        self.array = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        r"""
+        Free the block (once all the processes have closed it).
+        """
+        self._shm.unlink()
+
+
+# =========================================================
+# CHILD PROCESS
+# =========================================================
+
+
+def _serve(window, events: multiprocessing.Queue) -> None:
+    r"""
+    Stream the click events of the window into ``events``: a snapshot of each displayed
+    click manager, then its mutation events, then the final clicks when the window is closed.
+    """
+    current = [None]
+
+    def forward(event: dict) -> None:
+        events.put(("event", event))
+
+    def follow(click_manager: ClickManager) -> None:
+        if current[0] is not None:
+            current[0].remove_listener(forward)
+        current[0] = click_manager
+        events.put(("snapshot", click_manager.to_snapshot()))
+        click_manager.add_listener(forward)
+
+    window.click_manager_changed_signal.connect(follow)
+    window.closed_signal.connect(
+        lambda click_manager: events.put(("result", click_manager.to_snapshot()))
+    )
+    follow(window.click_manager)
+
+
+def _child_main(
+    image: Union[None, str, ImageSpec],
+    events: multiprocessing.Queue,
+    output: Optional[str],
+    log_file: Optional[str],
+    memory_budget: Optional[int],
+) -> None:
+    from PyQt5 import QtWidgets
+
+    from .click_image_app import ClickImageApp
+    from .image_cache import build_pyramid
+
+    shared = None
+    try:
+        app = QtWidgets.QApplication(sys.argv[:1])
+        if isinstance(image, tuple):
+            # The shared array is displayed in place: handed over with its pyramid, never copied
+            shared = SharedImage.attach(image)
+            window = ClickImageApp(None, output, log_file=log_file, memory_budget=memory_budget)
+            window.set_image(shared.array, levels=build_pyramid(shared.array))
+            window.update()
+        else:
+            window = ClickImageApp(image, output, log_file=log_file, memory_budget=memory_budget)
+        _serve(window, events)
+        window.show()
+        app.exec_()
+    except Exception as e:
+        events.put(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        events.put(("exit", None))
+        if shared is not None:
+            shared.close()
+
+
+# =========================================================
+# PARENT PROCESS
+# =========================================================
+
+
+class AnnotationProcess:
+    r"""
+    Handle of a GUI running in a child process (see :func:`run_detached`).
+
+    The clicks are streamed back while the user works: :meth:`poll` (non-blocking) or
+    :meth:`events` apply the received events to :attr:`click_manager`, a live copy of the
+    clicks displayed in the GUI. :meth:`wait` returns the final clicks when the window is closed.
+
+    Attributes
+    ----------
+    click_manager : ClickManager
+        Live copy of the displayed clicks.
+    result : ClickManager or None
+        Final clicks, once the window is closed (all the frames of a sequence, with a ``frame`` column).
+    error : str or None
+        Error of the child process, if any.
+    """
+
+    def __init__(
+        self,
+        process: multiprocessing.Process,
+        events: multiprocessing.Queue,
+        shared: Optional[SharedImage],
+        owns_shared: bool,
+    ) -> None:
+        self.process = process
+        self.click_manager = ClickManager()
+        self.result: Optional[ClickManager] = None
+        self.error: Optional[str] = None
+        self._events = events
+        self._shared = shared
+        self._owns_shared = owns_shared
+        self._finished = False
+
+    def _handle(self, kind: str, payload) -> Optional[dict]:
+        if kind == "event":
+            self.click_manager.apply_event(payload)
+            return payload
+        if kind == "snapshot":
+            self.click_manager = ClickManager.from_snapshot(payload)
+            return {"type": "snapshot", "snapshot": payload}
+        if kind == "result":
+            self.result = ClickManager.from_snapshot(payload)
+        elif kind == "error":
+            self.error = payload
+        elif kind == "exit":
+            self._finished = True
+            self._release()
+        return None
+
+    def _receive(self, timeout: Optional[float]) -> Optional[tuple]:
+        try:
+            return self._events.get(timeout=timeout) if timeout != 0 else self._events.get_nowait()
+        except queue.Empty:
+            if not self.process.is_alive() and not self._finished:
+                # Killed without its exit message
+                self._finished = True
+                self.error = self.error or f"GUI process exited with code {self.process.exitcode}"
+                self._release()
+            return None
+
+    def poll(self, timeout: float = 0.0) -> List[dict]:
+        r"""
+        Apply the received events to :attr:`click_manager`.
+
+        Parameters
+        ----------
+        timeout : float
+            Time to wait for a first event (seconds).
+            Default is 0 (non-blocking).
+
+        Returns
+        -------
+        List[dict]
+            The received click events (see :meth:`ClickManager.add_listener`); a new displayed
+            click manager is reported as ``{"type": "snapshot", "snapshot": ...}``.
+        """
+        received = []
+        message = None if self._finished else self._receive(timeout)
+        while message is not None:
+            event = self._handle(*message)
+            if event is not None:
+                received.append(event)
+            message = None if self._finished else self._receive(0)
+        return received
+
+    def events(self, timeout: Optional[float] = None) -> Iterator[dict]:
+        r"""
+        Yield the click events as they arrive, until the window is closed.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximal wait between two events (seconds). If None, waits indefinitely.
+        """
+        while not self._finished:
+            message = self._receive(0.1 if timeout is None else timeout)
+            if message is None:
+                if timeout is not None:
+                    return
+                continue
+            event = self._handle(*message)
+            if event is not None:
+                yield event
+
+    def is_running(self) -> bool:
+        r"""
+        True while the GUI is open.
+        """
+        return not self._finished and self.process.is_alive()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[ClickManager]:
+        r"""
+        Wait for the window to be closed and return the final clicks.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximal wait between two events (seconds). If None, waits indefinitely.
+
+        Returns
+        -------
+        ClickManager or None
+            The final clicks, or None if the timeout expired.
+
+        Raises
+        ------
+        RuntimeError
+            If the GUI process failed.
+        """
+        for _ in self.events(timeout):
+            pass
+        if not self._finished:
+            return None
+        self.process.join()
+        if self.error is not None and self.result is None:
+            raise RuntimeError(self.error)
+        return self.result
+
+    def terminate(self) -> None:
+        r"""
+        Close the GUI without waiting for the user (the unsent clicks are lost).
+        """
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.poll()
+        self._finished = True
+        self._release()
+
+    def _release(self) -> None:
+        if self._shared is not None and self._owns_shared:
+            self._shared.close()
+            self._shared.unlink()
+        self._shared = None
+
+    def __enter__(self) -> "AnnotationProcess":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.is_running():
+            self.terminate()
+        self._release()
+
+
+def run_detached(
+    image: Union[None, np.ndarray, str, SharedImage] = None,
+    output: Optional[str] = None,
+    log_file: Optional[str] = None,
+    memory_budget: Optional[int] = None,
+) -> AnnotationProcess:
+    r"""
+    Launch the ClickImageApp in a child process and return immediately.
+
+    An array is handed over through shared memory: the GUI displays it in place, it is
+    never pickled. Pass a :class:`SharedImage` (e.g. with the image decoded directly into
+    its array) to avoid any copy; a plain array is copied once into a shared block, which is
+    freed when the GUI exits. A path is opened by the child (through the image cache).
+
+    .. code-block:: python
+
+        from pyclickimage.remote import run_detached
+
+        session = run_detached(image)
+        for event in session.events():
+            print(event, session.click_manager.n_clicks)
+        clicks = session.wait()
+
+    Parameters
+    ----------
+    image : numpy.ndarray, str or SharedImage, optional
+        BGR or gray image, image file path, or shared image. If None, a blank window is shown.
+    output : str, optional
+        The path where the CSV file will be saved from the GUI.
+    log_file : str, optional
+        The path of a rotating log file mirroring the log panel.
+    memory_budget : int, optional
+        Memory budget of the GUI process (see :class:`pyclickimage.memory.MemoryGovernor`).
+
+    Returns
+    -------
+    AnnotationProcess
+        Handle streaming the clicks and returning the final ones.
+    """
+    shared = None
+    owns_shared = False
+    spec: Union[None, str, ImageSpec] = None
+    if isinstance(image, SharedImage):
+        shared = image
+        spec = image.spec
+    elif isinstance(image, np.ndarray):
+        shared = SharedImage.from_array(image)
+        owns_shared = True
+        spec = shared.spec
+    else:
+        spec = image
+
+    # Qt does not survive a fork: the GUI always runs in a spawned interpreter
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    process = context.Process(
+        target=_child_main,
+        args=(spec, events, output, log_file, memory_budget),
+        name="pyclickimage-gui",
+        daemon=True,
+    )
+    try:
+        process.start()
+    except Exception:
+        if owns_shared:
+            shared.close()
+            shared.unlink()
+        raise
+    return AnnotationProcess(process, events, shared, owns_shared)
@@ -20,24 +20,75 @@ import sys
 import numpy
 from PyQt5 import QtWidgets
 from .click_image_app import ClickImageApp
-from typing import Optional
+from .streaming import serve_clicks
+from typing import Optional, Union
 
 
-def run(image: Optional[numpy.ndarray] = None, output: Optional[str] = None) -> None:
+# Keeps the QApplication created by get_application alive
+_APPLICATION: Optional[QtWidgets.QApplication] = None
+
+
+def get_application() -> QtWidgets.QApplication:
+    r"""
+    Return the QApplication of the process, created on the first call and reused afterwards.
+    """
+    global _APPLICATION
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = _APPLICATION = QtWidgets.QApplication(sys.argv)
+    return app
+
+
+def run(
+    image: Optional[Union[numpy.ndarray, str]] = None,
+    output: Optional[str] = None,
+    record: Optional[str] = None,
+    log_file: Optional[str] = None,
+    memory_budget: Optional[int] = None,
+    serve: Optional[str] = None,
+) -> None:
     """
     Launch the ClickImageApp as a standalone application.
 
     Parameters
     ----------
-    image : numpy.ndarray, optional
-        The image to be displayed. If None, a blank window will be shown.
+    image : numpy.ndarray or str, optional
+        The image to be displayed, or the path of an image file (read through the image cache,
+        see :class:`pyclickimage.image_cache.ImageCache`). If None, a blank window will be shown.
         Default is None.
     output : str, optional
         The path where the CSV file will be saved. If None, the app will not save to a file.
         Default is None.
+    record : str, optional
+        The path where the interaction session will be recorded (JSON) for a later
+        replay with ``python -m pyclickimage.harness --replay``. If None, nothing is recorded.
+        Default is None.
+    log_file : str, optional
+        The path of a rotating log file mirroring the log panel. If None, the log is only displayed.
+        Default is None.
+    memory_budget : int, optional
+        Memory budget in bytes of the image buffers and caches (see :class:`pyclickimage.memory.MemoryGovernor`).
+        If None, uses the ``PYCLICKIMAGE_MEMORY_BUDGET`` environment variable (unlimited if not set).
+        Default is None.
+    serve : str, optional
+        Address where the click events are published for other processes
+        (``"unix:/tmp/clicks.sock"`` or ``"127.0.0.1:8765"``, see :class:`pyclickimage.streaming.ClickEventServer`).
+        If None, the events are not published.
+        Default is None.
     """
-    app = QtWidgets.QApplication(sys.argv)
-    window = ClickImageApp(image, output)
+    app = get_application()
+    window = ClickImageApp(image, output, log_file=log_file, memory_budget=memory_budget)
+    recorder = None
+    if record is not None:
+        # Imported on demand: the harness loads QtTest
+        from .harness import SessionRecorder
+
+        recorder = SessionRecorder(window)
+    if serve is not None:
+        serve_clicks(window, serve)
     window.show()
     # Wait before closing the app
     app.exec_()
+
+    if recorder is not None:
+        recorder.save(record)
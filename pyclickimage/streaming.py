@@ -0,0 +1,472 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import socket
+import selectors
+import threading
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .click_manager import ClickManager
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(address: Address) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    r"""
+    Parse a server address: ``"unix:/path/to.sock"``, ``"tcp:host:port"``, ``"host:port"``
+    or a (host, port) tuple.
+
+    Returns
+    -------
+    Tuple[int, Union[str, Tuple[str, int]]]
+        Socket family and socket address.
+    """
+    if isinstance(address, tuple):
+        return socket.AF_INET, (address[0], int(address[1]))
+    if address.startswith("unix:"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not available on this platform.")
+        return socket.AF_UNIX, address[len("unix:") :]
+    if address.startswith("tcp:"):
+        address = address[len("tcp:") :]
+    host, sep, port = address.rpartition(":")
+    if not sep:
+        raise ValueError(f"Invalid address '{address}' (expected unix:PATH or [tcp:]HOST:PORT).")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class _Client:
+    __slots__ = ["sock", "buffer", "resync"]
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.buffer = bytearray()
+        self.resync = True
+
+    def drop_pending(self) -> None:
+        r"""
+        Drop the unsent messages, except the one being sent (the stream stays line-aligned),
+        and send a snapshot next.
+        """
+        end = self.buffer.find(b"\n")
+        del self.buffer[end + 1 :]
+        self.resync = True
+
+
+class ClickEventServer:
+    r"""
+    Publish click events as JSON lines on a local Unix or TCP socket.
+
+    Protocol (one JSON object per line, ``seq`` numbers the events):
+
+    - ``{"type": "snapshot", "seq": n, "snapshot": {...}}``: the clicks after the event ``n``
+      (see :meth:`ClickManager.to_snapshot`), sent to each new subscriber and after a manager change;
+    - ``{"type": "batch", "first": a, "seq": b, "events": [...]}``: the events ``a`` to ``b``
+      (see :meth:`ClickManager.add_listener`).
+
+    :meth:`publish` only appends the event to a queue: the events are batched and written by a
+    worker thread every ``batch_interval`` seconds (or once ``max_batch`` events are pending), and a
+    batch is encoded once for all the subscribers. The server keeps a copy of the clicks to answer
+    late subscribers with a snapshot instead of the history.
+
+    Slow subscribers never block the publisher: each has an output buffer bounded by
+    ``max_buffer`` bytes. When it overflows, its pending data is dropped and, once the subscriber
+    has read what was already sent, it receives a fresh snapshot instead of the missed batches.
+
+    Parameters
+    ----------
+    address : str or Tuple[str, int]
+        Listening address (see :func:`parse_address`). TCP port 0 picks a free port.
+    batch_interval : float
+        Maximal delay of an event (seconds).
+        Default is 0.05.
+    max_batch : int
+        Number of pending events triggering an immediate batch.
+        Default is 512.
+    max_buffer : int
+        Maximal pending output of a subscriber (bytes).
+        Default is 4 MiB.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        batch_interval: float = 0.05,
+        max_batch: int = 512,
+        max_buffer: int = 4 * 1024 * 1024,
+    ) -> None:
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self.max_buffer = max_buffer
+
+        self._family, sockaddr = parse_address(address)
+        self._path = sockaddr if self._family != socket.AF_INET else None
+        self._listener = socket.socket(self._family, socket.SOCK_STREAM)
+        if self._family == socket.AF_UNIX:
+            if os.path.exists(sockaddr):
+                os.unlink(sockaddr)
+        else:
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(sockaddr)
+        self._listener.listen()
+        self._listener.setblocking(False)
+
+        self._lock = threading.Lock()
+        self._mirror = ClickManager()
+        self._seq = 0
+        self._pending: List[dict] = []
+        self._reset = False
+        self._clients: List[_Client] = []
+
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._stopped = False
+        self._thread = threading.Thread(target=self._serve, name="click-event-server", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self) -> Address:
+        r"""
+        Actual listening address (``"unix:PATH"`` or (host, port)).
+        """
+        sockaddr = self._listener.getsockname()
+        if self._family == socket.AF_UNIX:
+            return f"unix:{sockaddr}"
+        return sockaddr[0], sockaddr[1]
+
+    @property
+    def n_subscribers(self) -> int:
+        r"""
+        Number of connected subscribers.
+        """
+        with self._lock:
+            return len(self._clients)
+
+    # =========================================================
+    # PUBLISHING
+    # =========================================================
+
+    def publish(self, event: dict) -> None:
+        r"""
+        Queue a click event (a :meth:`ClickManager.add_listener` callback).
+        """
+        with self._lock:
+            self._mirror.apply_event(event)
+            self._seq += 1
+            self._pending.append(event)
+            flush = len(self._pending) >= self.max_batch
+        if flush:
+            self._wake()
+
+    def reset(self, click_manager: ClickManager) -> None:
+        r"""
+        Replace the published clicks (e.g. another frame displayed): the subscribers receive a snapshot.
+        """
+        snapshot = click_manager.to_snapshot()
+        with self._lock:
+            self._mirror = ClickManager.from_snapshot(snapshot)
+            self._pending = []
+            self._reset = True
+        self._wake()
+
+    def attach(self, click_manager: ClickManager) -> None:
+        r"""
+        Publish the events of a click manager (and send its snapshot).
+        """
+        self.reset(click_manager)
+        click_manager.add_listener(self.publish)
+
+    def detach(self, click_manager: ClickManager) -> None:
+        r"""
+        Stop publishing the events of a click manager.
+        """
+        try:
+            click_manager.remove_listener(self.publish)
+        except ValueError:
+            pass
+
+    def close(self) -> None:
+        r"""
+        Send the pending events, then disconnect the subscribers and stop the server.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake()
+        self._thread.join()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    # =========================================================
+    # WORKER THREAD
+    # =========================================================
+
+    def _snapshot_message(self) -> bytes:
+        return _encode({"type": "snapshot", "seq": self._seq, "snapshot": self._mirror.to_snapshot()})
+
+    def _take(self) -> Tuple[Optional[bytes], Optional[bytes]]:
+        r"""
+        Take the pending events: (encoded batch or None, encoded snapshot for resyncing clients or None).
+        """
+        with self._lock:
+            batch = None
+            if self._reset:
+                self._reset = False
+                for client in self._clients:
+                    client.drop_pending()
+            elif self._pending:
+                first = self._seq - len(self._pending) + 1
+                batch = _encode(
+                    {"type": "batch", "first": first, "seq": self._seq, "events": self._pending}
+                )
+            self._pending = []
+            waiting = any(c.resync and not c.buffer for c in self._clients)
+            snapshot = self._snapshot_message() if waiting else None
+        return batch, snapshot
+
+    def _serve(self) -> None:
+        selector = selectors.DefaultSelector()
+        selector.register(self._listener, selectors.EVENT_READ, "accept")
+        selector.register(self._wake_r, selectors.EVENT_READ, "wake")
+
+        while True:
+            for key, mask in selector.select(self.batch_interval):
+                if key.data == "accept":
+                    self._accept(selector)
+                elif key.data == "wake":
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    client = key.data
+                    if mask & selectors.EVENT_READ and not self._discard_input(client):
+                        self._drop(selector, client)
+                        continue
+                    if mask & selectors.EVENT_WRITE:
+                        self._send(selector, client)
+
+            batch, snapshot = self._take()
+            for client in list(self._clients):
+                if client.resync:
+                    if not client.buffer:
+                        # The snapshot is always queued: a slow subscriber cannot loop on resyncs
+                        client.resync = False
+                        self._queue(client, snapshot, force=True)
+                elif batch is not None:
+                    self._queue(client, batch)
+                self._send(selector, client)
+
+            if self._stopped:
+                break
+
+        for client in list(self._clients):
+            # Last events: short blocking write
+            try:
+                client.sock.settimeout(1.0)
+                client.sock.sendall(client.buffer)
+            except OSError:
+                pass
+            self._drop(selector, client)
+        selector.close()
+        self._listener.close()
+        self._wake_r.close()
+        self._wake_w.close()
+        if self._path is not None:
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+
+    def _accept(self, selector) -> None:
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        client = _Client(sock)
+        selector.register(sock, selectors.EVENT_READ, client)
+        with self._lock:
+            self._clients.append(client)
+
+    def _queue(self, client: _Client, data: Optional[bytes], force: bool = False) -> None:
+        if data is None:
+            return
+        if not force and len(client.buffer) + len(data) > self.max_buffer:
+            # Slow subscriber: drop what it has not read, it will catch up with a snapshot
+            client.drop_pending()
+            return
+        client.buffer += data
+
+    def _send(self, selector, client: _Client) -> None:
+        if client not in self._clients:
+            return
+        if client.buffer:
+            try:
+                sent = client.sock.send(client.buffer)
+                del client.buffer[:sent]
+            except BlockingIOError:
+                pass
+            except OSError:
+                self._drop(selector, client)
+                return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.buffer else 0)
+        selector.modify(client.sock, events, client)
+
+    def _discard_input(self, client: _Client) -> bool:
+        try:
+            return bool(client.sock.recv(4096))
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
+    def _drop(self, selector, client: _Client) -> None:
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+        try:
+            selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+    def __enter__(self) -> "ClickEventServer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def serve_clicks(window, address: Address, **kwargs) -> ClickEventServer:
+    r"""
+    Publish the clicks of a :class:`ClickImageApp` (see :class:`ClickEventServer`).
+
+    The server follows the displayed click manager (clicks loaded, frame changed) and is
+    closed with the window.
+
+    Parameters
+    ----------
+    window : ClickImageApp
+        The application window.
+    address : str or Tuple[str, int]
+        Listening address (see :func:`parse_address`).
+    **kwargs
+        Other parameters of :class:`ClickEventServer`.
+
+    Returns
+    -------
+    ClickEventServer
+        The server.
+    """
+    server = ClickEventServer(address, **kwargs)
+    current = [window.click_manager]
+
+    def follow(click_manager: ClickManager) -> None:
+        server.detach(current[0])
+        current[0] = click_manager
+        server.attach(click_manager)
+
+    server.attach(window.click_manager)
+    window.click_manager_changed_signal.connect(follow)
+    window.closed_signal.connect(lambda _: server.close())
+    return server
+
+
+class ClickEventClient:
+    r"""
+    Subscriber of a :class:`ClickEventServer`, keeping a copy of the published clicks.
+
+    Iterating yields the received messages (snapshots and batches) after applying them
+    to :attr:`click_manager`.
+
+    .. code-block:: python
+
+        with ClickEventClient("unix:/tmp/clicks.sock") as client:
+            for message in client:
+                print(client.seq, client.click_manager.n_clicks)
+
+    Parameters
+    ----------
+    address : str or Tuple[str, int]
+        Server address (see :func:`parse_address`).
+    timeout : float, optional
+        Socket timeout (seconds). If None, the reads block.
+    """
+
+    def __init__(self, address: Address, timeout: Optional[float] = None) -> None:
+        family, sockaddr = parse_address(address)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(sockaddr)
+        self._file = self._sock.makefile("rb")
+        self.click_manager = ClickManager()
+        self.seq = 0
+
+    def receive(self) -> Optional[dict]:
+        r"""
+        Read and apply the next message. Returns None when the server is closed.
+
+        Raises
+        ------
+        socket.timeout
+            If no message arrives within the timeout.
+        """
+        line = self._file.readline()
+        if not line:
+            return None
+        message = json.loads(line)
+        if message["type"] == "snapshot":
+            self.click_manager = ClickManager.from_snapshot(message["snapshot"])
+        else:
+            for event in message["events"]:
+                self.click_manager.apply_event(event)
+        self.seq = message["seq"]
+        return message
+
+    def __iter__(self) -> Iterator[dict]:
+        while True:
+            message = self.receive()
+            if message is None:
+                return
+            yield message
+
+    def close(self) -> None:
+        r"""
+        Disconnect.
+        """
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "ClickEventClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,148 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Point data column storing the stroke of each click (None for the single clicks)
+STROKE_COLUMN = "stroke"
+
+
+def segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    r"""
+    Distances of points with shape (N, 2) to the segment [a, b].
+    """
+    ab = b - a
+    length2 = float(ab @ ab)
+    if length2 == 0.0:
+        return np.hypot(points[:, 0] - a[0], points[:, 1] - a[1])
+    t = np.clip((points - a) @ ab / length2, 0.0, 1.0)
+    closest = a + t[:, None] * ab
+    return np.hypot(points[:, 0] - closest[:, 0], points[:, 1] - closest[:, 1])
+
+
+class StrokeSimplifier:
+    r"""
+    Online simplification of a freehand stroke, sample by sample.
+
+    A sample is dropped while all the samples since the last vertex stay within ``tolerance``
+    of the segment from the last vertex to the new sample; otherwise the previous sample
+    becomes a vertex (an online variant of the Douglas–Peucker criterion, without look-ahead).
+    Samples closer than ``min_distance`` to the previous one (mouse jitter) are ignored,
+    so the polyline is within ``tolerance + min_distance`` of all the samples.
+
+    The cost of a sample is proportional to the number of samples since the last vertex,
+    bounded by ``max_pending``.
+
+    Parameters
+    ----------
+    tolerance : float
+        Maximal distance between a dropped sample and the polyline (pixels).
+        Default is 1.0.
+    min_distance : float, optional
+        Minimal distance between two samples (pixels). If None, half the tolerance.
+    max_pending : int
+        Maximal number of samples between two vertices.
+        Default is 256.
+    """
+
+    def __init__(
+        self, tolerance: float = 1.0, min_distance: Optional[float] = None, max_pending: int = 256
+    ) -> None:
+        self.tolerance = float(tolerance)
+        self.min_distance = self.tolerance / 2 if min_distance is None else float(min_distance)
+        self.max_pending = max_pending
+        self.n_samples = 0
+        self._vertices: List[Tuple[float, float]] = []
+        self._pending: List[Tuple[float, float]] = []
+
+    def add(self, x: float, y: float) -> bool:
+        r"""
+        Add a sample.
+
+        Returns
+        -------
+        bool
+            True if a vertex was kept (the first sample, or the sample before this one).
+        """
+        if not self._vertices:
+            self._vertices.append((x, y))
+            self.n_samples = 1
+            return True
+
+        last = self._pending[-1] if self._pending else self._vertices[-1]
+        if np.hypot(x - last[0], y - last[1]) < self.min_distance:
+            return False
+        self.n_samples += 1
+
+        if self._pending and len(self._pending) < self.max_pending:
+            distances = segment_distances(
+                np.array(self._pending), np.array(self._vertices[-1]), np.array((x, y))
+            )
+            if distances.max() <= self.tolerance:
+                self._pending.append((x, y))
+                return False
+        if not self._pending:
+            self._pending.append((x, y))
+            return False
+
+        self._vertices.append(self._pending[-1])
+        self._pending = [(x, y)]
+        return True
+
+    @property
+    def vertices(self) -> List[Tuple[float, float]]:
+        r"""
+        Kept vertices (without the last sample).
+        """
+        return list(self._vertices)
+
+    @property
+    def points(self) -> np.ndarray:
+        r"""
+        Simplified stroke: the kept vertices and the last sample, with shape (N, 2).
+        """
+        points = self._vertices + self._pending[-1:]
+        return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+
+def stroke_paths(
+    points: List[Tuple[Optional[float], Optional[float]]], strokes: List[Optional[float]]
+) -> Dict[int, List[Tuple[float, float]]]:
+    r"""
+    Group the clicks of a group by stroke (see :data:`STROKE_COLUMN`), in click order.
+
+    Parameters
+    ----------
+    points : List[Tuple[Optional[float], Optional[float]]]
+        Clicks of the group.
+    strokes : List[Optional[float]]
+        Stroke of each click (None for the single clicks).
+
+    Returns
+    -------
+    Dict[int, List[Tuple[float, float]]]
+        Vertices of each stroke.
+    """
+    paths: Dict[int, List[Tuple[float, float]]] = {}
+    for (x, y), stroke in zip(points, strokes):
+        if stroke is None or x is None or y is None:
+            continue
+        paths.setdefault(int(stroke), []).append((x, y))
+    return paths
@@ -0,0 +1,231 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from .refinement import to_gray_float
+from .feature_index import subpixel_peak
+from .tracing import traced
+
+
+def extract_template(
+    gray: np.ndarray, center: Tuple[float, float], half_size: int
+) -> np.ndarray:
+    r"""
+    Extract the square template of side ``2 * half_size + 1`` centered on a pixel.
+
+    Parameters
+    ----------
+    gray : numpy.ndarray
+        Gray image with shape (H, W).
+    center : Tuple[float, float]
+        Template center (x, y) in pixel-center coordinates.
+    half_size : int
+        Half side length of the template.
+
+    Returns
+    -------
+    numpy.ndarray
+        The template.
+
+    Raises
+    ------
+    ValueError
+        If the template does not fit in the image.
+    """
+    h, w = gray.shape
+    cx, cy = int(round(center[0])), int(round(center[1]))
+    if cx - half_size < 0 or cy - half_size < 0 or cx + half_size >= w or cy + half_size >= h:
+        raise ValueError("The template does not fit in the image (click too close to the border).")
+    return np.ascontiguousarray(
+        gray[cy - half_size : cy + half_size + 1, cx - half_size : cx + half_size + 1]
+    )
+
+
+def _match_tile(
+    gray: np.ndarray,
+    template: np.ndarray,
+    bounds: Tuple[int, int, int, int],
+    threshold: float,
+    min_distance: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    r"""
+    Match the template on one tile and return its thresholded local maxima.
+
+    ``bounds`` are the result positions (template top-left corners) handled by the tile.
+    """
+    x0, y0, x1, y1 = bounds
+    th, tw = template.shape
+    region = gray[y0 : y1 + th - 1, x0 : x1 + tw - 1]
+    score = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)
+
+    size = 2 * min_distance + 1
+    dilated = cv2.dilate(score, np.ones((size, size), np.uint8))
+    ys, xs = np.nonzero((score >= dilated) & (score >= threshold))
+    if ys.size == 0:
+        return np.zeros((0, 2)), np.zeros(0)
+
+    points = subpixel_peak(score, ys, xs)
+    points[:, 0] += x0 + (tw - 1) / 2
+    points[:, 1] += y0 + (th - 1) / 2
+    return points, score[ys, xs]
+
+
+def non_maximum_suppression(
+    points: np.ndarray, scores: np.ndarray, min_distance: float
+) -> np.ndarray:
+    r"""
+    Greedy non-maximum suppression: keep the best points at least ``min_distance`` apart.
+
+    Parameters
+    ----------
+    points : numpy.ndarray
+        Candidate positions with shape (N, 2).
+    scores : numpy.ndarray
+        Candidate scores with shape (N,).
+    min_distance : float
+        Minimal distance between two kept points.
+
+    Returns
+    -------
+    numpy.ndarray
+        Indices of the kept candidates, by decreasing score.
+    """
+    order = np.argsort(-scores, kind="stable")
+    cell = max(float(min_distance), 1e-6)
+    d2 = min_distance * min_distance
+    grid: Dict[Tuple[int, int], List[Tuple[float, float]]] = {}
+    kept = []
+
+    for i in order.tolist():
+        x, y = float(points[i, 0]), float(points[i, 1])
+        cx, cy = int(math.floor(x / cell)), int(math.floor(y / cell))
+        conflict = False
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for px, py in grid.get((gx, gy), ()):
+                    if (px - x) ** 2 + (py - y) ** 2 < d2:
+                        conflict = True
+                        break
+                if conflict:
+                    break
+            if conflict:
+                break
+        if not conflict:
+            grid.setdefault((cx, cy), []).append((x, y))
+            kept.append(i)
+
+    return np.array(kept, dtype=np.int64)
+
+
+@traced(category="compute")
+def find_template_matches(
+    image: np.ndarray,
+    center: Tuple[float, float],
+    half_size: int = 15,
+    threshold: float = 0.8,
+    min_distance: Optional[int] = None,
+    tile_size: int = 1024,
+    max_workers: Optional[int] = None,
+    cancel_event: Optional[threading.Event] = None,
+    progress: Optional[Callable[[float], None]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    r"""
+    Find all the occurrences of the patch around ``center`` in the whole image.
+
+    The normalized cross-correlation (``cv2.matchTemplate`` with ``TM_CCOEFF_NORMED``, computed in the
+    Fourier domain by OpenCV for large templates) is evaluated on overlapping tiles in a thread pool.
+    The local maxima above ``threshold`` are refined to sub-pixel positions and merged
+    with a non-maximum suppression.
+
+    Parameters
+    ----------
+    image : numpy.ndarray
+        Image with shape (H, W) or (H, W, 3) (BGR).
+    center : Tuple[float, float]
+        Example target (x, y) in pixel-center coordinates ((0, 0) on the center of the first pixel).
+    half_size : int
+        Half side length of the template.
+        Default is 15.
+    threshold : float
+        Minimal normalized correlation in [-1, 1].
+        Default is 0.8.
+    min_distance : int, optional
+        Minimal distance between two matches. If None, uses ``half_size``.
+    tile_size : int
+        Side length of the tiles.
+        Default is 1024.
+    max_workers : int, optional
+        Number of threads. If None, uses the number of CPUs.
+    cancel_event : threading.Event, optional
+        If set during the matching, ``concurrent.futures.CancelledError`` is raised.
+    progress : Callable[[float], None], optional
+        Called with the fraction of processed tiles.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray]
+        Match positions with shape (N, 2) in pixel-center coordinates and their scores,
+        by decreasing score.
+    """
+    gray = to_gray_float(image)
+    template = extract_template(gray, center, half_size)
+    min_distance = half_size if min_distance is None else int(min_distance)
+
+    h, w = gray.shape
+    th, tw = template.shape
+    rh, rw = h - th + 1, w - tw + 1
+
+    tiles = [
+        (x, y, min(rw, x + tile_size), min(rh, y + tile_size))
+        for y in range(0, rh, tile_size)
+        for x in range(0, rw, tile_size)
+    ]
+
+    points, scores = [], []
+    workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_match_tile, gray, template, bounds, threshold, min_distance)
+            for bounds in tiles
+        ]
+        for i, future in enumerate(futures):
+            if cancel_event is not None and cancel_event.is_set():
+                for f in futures:
+                    f.cancel()
+                raise CancelledError()
+            p, s = future.result()
+            points.append(p)
+            scores.append(s)
+            if progress is not None:
+                progress((i + 1) / len(futures))
+
+    points = np.concatenate(points, axis=0)
+    scores = np.concatenate(scores, axis=0)
+    if scores.size == 0:
+        return points, scores
+
+    kept = non_maximum_suppression(points, scores, min_distance)
+    return points[kept], scores[kept]
@@ -0,0 +1,271 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import functools
+import threading
+from collections import deque
+from typing import Callable, List, Literal, Optional
+
+import numpy as np
+
+from .click_manager import ClickManager, _as_points
+
+CommitListener = Callable[[int], None]
+
+# Methods mutating the groups (can be posted)
+_MUTATIONS = (
+    "add_group",
+    "set_group",
+    "remove_group",
+    "rename_group",
+    "add_click",
+    "to_half_shift_on",
+    "to_half_shift_off",
+    "set_click",
+    "remove_click",
+    "clear_group",
+    "add_clicks",
+    "remove_clicks",
+    "move_clicks",
+    "replace_group",
+    "set_point_data",
+    "remove_point_data",
+    "refine_clicks",
+    "reset_refinement",
+    "merge",
+    "apply_event",
+    "add_transform",
+    "remove_transform",
+)
+
+# Methods reading the groups
+_READS = (
+    "extract_group",
+    "get_click",
+    "group_array",
+    "group_stats",
+    "stats",
+    "point_data_columns",
+    "get_point_data",
+    "extract_raw_group",
+    "transform_group",
+    "calibrated_columns",
+    "to_snapshot",
+    "to_dict",
+    "save_to_csv",
+)
+
+
+def _locked(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class ThreadSafeClickManager(ClickManager):
+    r"""
+    :class:`ClickManager` shared between the GUI thread and worker threads.
+
+    Two mechanisms are combined:
+
+    - **Consistent reads**: all the methods hold a reentrant lock, and :attr:`lock` groups
+      several calls (e.g. the markers and the table of one refresh) into one consistent view.
+      :meth:`to_snapshot` is a consistent copy for readers of other threads.
+    - **Single writer**: worker threads (e.g. detectors) do not mutate the manager, they
+      :meth:`post` their mutations to a queue. The owner thread applies all the queued
+      mutations with :meth:`commit`, in order and under one lock acquisition, so the
+      listeners (Qt views) are only called from the owner thread and the commit listeners
+      are notified once per batch.
+
+    A worker thread never waits for the owner thread: posting is an append and a flag
+    set under a short lock. The owner thread is told that mutations are waiting with the
+    ``wakeup`` callback (see :meth:`set_wakeup`), called once per commit by the first producer
+    posting after the previous commit started.
+
+    .. code-block:: python
+
+        # worker thread
+        click_manager.post_clicks(points, "detections")
+
+        # owner thread (e.g. a queued Qt signal connected to the wakeup)
+        if click_manager.commit():
+            window.update()
+
+    Parameters
+    ----------
+    precision_mode : str
+        Precision mode for stored coordinates. Either "float" or "int".
+        Default is "float".
+    """
+
+    __slots__ = ["_lock", "_queue", "_wakeup", "_commit_listeners", "_wakeup_lock", "_scheduled"]
+
+    def __init__(self, precision_mode: Literal["float", "int"] = "float") -> None:
+        self._lock = threading.RLock()
+        self._queue: deque = deque()
+        self._wakeup: Optional[Callable[[], None]] = None
+        self._commit_listeners: List[CommitListener] = []
+        # True between a wakeup and the start of the commit it schedules
+        self._wakeup_lock = threading.Lock()
+        self._scheduled = False
+        super().__init__(precision_mode=precision_mode)
+
+    @property
+    def lock(self) -> threading.RLock:
+        r"""
+        Reentrant lock held by every method: ``with click_manager.lock:`` makes several reads consistent.
+        """
+        return self._lock
+
+    # =========================================================
+    # SINGLE-WRITER QUEUE
+    # =========================================================
+
+    def post(self, method: str, *args, **kwargs) -> None:
+        r"""
+        Queue a mutation (thread-safe), applied by the owner thread at the next :meth:`commit`.
+
+        Parameters
+        ----------
+        method : str
+            Name of the mutating method (e.g. ``"add_click"``).
+        *args, **kwargs
+            Arguments of the method.
+        """
+        if method not in _MUTATIONS:
+            raise ValueError(f"'{method}' is not a mutation of the click manager.")
+        self._queue.append((method, args, kwargs))
+        self._schedule()
+
+    def _schedule(self) -> None:
+        # Call the wakeup unless a commit is already scheduled (the flag is cleared by commit)
+        with self._wakeup_lock:
+            wakeup = self._wakeup
+            if wakeup is None or self._scheduled:
+                return
+            self._scheduled = True
+        wakeup()
+
+    def post_click(self, x: Optional[float], y: Optional[float], group_name: Optional[str] = None) -> None:
+        r"""
+        Queue a click (see :meth:`ClickManager.add_click`).
+        """
+        self.post("add_click", x, y, group_name)
+
+    def post_clicks(self, points: np.ndarray, group_name: Optional[str] = None) -> None:
+        r"""
+        Queue clicks as one mutation (see :meth:`ClickManager.add_clicks`).
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Points with shape (N, 2), NaN for the placeholders.
+        group_name : Optional[str]
+            Group name. If None, uses the current group at the time of the commit.
+            Default is None.
+
+        Raises
+        ------
+        ValueError
+            If the shape is not (N, 2) or a coordinate is infinite.
+        """
+        # Validated in the producer thread, and copied: the producer may reuse its buffer
+        self.post("add_clicks", _as_points(points), group_name)
+
+    @property
+    def pending(self) -> int:
+        r"""
+        Number of queued mutations.
+        """
+        return len(self._queue)
+
+    def set_wakeup(self, wakeup: Optional[Callable[[], None]]) -> None:
+        r"""
+        Set the function called (from the producer thread) when mutations are posted and no commit is scheduled.
+
+        With a GUI, it emits a Qt signal connected to a slot calling :meth:`commit`
+        (the queued connection runs the slot in the GUI thread).
+        """
+        with self._wakeup_lock:
+            self._wakeup = wakeup
+            self._scheduled = False
+        if self._queue:
+            self._schedule()
+
+    def add_commit_listener(self, listener: CommitListener) -> None:
+        r"""
+        Register a callback notified once per :meth:`commit` with the number of applied mutations.
+        """
+        self._commit_listeners.append(listener)
+
+    def remove_commit_listener(self, listener: CommitListener) -> None:
+        r"""
+        Unregister a callback added with :meth:`add_commit_listener`.
+        """
+        self._commit_listeners.remove(listener)
+
+    def commit(self) -> int:
+        r"""
+        Apply the queued mutations, in order (to be called by the owner thread).
+
+        The mutations posted during the commit are left for the next one (the wakeup is
+        called again). A mutation that raises is skipped (and reported with the exception once the others are applied).
+
+        Returns
+        -------
+        int
+            Number of applied mutations.
+
+        Raises
+        ------
+        Exception
+            The first error raised by a mutation.
+        """
+        # Cleared before draining: a mutation posted from now on schedules the next commit
+        with self._wakeup_lock:
+            self._scheduled = False
+        n = len(self._queue)
+        if n == 0:
+            return 0
+        applied = 0
+        error = None
+        with self._lock:
+            for _ in range(n):
+                method, args, kwargs = self._queue.popleft()
+                try:
+                    getattr(self, method)(*args, **kwargs)
+                    applied += 1
+                except Exception as e:
+                    error = error or e
+        if applied:
+            for listener in list(self._commit_listeners):
+                listener(applied)
+        if self._queue:
+            # Posted while committing: make sure the next commit is scheduled
+            self._schedule()
+        if error is not None:
+            raise error
+        return applied
+
+
+# All the public methods reading or mutating the groups hold the lock
+for _name in _MUTATIONS + _READS:
+    setattr(ThreadSafeClickManager, _name, _locked(getattr(ClickManager, _name)))
@@ -0,0 +1,252 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+from collections import deque
+from contextlib import nullcontext
+from typing import Callable, Optional
+
+TRACE_ENV_VAR = "PYCLICKIMAGE_TRACE"
+
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    r"""
+    Context manager recording one complete ("X") trace event.
+    """
+
+    __slots__ = ["_tracer", "_name", "_category", "_args", "_t0"]
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Optional[dict]):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._tracer.complete(
+            self._name, self._category, self._t0, time.perf_counter(), self._args
+        )
+        return False
+
+
+class Tracer:
+    r"""
+    Collect spans in memory and write them as a Chrome/Perfetto trace-event JSON file.
+
+    The file can be opened with ``chrome://tracing`` or https://ui.perfetto.dev.
+
+    Parameters
+    ----------
+    path : str
+        Output JSON file path.
+    max_events : int
+        Maximum number of events kept in memory (the oldest are dropped).
+        Default is 1000000.
+    """
+
+    def __init__(self, path: str, max_events: int = 1_000_000) -> None:
+        self.path = path
+        self.pid = os.getpid()
+        self._events = deque(maxlen=max_events)
+        self._threads = {}
+        self._t_origin = time.perf_counter()
+
+    def span(self, name: str, category: str = "pipeline", args: Optional[dict] = None):
+        r"""
+        Return a context manager recording a span named ``name``.
+        """
+        return _Span(self, name, category, args)
+
+    def complete(
+        self,
+        name: str,
+        category: str,
+        t_start: float,
+        t_end: float,
+        args: Optional[dict] = None,
+    ) -> None:
+        r"""
+        Record a complete event from two ``time.perf_counter()`` values.
+        """
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (t_start - self._t_origin) * 1e6,
+            "dur": (t_end - t_start) * 1e6,
+            "pid": self.pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def instant(self, name: str, category: str = "pipeline", args: Optional[dict] = None) -> None:
+        r"""
+        Record an instant ("i") event.
+        """
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "t",
+            "ts": (time.perf_counter() - self._t_origin) * 1e6,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def write(self) -> None:
+        r"""
+        Write the collected events to :attr:`path`.
+        """
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self._threads.items())
+        ]
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": metadata + list(self._events), "displayTimeUnit": "ms"},
+                f,
+            )
+
+
+_tracer: Optional[Tracer] = None
+
+
+def start_tracing(path: str, max_events: int = 1_000_000) -> Tracer:
+    r"""
+    Start collecting spans, written to ``path`` by :func:`stop_tracing` or at exit.
+
+    Parameters
+    ----------
+    path : str
+        Output JSON file path.
+    max_events : int
+        Maximum number of events kept in memory.
+        Default is 1000000.
+
+    Returns
+    -------
+    Tracer
+        The active tracer.
+    """
+    global _tracer
+    if _tracer is not None:
+        stop_tracing()
+    _tracer = Tracer(path, max_events=max_events)
+    return _tracer
+
+
+def stop_tracing() -> None:
+    r"""
+    Stop the active tracer (if any) and write its trace file.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.write()
+
+
+def current_tracer() -> Optional[Tracer]:
+    r"""
+    Return the active tracer, or None if tracing is disabled.
+    """
+    return _tracer
+
+
+def span(name: str, category: str = "pipeline", args: Optional[dict] = None):
+    r"""
+    Return a context manager recording a span if tracing is enabled (no-op otherwise).
+
+    .. code-block:: python
+
+        with span("decode", "io"):
+            image = cv2.imread(path)
+
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = "pipeline") -> Callable:
+    r"""
+    Decorator recording each call of the function as a span.
+
+    When tracing is disabled, the wrapper only tests a module global before calling the function.
+
+    Parameters
+    ----------
+    name : str, optional
+        Span name. If None, the qualified name of the function is used.
+    category : str
+        Span category.
+        Default is "pipeline".
+    """
+
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.complete(label, category, t0, time.perf_counter())
+
+        return wrapper
+
+    return decorator
+
+
+def _start_from_env() -> None:
+    path = os.environ.get(TRACE_ENV_VAR)
+    if path:
+        start_tracing(path)
+
+
+atexit.register(stop_tracing)
+_start_from_env()
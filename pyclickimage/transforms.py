@@ -0,0 +1,290 @@
+"""
+pyclickimage - Python library to select points on a image [pyqt5 GUI]
+Copyright (C) 2025-2026 Artezaru, artezaru.github@proton.me
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import cv2
+
+
+def _as_points(points) -> np.ndarray:
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+class CoordinateTransform:
+    r"""
+    Mapping of pixel coordinates to calibrated coordinates (base class).
+
+    :meth:`apply` maps a whole (N, 2) array in one vectorized call. NaN rows (placeholders)
+    stay NaN. The input coordinates follow the OpenCV convention ((0, 0) on the center of the
+    first pixel, the default half-shift convention of the GUI).
+
+    Subclasses implement :meth:`_apply` and :meth:`to_dict`.
+    """
+
+    kind = ""
+
+    def apply(self, points) -> np.ndarray:
+        r"""
+        Map points to calibrated coordinates.
+
+        Parameters
+        ----------
+        points : array_like
+            Points with shape (N, 2).
+
+        Returns
+        -------
+        numpy.ndarray
+            Calibrated points with shape (N, 2) (NaN where the input is NaN).
+        """
+        points = _as_points(points)
+        out = np.full_like(points, np.nan)
+        valid = np.isfinite(points).all(axis=1)
+        if valid.any():
+            out[valid] = self._apply(points[valid])
+        return out
+
+    def _apply(self, points: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def to_dict(self) -> dict:
+        r"""
+        JSON-serializable description (see :func:`transform_from_dict`).
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+class AffineTransform(CoordinateTransform):
+    r"""
+    Affine mapping ``(x, y) -> A @ (x, y, 1)``.
+
+    Parameters
+    ----------
+    matrix : array_like
+        Matrix with shape (2, 3) (or (3, 3) with a last row (0, 0, 1)).
+    """
+
+    kind = "affine"
+
+    def __init__(self, matrix) -> None:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape == (3, 3):
+            matrix = matrix[:2]
+        if matrix.shape != (2, 3):
+            raise ValueError(f"Affine matrix must have shape (2, 3), got {matrix.shape}.")
+        self.matrix = matrix
+
+    @classmethod
+    def from_scale(cls, scale_x: float, scale_y: Optional[float] = None, origin=(0.0, 0.0)):
+        r"""
+        Scaling (e.g. millimeters per pixel) around an origin pixel.
+        """
+        scale_y = scale_x if scale_y is None else scale_y
+        ox, oy = origin
+        return cls([[scale_x, 0.0, -scale_x * ox], [0.0, scale_y, -scale_y * oy]])
+
+    def _apply(self, points: np.ndarray) -> np.ndarray:
+        return points @ self.matrix[:, :2].T + self.matrix[:, 2]
+
+    def to_dict(self) -> dict:
+        return {"type": self.kind, "matrix": self.matrix.tolist()}
+
+
+class HomographyTransform(CoordinateTransform):
+    r"""
+    Projective mapping (e.g. image to a world plane) with ``cv2.perspectiveTransform``.
+
+    Parameters
+    ----------
+    matrix : array_like
+        Matrix with shape (3, 3).
+    """
+
+    kind = "homography"
+
+    def __init__(self, matrix) -> None:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape != (3, 3):
+            raise ValueError(f"Homography matrix must have shape (3, 3), got {matrix.shape}.")
+        self.matrix = matrix
+
+    @classmethod
+    def from_points(cls, image_points, world_points):
+        r"""
+        Homography fitted on at least 4 correspondences (``cv2.findHomography``, least squares).
+        """
+        matrix, _ = cv2.findHomography(_as_points(image_points), _as_points(world_points), 0)
+        if matrix is None:
+            raise ValueError("Cannot fit a homography on these points.")
+        return cls(matrix)
+
+    def _apply(self, points: np.ndarray) -> np.ndarray:
+        return cv2.perspectiveTransform(points.reshape(-1, 1, 2), self.matrix).reshape(-1, 2)
+
+    def to_dict(self) -> dict:
+        return {"type": self.kind, "matrix": self.matrix.tolist()}
+
+
+class UndistortTransform(CoordinateTransform):
+    r"""
+    Lens undistortion with ``cv2.undistortPoints``.
+
+    Without ``new_camera_matrix``, the output are normalized camera coordinates
+    (``x / z``, ``y / z``); with it, undistorted pixel coordinates.
+
+    Parameters
+    ----------
+    camera_matrix : array_like
+        Intrinsic matrix with shape (3, 3).
+    dist_coeffs : array_like
+        Distortion coefficients (k1, k2, p1, p2[, k3[, k4, k5, k6[, ...]]]).
+    new_camera_matrix : array_like, optional
+        Projection of the undistorted points (e.g. ``camera_matrix``). If None, normalized coordinates.
+    rectification : array_like, optional
+        Rectification rotation with shape (3, 3).
+    """
+
+    kind = "undistort"
+
+    def __init__(
+        self, camera_matrix, dist_coeffs, new_camera_matrix=None, rectification=None
+    ) -> None:
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64).reshape(3, 3)
+        self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64).ravel()
+        self.new_camera_matrix = (
+            None if new_camera_matrix is None else np.asarray(new_camera_matrix, dtype=np.float64)
+        )
+        self.rectification = (
+            None if rectification is None else np.asarray(rectification, dtype=np.float64)
+        )
+
+    def _apply(self, points: np.ndarray) -> np.ndarray:
+        return cv2.undistortPoints(
+            points.reshape(-1, 1, 2),
+            self.camera_matrix,
+            self.dist_coeffs,
+            R=self.rectification,
+            P=self.new_camera_matrix,
+        ).reshape(-1, 2)
+
+    def to_dict(self) -> dict:
+        data = {
+            "type": self.kind,
+            "camera_matrix": self.camera_matrix.tolist(),
+            "dist_coeffs": self.dist_coeffs.tolist(),
+        }
+        if self.new_camera_matrix is not None:
+            data["new_camera_matrix"] = self.new_camera_matrix.tolist()
+        if self.rectification is not None:
+            data["rectification"] = self.rectification.tolist()
+        return data
+
+
+class ChainTransform(CoordinateTransform):
+    r"""
+    Composition of transforms, applied in order (e.g. undistortion then homography).
+
+    Parameters
+    ----------
+    transforms : Sequence[CoordinateTransform]
+        The transforms.
+    """
+
+    kind = "chain"
+
+    def __init__(self, transforms: Sequence[CoordinateTransform]) -> None:
+        self.transforms: List[CoordinateTransform] = list(transforms)
+
+    def _apply(self, points: np.ndarray) -> np.ndarray:
+        for transform in self.transforms:
+            points = transform._apply(points)
+        return points
+
+    def to_dict(self) -> dict:
+        return {"type": self.kind, "transforms": [t.to_dict() for t in self.transforms]}
+
+
+TRANSFORM_TYPES = {
+    cls.kind: cls for cls in (AffineTransform, HomographyTransform, UndistortTransform, ChainTransform)
+}
+
+
+def transform_from_dict(data: dict) -> CoordinateTransform:
+    r"""
+    Build a transform from its :meth:`CoordinateTransform.to_dict` description.
+
+    Parameters
+    ----------
+    data : dict
+        ``{"type": "affine" | "homography" | "undistort" | "chain", ...}``.
+
+    Returns
+    -------
+    CoordinateTransform
+        The transform.
+    """
+    data = dict(data)
+    kind = data.pop("type", None)
+    if kind not in TRANSFORM_TYPES:
+        raise ValueError(f"Unknown transform type '{kind}' (expected one of {list(TRANSFORM_TYPES)}).")
+    if kind == "chain":
+        return ChainTransform([transform_from_dict(t) for t in data["transforms"]])
+    return TRANSFORM_TYPES[kind](**data)
+
+
+def load_transforms(path: str) -> Dict[str, CoordinateTransform]:
+    r"""
+    Load named transforms from a JSON file ``{name: description}`` (see :func:`transform_from_dict`).
+
+    .. code-block:: json
+
+        {
+            "mm": {"type": "affine", "matrix": [[0.05, 0, 0], [0, 0.05, 0]]},
+            "world": {"type": "chain", "transforms": [
+                {"type": "undistort", "camera_matrix": [[...]], "dist_coeffs": [...],
+                 "new_camera_matrix": [[...]]},
+                {"type": "homography", "matrix": [[...]]}
+            ]}
+        }
+
+    Parameters
+    ----------
+    path : str
+        JSON file.
+
+    Returns
+    -------
+    Dict[str, CoordinateTransform]
+        Transforms by name.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {name: transform_from_dict(spec) for name, spec in data.items()}
+
+
+def save_transforms(transforms: Dict[str, CoordinateTransform], path: str) -> None:
+    r"""
+    Save named transforms to a JSON file (see :func:`load_transforms`).
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({name: t.to_dict() for name, t in transforms.items()}, f, indent=2)
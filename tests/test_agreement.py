@@ -0,0 +1,158 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from pyclickimage import ClickManager
+from pyclickimage import agreement
+from pyclickimage.agreement import compare_annotations, match_points
+
+
+def _brute_force(a, b, max_distance):
+    # Maximum number of matches, then minimum total distance, over all the assignments
+    best = (0, 0.0)
+    small, large = (a, b) if len(a) <= len(b) else (b, a)
+    for targets in itertools.permutations(range(len(large)), len(small)):
+        n, total = 0, 0.0
+        for i, j in enumerate(targets):
+            d = np.hypot(*(small[i] - large[j]))
+            if d <= max_distance:
+                n += 1
+                total += d
+        if n > best[0] or (n == best[0] and total < best[1] - 1e-12):
+            best = (n, total)
+    return best
+
+
+def _greedy_reference(a, b, max_distance):
+    pairs = sorted(
+        (np.hypot(*(a[i] - b[j])), i, j)
+        for i in range(len(a))
+        for j in range(len(b))
+        if np.hypot(*(a[i] - b[j])) <= max_distance
+    )
+    used_a, used_b, kept = set(), set(), set()
+    for _, i, j in pairs:
+        if i not in used_a and j not in used_b:
+            used_a.add(i)
+            used_b.add(j)
+            kept.add((i, j))
+    return kept
+
+
+def _check_matching(a, b, max_distance, ia, ib, d):
+    assert len(set(ia.tolist())) == ia.size
+    assert len(set(ib.tolist())) == ib.size
+    np.testing.assert_allclose(d, np.hypot(*(a[ia] - b[ib]).T))
+    assert (d <= max_distance).all()
+
+
+def _random_sets(rng, max_points=6):
+    # Dense points: many components with several candidates
+    a = rng.uniform(0, 10, (rng.integers(0, max_points + 1), 2))
+    b = rng.uniform(0, 10, (rng.integers(0, max_points + 1), 2))
+    return a, b
+
+
+def test_optimal_matching_matches_brute_force():
+    pytest.importorskip("scipy")
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        a, b = _random_sets(rng)
+        max_distance = rng.uniform(1.0, 5.0)
+        ia, ib, d = match_points(a, b, max_distance)
+        _check_matching(a, b, max_distance, ia, ib, d)
+
+        n, total = _brute_force(a, b, max_distance)
+        assert d.size == n
+        assert d.sum() == pytest.approx(total, abs=1e-9)
+
+
+@pytest.mark.parametrize("fallback", ["no_scipy", "not_optimal", "large_component"])
+def test_greedy_fallbacks_match_a_greedy_reference(monkeypatch, fallback):
+    optimal = True
+    if fallback == "no_scipy":
+        monkeypatch.setattr(agreement, "linear_sum_assignment", None)
+    elif fallback == "not_optimal":
+        optimal = False
+    else:
+        pytest.importorskip("scipy")
+        monkeypatch.setattr(agreement, "MAX_ASSIGNMENT_SIZE", 1)
+
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        a, b = _random_sets(rng)
+        max_distance = rng.uniform(1.0, 5.0)
+        ia, ib, d = match_points(a, b, max_distance, optimal=optimal)
+        _check_matching(a, b, max_distance, ia, ib, d)
+        assert set(zip(ia.tolist(), ib.tolist())) == _greedy_reference(a, b, max_distance)
+
+
+def test_trivial_pairs_and_single_hub():
+    a = np.array([[0.0, 0.0], [100.0, 100.0], [50.0, 0.0]])
+    b = np.array([[0.5, 0.0], [100.0, 101.0], [52.0, 0.0], [49.5, 0.0], [48.0, 0.0]])
+
+    ia, ib, d = match_points(a, b, max_distance=3.0)
+
+    # Two unambiguous pairs, and the closest of the three candidates of the hub
+    assert sorted(zip(ia.tolist(), ib.tolist())) == [(0, 0), (1, 1), (2, 3)]
+    np.testing.assert_allclose(sorted(d), [0.5, 0.5, 1.0])
+
+
+def test_no_candidates():
+    ia, ib, d = match_points(np.zeros((3, 2)), np.full((2, 2), 100.0), max_distance=1.0)
+    assert ia.size == ib.size == d.size == 0
+    ia, ib, d = match_points(np.zeros((0, 2)), np.zeros((2, 2)), max_distance=1.0)
+    assert ia.size == 0
+
+
+def _annotator(points):
+    click_manager = ClickManager()
+    click_manager.add_clicks(np.array(points, dtype=float).reshape(-1, 2))
+    return click_manager
+
+
+def test_consensus_min_support():
+    annotations = [
+        _annotator([[10.0, 10.0], [50.0, 50.0], [90.0, 10.0]]),
+        _annotator([[11.0, 10.0], [50.0, 51.0]]),
+        _annotator([[10.0, 11.0], [200.0, 200.0]]),
+    ]
+
+    # Majority (2 of 3): the points clicked by a single annotator are dropped
+    result = compare_annotations(annotations, max_distance=3.0)
+    consensus = result["consensus"]
+    points = consensus.extract_group("default")
+    support = consensus.get_point_data("support", "default")
+    assert len(points) == 2
+    np.testing.assert_allclose(points[0], (31.0 / 3.0, 31.0 / 3.0))
+    np.testing.assert_allclose(points[1], (50.0, 50.5))
+    assert support == [3.0, 2.0]
+    assert result["clusters"]["default"].shape == (4, 3)
+    assert result["matcher"] == agreement.matcher()
+
+    # All the annotators
+    consensus = compare_annotations(annotations, max_distance=3.0, min_support=3)["consensus"]
+    assert len(consensus.extract_group("default")) == 1
+
+    # Any annotator
+    consensus = compare_annotations(annotations, max_distance=3.0, min_support=1)["consensus"]
+    assert len(consensus.extract_group("default")) == 4
+
+
+def test_pairwise_agreement():
+    result = compare_annotations(
+        [_annotator([[0.0, 0.0], [10.0, 0.0]]), _annotator([[1.0, 0.0]])], max_distance=2.0
+    )
+    total = [row for row in result["pairwise"] if row["group"] is None][0]
+    assert total["matched"] == 1
+    assert total["recall_a"] == 0.5
+    assert total["recall_b"] == 1.0
+    assert total["f1"] == pytest.approx(2.0 / 3.0)
+    assert total["mean"] == pytest.approx(1.0)
+
+
+def test_matcher_without_scipy(monkeypatch):
+    monkeypatch.setattr(agreement, "linear_sum_assignment", None)
+    assert agreement.matcher() == "greedy"
+    assert agreement.matcher(optimal=False) == "greedy"
@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from pyclickimage import ClickManager
+
+
+def _rebuilt_stats(click_manager, group):
+    copy = ClickManager()
+    copy.groups[group] = list(click_manager.groups[group])
+    return copy.group_stats(group)
+
+
+def _assert_stats_equal(stats, expected):
+    assert stats["count"] == expected["count"]
+    assert stats["placeholders"] == expected["placeholders"]
+    for key in ("centroid", "bbox"):
+        if expected[key] is None:
+            assert stats[key] is None
+        else:
+            np.testing.assert_allclose(stats[key], expected[key])
+
+
+def test_add_clicks_nan_rows_are_placeholders():
+    click_manager = ClickManager()
+    click_manager.add_clicks(np.array([[1.0, 2.0], [np.nan, np.nan], [3.0, np.nan]]))
+
+    assert click_manager.extract_group() == [(1.0, 2.0), (None, None), (None, None)]
+    assert click_manager.group_stats()["placeholders"] == 2
+
+
+@pytest.mark.parametrize(
+    "points",
+    [
+        np.array([[1.0, np.inf]]),
+        np.array([[-np.inf, 0.0]]),
+        np.zeros((3, 3)),
+        np.zeros(4),
+    ],
+)
+def test_add_clicks_rejects_infinite_values_and_wrong_shapes(points):
+    click_manager = ClickManager()
+    click_manager.add_click(0.0, 0.0)
+    events = []
+    click_manager.add_listener(events.append)
+
+    with pytest.raises(ValueError):
+        click_manager.add_clicks(points)
+    with pytest.raises(ValueError):
+        click_manager.replace_group(points)
+    with pytest.raises(ValueError):
+        click_manager.move_clicks([0], points)
+
+    # Nothing was changed
+    assert click_manager.extract_group() == [(0.0, 0.0)]
+    assert events == []
+
+
+def test_one_event_per_batch():
+    click_manager = ClickManager()
+    events = []
+    click_manager.add_listener(events.append)
+
+    click_manager.add_clicks(np.arange(200, dtype=float).reshape(100, 2))
+    click_manager.move_clicks([0, 5, 7], np.ones((3, 2)))
+    click_manager.remove_clicks(np.arange(0, 100, 3))
+    click_manager.replace_group(np.zeros((10, 2)))
+
+    assert [e["type"] for e in events] == [
+        "clicks_added",
+        "clicks_moved",
+        "clicks_removed",
+        "group_replaced",
+    ]
+
+
+def test_empty_batches_send_no_event():
+    click_manager = ClickManager()
+    click_manager.add_click(1.0, 1.0)
+    events = []
+    click_manager.add_listener(events.append)
+
+    click_manager.add_clicks(np.zeros((0, 2)))
+    click_manager.remove_clicks([])
+    click_manager.move_clicks([], np.zeros((0, 2)))
+
+    assert events == []
+
+
+def test_remove_clicks_keeps_point_data_aligned():
+    click_manager = ClickManager()
+    click_manager.add_clicks(np.array([[float(i), 0.0] for i in range(8)]))
+    click_manager.set_point_data("label", [float(i) for i in range(8)])
+
+    # Unsorted, duplicated and negative indices
+    click_manager.remove_clicks([6, 1, 6, -1, 3, 1])
+
+    xs = [x for x, _ in click_manager.extract_group()]
+    assert xs == [0.0, 2.0, 4.0, 5.0]
+    assert click_manager.get_point_data("label") == xs
+
+
+def test_remove_clicks_out_of_range():
+    click_manager = ClickManager()
+    click_manager.add_clicks(np.zeros((3, 2)))
+
+    with pytest.raises(IndexError):
+        click_manager.remove_clicks([3])
+    assert click_manager.n_clicks == 3
+
+
+def test_move_clicks_rejects_repeated_indices():
+    click_manager = ClickManager()
+    click_manager.add_clicks(np.zeros((3, 2)))
+
+    with pytest.raises(ValueError):
+        click_manager.move_clicks([1, 1], np.ones((2, 2)))
+
+
+def test_incremental_stats_match_a_full_rebuild():
+    rng = np.random.default_rng(0)
+    click_manager = ClickManager()
+    group = click_manager.current_group
+
+    for _ in range(300):
+        n = len(click_manager.groups[group])
+        operation = rng.integers(4)
+        if operation == 0 or n == 0:
+            points = rng.uniform(-50, 50, (rng.integers(1, 20), 2))
+            points[rng.random(len(points)) < 0.2] = np.nan
+            click_manager.add_clicks(points)
+        elif operation == 1:
+            click_manager.remove_clicks(rng.integers(0, n, rng.integers(1, 5)))
+        elif operation == 2:
+            indices = rng.choice(n, size=min(n, 5), replace=False)
+            click_manager.move_clicks(indices, rng.uniform(-80, 80, (len(indices), 2)))
+        else:
+            click_manager.replace_group(rng.uniform(0, 10, (rng.integers(0, 30), 2)))
+
+        _assert_stats_equal(click_manager.group_stats(group), _rebuilt_stats(click_manager, group))
+        assert click_manager.n_clicks == len(click_manager.groups[group])
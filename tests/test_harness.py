@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtWidgets
+
+from pyclickimage.click_image_app import ClickImageApp
+from pyclickimage.harness import LatencyHarness, SessionRecorder
+
+
+_APP = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_session_records_the_image_loads(tmp_path):
+    window = ClickImageApp(np.zeros((64, 80, 3), np.uint8))
+    window.confirm_exit = False
+    recorder = SessionRecorder(window)
+
+    recorder._record("group", group="a")
+    window.set_image(np.zeros((120, 90, 3), np.uint8))
+    recorder._record("group", group="b")
+
+    path = str(tmp_path / "session.json")
+    recorder.save(path)
+    session = SessionRecorder.load(path)
+
+    # The shape when the recording started, then the load before the next event
+    assert session["image_shape"][:2] == [64, 80]
+    kinds = [event["kind"] for event in session["events"]]
+    assert kinds == ["group", "image", "group"]
+    assert session["events"][1]["shape"][:2] == [120, 90]
+
+    replayed = ClickImageApp(np.zeros(tuple(session["image_shape"]), np.uint8))
+    replayed.confirm_exit = False
+    replayed.show()
+    LatencyHarness(replayed).replay(session)
+    assert replayed.image.shape[:2] == (120, 90)
+
+    window.close()
+    replayed.close()
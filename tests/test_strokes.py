@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtCore, QtWidgets
+
+from pyclickimage.click_image_app import ClickImageApp
+
+
+_APP = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def _window():
+    window = ClickImageApp(np.zeros((64, 64, 3), np.uint8))
+    window.confirm_exit = False
+    return window
+
+
+def test_stroke_then_new_image_then_update():
+    window = _window()
+    window._process_stroke(np.array([[5.0, 5.0], [20.0, 8.0], [30.0, 25.0]]))
+    assert window.viewer.markers_nbytes > 0
+
+    # The new image clears the scene: the stroke paths must not be removed twice
+    window.set_image(np.zeros((32, 48, 3), np.uint8))
+    window.update()
+    window.update()
+
+    assert len(window.click_manager.extract_group()) == 3
+    window.close()
+
+
+def test_stroke_in_progress_is_dropped_by_new_image():
+    window = _window()
+    window.viewer._start_stroke(QtCore.QPointF(5.0, 5.0))
+    assert window.viewer.is_stroking
+
+    window.viewer.set_image(window.viewer._pixmap_item.pixmap())
+    assert not window.viewer.is_stroking
+    window.update()
+    window.close()
@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import deque
+
+from pyclickimage import ThreadSafeClickManager
+
+
+class _SlowDeque(deque):
+    # Widens the window between reading the queue state and acting on it
+    def __len__(self):
+        n = super().__len__()
+        time.sleep(0.0005)
+        return n
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+def test_no_lost_wakeup_when_commit_races_post():
+    click_manager = ThreadSafeClickManager()
+    click_manager._queue = _SlowDeque()
+    click_manager.add_group("detections")
+
+    wakeups = threading.Semaphore(0)
+    click_manager.set_wakeup(wakeups.release)
+    n_posts = 300
+    producer_done = threading.Event()
+
+    def producer():
+        for i in range(n_posts):
+            click_manager.post_click(float(i), float(i), "detections")
+        producer_done.set()
+
+    def owner():
+        # Commits only when woken up, as the queued Qt signal does
+        while True:
+            if wakeups.acquire(timeout=0.5):
+                click_manager.commit()
+            elif producer_done.is_set():
+                return
+
+    threads = [threading.Thread(target=producer), threading.Thread(target=owner)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert click_manager.pending == 0
+    assert len(click_manager.extract_group("detections")) == n_posts